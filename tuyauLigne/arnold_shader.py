@@ -1,7 +1,8 @@
-import os
-
 import maya.cmds as mc
 
+from tuyauLigne import canonical_path as cpth
+from tuyauLigne import naming_profile as nprf
+
 
 def create_core_nodes(short_name):
     """
@@ -13,8 +14,9 @@ def create_core_nodes(short_name):
     Returns:
         tuple: Contains the created shading node and shading group.
     """
-    shading_node = mc.shadingNode('aiStandardSurface', asShader=True, name=f'mat_{short_name}')
-    shading_group = mc.sets(renderable=True, noSurfaceShader=True, empty=True, name=f'mat_{short_name}_SG')
+    mat_name = nprf.PROFILE.element_name("material", short_name)
+    shading_node = mc.shadingNode('aiStandardSurface', asShader=True, name=mat_name)
+    shading_group = mc.sets(renderable=True, noSurfaceShader=True, empty=True, name=f'{mat_name}_SG')
     mc.connectAttr(f'{shading_node}.outColor', f'{shading_group}.surfaceShader')
     return shading_node, shading_group
 
@@ -37,7 +39,7 @@ def create_base_color(short_name, textures_path, texture_files, shading_node):
     basecolor_node = None
 
     for texture_file in texture_files:
-        if "_baseColor" in texture_file and "mat_" in texture_file:
+        if "_baseColor" in texture_file and nprf.PROFILE.prefix("material") in texture_file:
             basecolor_files.append(texture_file)
             if len(basecolor_files) == 1:
                 texture_to_set = texture_file
@@ -48,7 +50,7 @@ def create_base_color(short_name, textures_path, texture_files, shading_node):
                         texture_to_set = basecolor_file
 
     if basecolor_files:
-        basecolor_path = os.path.join(textures_path, texture_to_set).replace("\\", "/")
+        basecolor_path = cpth.CanonicalPath(textures_path, texture_to_set)
         basecolor_node = mc.shadingNode('aiImage', asTexture=True, name=f'img_baseColor_{short_name}')
         color_correct_node = mc.shadingNode("aiColorCorrect", asUtility=True,
                                             name=f"colorCorrect_baseColor_{short_name}")
@@ -81,7 +83,7 @@ def create_roughness(short_name, textures_path, texture_files, shading_node):
     roughness_node = None
 
     for texture_file in texture_files:
-        if "_roughness" in texture_file and "mat_" in texture_file:
+        if "_roughness" in texture_file and nprf.PROFILE.prefix("material") in texture_file:
             roughness_files.append(texture_file)
             if len(roughness_files) == 1:
                 texture_to_set = texture_file
@@ -92,7 +94,7 @@ def create_roughness(short_name, textures_path, texture_files, shading_node):
                         texture_to_set = roughness_file
 
     if roughness_files:
-        roughness_path = os.path.join(textures_path, texture_to_set).replace("\\", "/")
+        roughness_path = cpth.CanonicalPath(textures_path, texture_to_set)
         roughness_node = mc.shadingNode('aiImage', asTexture=True, name=f'img_roughness_{short_name}')
         range_node = mc.shadingNode("aiRange", asUtility=True, name=f"range_roughness_{short_name}")
         clamp_node = mc.shadingNode("aiClamp", asUtility=True, name=f"clamp_roughness_{short_name}")
@@ -128,7 +130,7 @@ def create_metallic(short_name, textures_path, texture_files, shading_node):
     metallic_node = None
 
     for texture_file in texture_files:
-        if "_metallic" in texture_file and "mat_" in texture_file:
+        if "_metallic" in texture_file and nprf.PROFILE.prefix("material") in texture_file:
             metallic_files.append(texture_file)
             if len(metallic_files) == 1:
                 texture_to_set = texture_file
@@ -139,7 +141,7 @@ def create_metallic(short_name, textures_path, texture_files, shading_node):
                         texture_to_set = metallic_file
 
     if metallic_files:
-        metallic_path = os.path.join(textures_path, texture_to_set).replace("\\", "/")
+        metallic_path = cpth.CanonicalPath(textures_path, texture_to_set)
         metallic_node = mc.shadingNode('aiImage', asTexture=True, name=f'img_metallic_{short_name}')
         range_node = mc.shadingNode("aiRange", asUtility=True, name=f"range_metallic_{short_name}")
         clamp_node = mc.shadingNode("aiClamp", asUtility=True, name=f"clamp_metallic_{short_name}")
@@ -175,7 +177,7 @@ def create_normal(short_name, textures_path, texture_files, shading_node):
     normal_node = None
 
     for texture_file in texture_files:
-        if "_normal" in texture_file and "mat_" in texture_file:
+        if "_normal" in texture_file and nprf.PROFILE.prefix("material") in texture_file:
             normal_files.append(texture_file)
             if len(normal_files) == 1:
                 texture_to_set = texture_file
@@ -186,7 +188,7 @@ def create_normal(short_name, textures_path, texture_files, shading_node):
                         texture_to_set = normal_file
 
     if normal_files:
-        normal_path = os.path.join(textures_path, texture_to_set).replace("\\", "/")
+        normal_path = cpth.CanonicalPath(textures_path, texture_to_set)
         normal_node = mc.shadingNode('aiImage', asTexture=True, name=f'img_normal_{short_name}')
         normal_param = mc.shadingNode('aiNormalMap', asUtility=True, name=f'normal_{short_name}')
         mc.connectAttr(f'{normal_node}.outColor ', f'{normal_param}.input')
@@ -218,7 +220,7 @@ def create_scattering_mask(short_name, textures_path, texture_files, shading_nod
     scatter_msk_node = None
 
     for texture_file in texture_files:
-        if "_scatteringMask" in texture_file and "mat_" in texture_file:
+        if "_scatteringMask" in texture_file and nprf.PROFILE.prefix("material") in texture_file:
             scatter_msk_files.append(texture_file)
             if len(scatter_msk_files) == 1:
                 texture_to_set = texture_file
@@ -229,7 +231,7 @@ def create_scattering_mask(short_name, textures_path, texture_files, shading_nod
                         texture_to_set = scatter_msk_file
 
     if scatter_msk_files:
-        scatter_msk_path = os.path.join(textures_path, texture_to_set).replace("\\", "/")
+        scatter_msk_path = cpth.CanonicalPath(textures_path, texture_to_set)
         scatter_msk_node = mc.shadingNode('aiImage', asTexture=True, name=f'img_scatter_msk_{short_name}')
         range_node = mc.shadingNode("aiRange", asUtility=True, name=f"range_scatter_msk_{short_name}")
         clamp_node = mc.shadingNode("aiClamp", asUtility=True, name=f"clamp_scatter_msk_{short_name}")
@@ -265,7 +267,7 @@ def create_scattering_color(short_name, textures_path, texture_files, shading_no
     scattercolor_node = None
 
     for texture_file in texture_files:
-        if "_scatteringColor" in texture_file and "mat_" in texture_file:
+        if "_scatteringColor" in texture_file and nprf.PROFILE.prefix("material") in texture_file:
             scattercolor_files.append(texture_file)
             if len(scattercolor_files) == 1:
                 texture_to_set = texture_file
@@ -276,7 +278,7 @@ def create_scattering_color(short_name, textures_path, texture_files, shading_no
                         texture_to_set = scattercolor_file
 
     if scattercolor_files:
-        scattercolor_path = os.path.join(textures_path, texture_to_set).replace("\\", "/")
+        scattercolor_path = cpth.CanonicalPath(textures_path, texture_to_set)
         scattercolor_node = mc.shadingNode('aiImage', asTexture=True, name=f'img_scattercolor_{short_name}')
         color_correct_node = mc.shadingNode("aiColorCorrect", asUtility=True,
                                             name=f"colorCorrect_scattercolor_{short_name}")
@@ -309,7 +311,7 @@ def create_emission(short_name, textures_path, texture_files, shading_node):
     emission_node = None
 
     for texture_file in texture_files:
-        if "_emissive" in texture_file and "mat_" in texture_file:
+        if "_emissive" in texture_file and nprf.PROFILE.prefix("material") in texture_file:
             emission_files.append(texture_file)
             if len(emission_files) == 1:
                 texture_to_set = texture_file
@@ -320,7 +322,7 @@ def create_emission(short_name, textures_path, texture_files, shading_node):
                         texture_to_set = emission_file
 
     if emission_files:
-        emission_path = os.path.join(textures_path, texture_to_set).replace("\\", "/")
+        emission_path = cpth.CanonicalPath(textures_path, texture_to_set)
         emission_node = mc.shadingNode('aiImage', asTexture=True, name=f'img_emission_{short_name}')
         color_correct_node = mc.shadingNode("aiColorCorrect", asUtility=True,
                                             name=f"colorCorrect_emission_{short_name}")
@@ -354,7 +356,7 @@ def create_translucency(short_name, textures_path, texture_files, shading_node):
     translucency_node = None
 
     for texture_file in texture_files:
-        if "translucency" in texture_file and "mat_" in texture_file:
+        if "translucency" in texture_file and nprf.PROFILE.prefix("material") in texture_file:
             translucency_files.append(texture_file)
             if len(translucency_files) == 1:
                 texture_to_set = texture_file
@@ -365,7 +367,7 @@ def create_translucency(short_name, textures_path, texture_files, shading_node):
                         texture_to_set = translucency_file
 
     if translucency_files:
-        translucency_path = os.path.join(textures_path, texture_to_set).replace("\\", "/")
+        translucency_path = cpth.CanonicalPath(textures_path, texture_to_set)
         translucency_node = mc.shadingNode('aiImage', asTexture=True, name=f'img_translucency_{short_name}')
         range_node = mc.shadingNode("aiRange", asUtility=True, name=f"range_translucency_{short_name}")
         clamp_node = mc.shadingNode("aiClamp", asUtility=True, name=f"clamp_translucency_{short_name}")
@@ -401,7 +403,7 @@ def create_abs_color(short_name, textures_path, texture_files, shading_node):
     abscolor_node = None
 
     for texture_file in texture_files:
-        if "_absorptionColor" in texture_file and "mat_" in texture_file:
+        if "_absorptionColor" in texture_file and nprf.PROFILE.prefix("material") in texture_file:
             abscolor_files.append(texture_file)
             if len(abscolor_files) == 1:
                 texture_to_set = texture_file
@@ -412,7 +414,7 @@ def create_abs_color(short_name, textures_path, texture_files, shading_node):
                         texture_to_set = abscolor_file
 
     if abscolor_files:
-        abscolor_path = os.path.join(textures_path, texture_to_set).replace("\\", "/")
+        abscolor_path = cpth.CanonicalPath(textures_path, texture_to_set)
         abscolor_node = mc.shadingNode('aiImage', asTexture=True, name=f'img_abscolor_{short_name}')
         color_correct_node = mc.shadingNode("aiColorCorrect", asUtility=True,
                                             name=f"colorCorrect_abscolor_{short_name}")
@@ -18,8 +18,10 @@ except ImportError:
     from shiboken2 import wrapInstance
 
 from tuyauLigne import project_manager as pm
+from tuyauLigne import scene_context as sctx
 from tuyauLigne import usd_editor as ue
 from tuyauLigne import naming_convention as naco
+from tuyauLigne import naming_profile as nprf
 
 
 class AssetLibraryLaunch:
@@ -149,7 +151,7 @@ class AssetLibraryUI(QtWidgets.QDialog):
         self.btn_ref.clicked.connect(self.import_ref)
 
     def initial_state_ui(self):
-        my_assets = ["all", "prp", "prx", "set"]
+        my_assets = ["all"] + nprf.PROFILE.asset_types
         self.combo_asset_type.addItems(my_assets)
 
         for asset in self.get_asset_list():
@@ -173,13 +175,13 @@ class AssetLibraryUI(QtWidgets.QDialog):
                 self.list_asset.addItem(asset)
             for asset in self.get_set_list():
                 self.list_asset.addItem(asset)
-        elif self.combo_asset_type.currentText() == "prp":
+        elif self.combo_asset_type.currentText() == nprf.PROFILE.token("prop"):
             for asset in self.get_asset_list():
                 self.list_asset.addItem(asset)
-        elif self.combo_asset_type.currentText() == "prx":
+        elif self.combo_asset_type.currentText() == nprf.PROFILE.token("proxy_asset"):
             for asset in self.get_proxy_list():
                 self.list_asset.addItem(asset)
-        elif self.combo_asset_type.currentText() == "set":
+        elif self.combo_asset_type.currentText() == nprf.PROFILE.token("set"):
             for asset in self.get_set_list():
                 self.list_asset.addItem(asset)
 
@@ -205,17 +207,17 @@ class AssetLibraryUI(QtWidgets.QDialog):
                 if str_searched in asset:
                     self.list_asset.addItem(asset)
 
-        elif self.combo_asset_type.currentText() == "prp":
+        elif self.combo_asset_type.currentText() == nprf.PROFILE.token("prop"):
             asset_list = self.get_asset_list()
             for asset in asset_list:
                 if str_searched in asset:
                     self.list_asset.addItem(asset)
-        elif self.combo_asset_type.currentText() == "prx":
+        elif self.combo_asset_type.currentText() == nprf.PROFILE.token("proxy_asset"):
             asset_list = self.get_proxy_list()
             for asset in asset_list:
                 if str_searched in asset:
                     self.list_asset.addItem(asset)
-        elif self.combo_asset_type.currentText() == "set":
+        elif self.combo_asset_type.currentText() == nprf.PROFILE.token("set"):
             set_list = self.get_set_list()
             for asset in set_list:
                 if str_searched in asset:
@@ -229,9 +231,8 @@ class AssetLibraryUI(QtWidgets.QDialog):
             list: list of prx_assets
         """
         main_proxy_folder = pm.dict_main_folders().get("proxy_folder")
-        if os.path.isdir(main_proxy_folder):
-            proxy_folders = os.listdir(main_proxy_folder)
-        else:
+        proxy_folders = pm.get_project_index().names("prx")
+        if proxy_folders is None:
             mc.confirmDialog(message=f"{main_proxy_folder} does not exist", button="ok")
             proxy_folders = None
         return proxy_folders
@@ -244,9 +245,8 @@ class AssetLibraryUI(QtWidgets.QDialog):
             list: list of assets in the main asset folder
         """
         main_asset_folder = pm.dict_main_folders().get("asset_folder")
-        if os.path.isdir(main_asset_folder):
-            asset_folders = os.listdir(main_asset_folder)
-        else:
+        asset_folders = pm.get_project_index().names("prp")
+        if asset_folders is None:
             mc.confirmDialog(message=f"{main_asset_folder} does not exist", button="ok")
             asset_folders = None
         return asset_folders
@@ -259,29 +259,49 @@ class AssetLibraryUI(QtWidgets.QDialog):
             list: list of assets in the main env folder
         """
         main_set_folder = pm.dict_main_folders().get("env_folder")
-        if os.path.isdir(main_set_folder):
-            set_folders = os.listdir(main_set_folder)
-        else:
+        set_folders = pm.get_project_index().names("set")
+        if set_folders is None:
             mc.confirmDialog(message=f"{main_set_folder} does not exist", button="ok")
             set_folders = None
         return set_folders
 
+    def get_asset_type(self, asset_name):
+        """
+        Gets the type of an asset from the name of its folder. A folder name outside of the naming convention
+        (prp_jar-A) still gives the part before the first separator.
+
+        Parameters:
+            asset_name (str): Name of the asset folder. Example: prp_jarA
+
+        Returns:
+            str: Type of the asset. Example: prp
+        """
+        try:
+            return naco.parse_element_name(asset_name).element_type
+        except naco.NamingError:
+            return asset_name.split(nprf.PROFILE.separator)[0]
+
     def display_list_wip(self):
         """
         Displays the list of WIP modeling files in the list_wip widget.
         """
         asset_name = self.list_asset.currentItem().text()
-        asset_type = naco.dict_element_name_part(asset_name).get("element_type")
+        asset_type = self.get_asset_type(asset_name)
         self.list_wip.clear()
-        if asset_type == "prp":
+        if asset_type == nprf.PROFILE.token("prop"):
+            files = pm.get_project_index().files("prp", asset_name, "wip_maya_folder")
             wip_folder = pm.get_wip_modeling_folder(asset_name)
-            files = os.listdir(wip_folder)
-        elif asset_type == "prx":
-            proxy_folder = pm.get_proxy_folder(asset_name)
-            files = os.listdir(proxy_folder)
-        elif asset_type == "set":
+        elif asset_type == nprf.PROFILE.token("proxy_asset"):
+            files = pm.get_project_index().files("prx", asset_name)
+            wip_folder = pm.get_proxy_folder(asset_name)
+        elif asset_type == nprf.PROFILE.token("set"):
             # self.list_wip.clear()
             files = []
+            wip_folder = None
+        store = pm.get_increment_store()
+        if store is not None and wip_folder is not None:
+            # increments kept only in the store are listed with the files on disk
+            files = sorted(set(files) | set(store.versions(wip_folder)))
         for file in files:
             if file.split(".")[-1] == "ma":
                 self.list_wip.addItem(file)
@@ -292,22 +312,20 @@ class AssetLibraryUI(QtWidgets.QDialog):
         Displays the list of USD published files in the list_publish widget.
         """
         asset_name = self.list_asset.currentItem().text()
-        asset_type = naco.dict_element_name_part(asset_name).get("element_type")
+        asset_type = self.get_asset_type(asset_name)
         self.list_publish.clear()
-        if asset_type == "prp":
-            publish_folder = pm.get_wip_usd_folder(asset_name)
-            files = os.listdir(publish_folder)
+        if asset_type == nprf.PROFILE.token("prop"):
+            files = pm.get_project_index().files("prp", asset_name, "wip_usd_folder")
 
             for file in files:
-                if file.split("_")[0] == "prp" and file.split(".")[-1] == "usda":
+                if nprf.PROFILE.is_role(file, "prop") and file.split(".")[-1] == "usda":
                     self.list_publish.addItem(file)
                     self.list_publish.sortItems(Qt.DescendingOrder)
-        elif asset_type == "set":
-            set_wip_folder = pm.get_wip_usd_set_folder(asset_name)
-            files = os.listdir(set_wip_folder)
+        elif asset_type == nprf.PROFILE.token("set"):
+            files = pm.get_project_index().files("set", asset_name, "wip_usd_folder")
 
             for file in files:
-                if file.split("_")[0] == "set" and file.split(".")[-1] == "usda":
+                if nprf.PROFILE.is_role(file, "set") and file.split(".")[-1] == "usda":
                     self.list_publish.addItem(file)
                     self.list_publish.sortItems(Qt.DescendingOrder)
 
@@ -330,32 +348,33 @@ class AssetLibraryUI(QtWidgets.QDialog):
         Opens the file selected by the user.
         """
         asset_name = self.list_asset.currentItem().text()
-        asset_type = naco.dict_element_name_part(asset_name).get("element_type")
+        asset_type = self.get_asset_type(asset_name)
         if not self.list_wip.currentItem() and not self.list_publish.currentItem():
             mc.confirmDialog(message="no file selected", button="ok")
         elif self.list_wip.currentItem():
             selected_item = self.list_wip.currentItem().text()
-            if asset_type == "prp":
+            if asset_type == nprf.PROFILE.token("prop"):
                 wip_modeling_folder = pm.get_wip_modeling_folder(asset_name)
-                file_path = os.path.join(wip_modeling_folder, selected_item)
-            if asset_type == "prx":
+                file_path = wip_modeling_folder.joinpath(selected_item)
+            if asset_type == nprf.PROFILE.token("proxy_asset"):
                 proxy_folder = pm.get_proxy_folder(asset_name)
-                file_path = os.path.join(proxy_folder, selected_item)
-            if mc.file(file_path, q=True, exists=True):
+                file_path = proxy_folder.joinpath(selected_item)
+            file_path = pm.get_wip_file(file_path)
+            if file_path and mc.file(file_path, q=True, exists=True):
                 try:
                     mc.file(file_path, open=True, force=True)
                 except RuntimeError as e:
                     mc.confirmDialog(message=f"{e}", button="cancel")
         elif self.list_publish.currentItem().text():
             selected_item = self.list_publish.currentItem().text()
-            if asset_type == "prp":
+            if asset_type == nprf.PROFILE.token("prop"):
                 publish_folder = pm.get_wip_usd_folder(asset_name)
-                usd_file_path = os.path.join(publish_folder, selected_item)
+                usd_file_path = publish_folder.joinpath(selected_item)
                 mc.file(new=True, force=True)
                 ue.create_prp_layer(asset_name, usd_file_path)
-            elif asset_type == "set":
+            elif asset_type == nprf.PROFILE.token("set"):
                 set_wip_folder = pm.get_wip_usd_set_folder(asset_name)
-                usd_file_path = os.path.join(set_wip_folder, selected_item)
+                usd_file_path = set_wip_folder.joinpath(selected_item)
                 mc.file(new=True, force=True)
                 ue.create_prp_layer(asset_name, usd_file_path)
 
@@ -363,25 +382,40 @@ class AssetLibraryUI(QtWidgets.QDialog):
         """
         inc save for prp and prx
         """
-        file_name = mc.file(q=True, sceneName=True, shortName=True)
-        asset_type = naco.dict_file_name_part(file_name).get("asset_type")
-        asset_name = naco.dict_file_name_part(file_name).get("asset_name")
-        inc_number = naco.dict_file_name_part(file_name).get("inc_number")
-        inc_number = "{:03d}".format(inc_number + 1)
+        name_parts = sctx.get_scene_context().name_parts
+        asset_type = name_parts.get("asset_type")
+        asset_name = name_parts.get("asset_name")
+        previous_path = sctx.get_scene_context().scene_path
         if not pm.check_workspace():
             mc.confirmDialog(message="current file is not in the current workspace", button="cancel")
-        elif asset_type == "prp":
-            wip_folder = pm.get_wip_modeling_folder(asset_name)
-            file_path = wip_folder + "/" + asset_name + "_" + inc_number
-            mc.file(rename=file_path)
-            mc.file(options=";v=0;", typ="mayaAscii", save=True)
-            self.clear_list_wip_selection()
-        elif asset_type == "prx":
-            proxy_folder = pm.get_proxy_folder(asset_name)
-            file_path = proxy_folder + "/" + asset_name + "_" + inc_number
-            mc.file(rename=file_path)
-            mc.file(options=";v=0;", typ="mayaAscii", save=True)
-            self.clear_list_wip_selection()
+        elif asset_type == nprf.PROFILE.token("prop"):
+            self.save_increment(pm.get_wip_modeling_folder(asset_name), asset_name, previous_path)
+        elif asset_type == nprf.PROFILE.token("proxy_asset"):
+            self.save_increment(pm.get_proxy_folder(asset_name), asset_name, previous_path)
+
+    def save_increment(self, folder_path, asset_name, previous_path):
+        """
+        Saves the current scene as the next increment of the asset. The number is reserved on disk first, so the save
+        never writes over an increment that already exists, even when the scene is an old increment.
+
+        Parameters:
+            folder_path (str): Path of the folder of the increments.
+            asset_name (str): Name of the asset.
+            previous_path (str): Path of the scene before the save.
+        """
+        file_path = pm.reserve_increment(folder_path, asset_name)
+        mc.file(rename=file_path)
+        try:
+            saved_path = mc.file(options=";v=0;", typ="mayaAscii", save=True)
+        except RuntimeError as e:
+            # the reserved file is still empty, the number is given back
+            if os.path.isfile(file_path) and not os.path.getsize(file_path):
+                os.remove(file_path)
+            mc.file(rename=previous_path)
+            mc.confirmDialog(message=f"{e}", button="cancel")
+            return
+        pm.store_increment(saved_path, previous_path)
+        self.clear_list_wip_selection()
 
     def import_ref(self):
         """
@@ -392,15 +426,16 @@ class AssetLibraryUI(QtWidgets.QDialog):
         if not self.list_wip.currentItem() and not self.list_publish.currentItem():
             mc.confirmDialog(message="no file selected", button="ok")
         elif self.list_wip.currentItem():
-            asset_type = naco.dict_element_name_part(asset_name).get("element_type")
+            asset_type = self.get_asset_type(asset_name)
             selected_item = self.list_wip.currentItem().text()
-            if asset_type == "prp":
+            if asset_type == nprf.PROFILE.token("prop"):
                 wip_modeling_folder = pm.get_wip_modeling_folder(asset_name)
-                file_path = os.path.join(wip_modeling_folder, selected_item)
-            if asset_type == "prx":
+                file_path = wip_modeling_folder.joinpath(selected_item)
+            if asset_type == nprf.PROFILE.token("proxy_asset"):
                 proxy_folder = pm.get_proxy_folder(asset_name)
-                file_path = os.path.join(proxy_folder, selected_item)
-            if mc.file(file_path, q=True, exists=True):
+                file_path = proxy_folder.joinpath(selected_item)
+            file_path = pm.get_wip_file(file_path)
+            if file_path and mc.file(file_path, q=True, exists=True):
                 try:
                     mc.file(file_path, namespace=asset_name, reference=True, options=";v=0;", typ="mayaAscii",
                             mergeNamespacesOnClash=True)
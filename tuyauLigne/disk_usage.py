@@ -0,0 +1,441 @@
+import argparse
+import hashlib
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from tuyauLigne import canonical_path as cpth
+from tuyauLigne import naming_profile as nprf
+from tuyauLigne import path_template as ptl
+from tuyauLigne import project_index as pidx
+
+"""
+Disk usage of a project, and the files that can be removed from it.
+
+The project is walked in parallel, one task per asset, set or proxy folder and one per other main folder. Each task
+lists its tree with os.scandir, the size of each file comes with its entry. The report gives :
+    assets : bytes per asset, set and proxy.
+    departments : bytes per main folder. Example: 020_mod_surf
+    file_types : bytes per file extension.
+    superseded : increments saved by inc_save (prp_chair_001.ma ... prp_chair_087.ma, separator and padding of the
+                 naming profile) older than the last keep_last ones of the same folder. An increment referenced or
+                 imported by a Maya ASCII scene of the project is never superseded : the header of every .ma file is
+                 read for its "file -r" commands.
+    duplicates : textures with the same content. Only the textures sharing their size with another one are read, the
+                 first block of each file first, then the whole file if the first blocks are the same.
+
+prune() removes the superseded increments of a report, except the protected ones (the scene opened in Maya and its
+references, when it runs from Maya). The scenes opened in other sessions are not known : keep_last leaves the
+recent increments of each series. It can run without Maya, for a nightly job :
+    python -m tuyauLigne.disk_usage D:/projects/my_project --keep-last 5 --prune
+"""
+
+SCAN_WORKERS = 16
+HASH_BLOCK_SIZE = 1024 * 1024
+INCREMENT_EXTENSIONS = (".ma", ".mb", ".spp")
+INCREMENT_PATTERN = nprf.PROFILE.increment_matcher
+TEXTURE_EXTENSIONS = (".png", ".exr", ".tif", ".tiff", ".jpg", ".jpeg", ".tga", ".tx")
+DEFAULT_KEEP_LAST = 5
+MAYA_ASCII_EXTENSION = ".ma"
+HEADER_END_COMMANDS = ("requires ", "currentUnit ", "fileInfo ", "createNode ")
+REFERENCE_COMMAND_PATTERN = re.compile(r'^file\s.*?-r(?:di?)?\s.*"(?P<path>[^"]+)"\s*;\s*$', re.DOTALL)
+COPY_NUMBER_PATTERN = re.compile(r"\{\d+\}$")
+
+
+def scan_tree(folder_path):
+    """
+    Lists every file of a folder and of its sub-folders.
+
+    Parameters:
+        folder_path (str): Path of the folder.
+
+    Returns:
+        list: Path, size in bytes and modification time in nanoseconds of each file.
+    """
+    files = []
+    folders = [folder_path]
+    while folders:
+        current = folders.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        folders.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        stat = entry.stat(follow_symlinks=False)
+                        files.append((entry.path, stat.st_size, stat.st_mtime_ns))
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        except PermissionError as e:
+            print(f"folder not scanned : {e}")
+    return files
+
+
+def file_hash(file_path, limit=None):
+    """
+    Hashes the content of a file.
+
+    Parameters:
+        file_path (str): Path of the file.
+        limit (int): Number of bytes read from the start of the file, None for the whole file.
+
+    Returns:
+        str: Hexadecimal digest, None if the file can't be read.
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    remaining = limit
+    try:
+        with open(file_path, 'rb') as f:
+            while remaining is None or remaining > 0:
+                block = f.read(HASH_BLOCK_SIZE if remaining is None else min(HASH_BLOCK_SIZE, remaining))
+                if not block:
+                    break
+                digest.update(block)
+                if remaining is not None:
+                    remaining -= len(block)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def scan_tasks(root_project_folder, layout=ptl.LAYOUT):
+    """
+    Splits the project in folders scanned in parallel : every asset, set and proxy folder, and the other main folders.
+
+    Parameters:
+        root_project_folder (str): Root folder of the project.
+        layout (ProjectLayout): Layout of the project.
+
+    Returns:
+        list: Department, asset name (None outside of an asset folder) and path of each folder to scan.
+    """
+    tasks = []
+    asset_main_folders = {main_key for main_key, template, field in pidx.KINDS.values()}
+    for main_key, main_folder in layout.main_folder_paths(root_project_folder).items():
+        department = layout.main_folders[main_key]
+        if main_key not in asset_main_folders:
+            tasks.append((department, None, main_folder))
+            continue
+        try:
+            with os.scandir(main_folder) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        tasks.append((department, entry.name, entry.path))
+                    else:
+                        tasks.append((department, None, entry.path))
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+    return tasks
+
+
+def scan_task(task):
+    """
+    Scans one folder of the project. Runs in a worker thread.
+
+    Parameters:
+        task (tuple): Department, asset name and path returned by scan_tasks().
+
+    Returns:
+        tuple: The task and the files found, as returned by scan_tree().
+    """
+    department, asset_name, path = task
+    if os.path.isfile(path):
+        stat = os.stat(path)
+        return task, [(path, stat.st_size, stat.st_mtime_ns)]
+    return task, scan_tree(path)
+
+
+def path_key(path, root_project_folder=None):
+    """
+    Gets the key used to compare two paths of the project.
+
+    Parameters:
+        path (str): Path of a file, relative paths are relative to the project root.
+        root_project_folder (str): Root folder of the project.
+
+    Returns:
+        str: Canonical path, in the case of the file system.
+    """
+    path = cpth.CanonicalPath(path)
+    if root_project_folder and not os.path.isabs(path):
+        path = cpth.CanonicalPath(root_project_folder, path)
+    return os.path.normcase(path)
+
+
+def read_references(file_path):
+    """
+    Reads the files referenced or imported by a Maya ASCII scene. Only the header of the scene is read, the "file"
+    commands come before the nodes.
+
+    Parameters:
+        file_path (str): Path of the .ma file.
+
+    Returns:
+        list: Paths of the referenced files, as written in the scene.
+    """
+    references = []
+    command = ""
+    try:
+        with open(file_path, 'r', errors='replace') as f:
+            for line in f:
+                if not command and line.startswith(HEADER_END_COMMANDS):
+                    break
+                if not command and not line.startswith("file "):
+                    continue
+                command += line
+                if not line.rstrip().endswith(";"):
+                    continue
+                match = REFERENCE_COMMAND_PATTERN.match(command)
+                if match:
+                    references.append(COPY_NUMBER_PATTERN.sub("", match.group('path')))
+                command = ""
+    except OSError:
+        pass
+    return references
+
+
+def find_referenced(scene_paths, root_project_folder, workers=SCAN_WORKERS):
+    """
+    Finds the files referenced or imported by a list of Maya ASCII scenes.
+
+    Parameters:
+        scene_paths (list): Paths of the .ma files.
+        root_project_folder (str): Root folder of the project, for the relative references.
+        workers (int): Number of threads reading the scenes.
+
+    Returns:
+        set: Keys of the referenced files, as returned by path_key().
+    """
+    referenced = set()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for references in executor.map(read_references, scene_paths):
+            for reference in references:
+                referenced.add(path_key(reference, root_project_folder))
+    return referenced
+
+
+def find_superseded(increments, keep_last, referenced=frozenset()):
+    """
+    Finds the increments older than the last ones of their series.
+
+    Parameters:
+        increments (dict): (folder, stem, extension) -> list of (inc number, path, size).
+        keep_last (int): Number of increments kept in each series.
+        referenced (set): Keys of the files referenced by a scene, as returned by path_key(). They are kept.
+
+    Returns:
+        list: Path, size and latest increment of the series, for each superseded increment.
+    """
+    superseded = []
+    for series in increments.values():
+        series.sort()
+        latest = series[-1][1]
+        for inc_number, path, size in series[:max(len(series) - keep_last, 0)]:
+            if path_key(path) in referenced:
+                continue
+            superseded.append({'path': path, 'size': size, 'latest': latest})
+    return superseded
+
+
+def group_by_hash(executor, paths, limit=None):
+    """
+    Groups files by the hash of their content.
+
+    Parameters:
+        executor (ThreadPoolExecutor): Threads reading the files.
+        paths (list): Paths of the files.
+        limit (int): Number of bytes read from the start of each file, None for the whole file.
+
+    Returns:
+        dict: Hash -> paths, for each group of at least two files with the same hash.
+    """
+    by_hash = {}
+    for path, digest in zip(paths, executor.map(lambda path: file_hash(path, limit), paths)):
+        if digest is not None:
+            by_hash.setdefault(digest, []).append(path)
+    return {digest: same for digest, same in by_hash.items() if len(same) > 1}
+
+
+def find_duplicates(textures, workers=SCAN_WORKERS):
+    """
+    Finds the textures with the same content. The files are compared by size, then by the hash of their first block,
+    then by the hash of their whole content.
+
+    Parameters:
+        textures (list): Path and size of each texture.
+        workers (int): Number of threads reading the files.
+
+    Returns:
+        list: Hash, size and sorted paths of each group of identical textures.
+    """
+    groups = {}
+    for path, size in textures:
+        if size:
+            groups.setdefault(size, []).append(path)
+    duplicates = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        candidates = []
+        for size, paths in groups.items():
+            if len(paths) < 2:
+                continue
+            if size <= HASH_BLOCK_SIZE:
+                # the first block is the whole file
+                candidates.append((size, paths))
+                continue
+            for same in group_by_hash(executor, paths, HASH_BLOCK_SIZE).values():
+                candidates.append((size, same))
+        for size, paths in candidates:
+            for digest, same in group_by_hash(executor, paths).items():
+                duplicates.append({'hash': digest, 'size': size, 'paths': sorted(same)})
+    return duplicates
+
+
+def analyze_project(root_project_folder, keep_last=DEFAULT_KEEP_LAST, find_duplicate_textures=True,
+                    workers=SCAN_WORKERS):
+    """
+    Computes the disk usage of a project and the files that can be removed from it.
+
+    Parameters:
+        root_project_folder (str): Root folder of the project.
+        keep_last (int): Number of increments of each series that are not superseded.
+        find_duplicate_textures (bool): False to skip the hash of the textures.
+        workers (int): Number of threads scanning the folders and reading the textures.
+
+    Returns:
+        dict: Total size and number of files, bytes per asset, per department and per file type, superseded
+              increments and duplicate textures, with the bytes they use.
+    """
+    root_project_folder = cpth.CanonicalPath(root_project_folder)
+    report = {'root': root_project_folder, 'total': 0, 'files': 0, 'assets': {}, 'departments': {},
+              'file_types': {}}
+    increments = {}
+    textures = []
+    scenes = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for (department, asset_name, folder_path), files in executor.map(scan_task,
+                                                                        scan_tasks(root_project_folder)):
+            for path, size, mtime in files:
+                folder, file_name = os.path.split(path)
+                extension = os.path.splitext(file_name)[1].lower()
+                report['total'] += size
+                report['files'] += 1
+                report['departments'][department] = report['departments'].get(department, 0) + size
+                report['file_types'][extension] = report['file_types'].get(extension, 0) + size
+                if asset_name:
+                    report['assets'][asset_name] = report['assets'].get(asset_name, 0) + size
+                if extension == MAYA_ASCII_EXTENSION:
+                    scenes.append(path)
+                if extension in INCREMENT_EXTENSIONS:
+                    match = INCREMENT_PATTERN.match(file_name)
+                    if match:
+                        series = (folder, match.group('stem'), extension)
+                        increments.setdefault(series, []).append((int(match.group('inc_number')), path, size))
+                elif extension in TEXTURE_EXTENSIONS:
+                    textures.append((path, size))
+
+    referenced = find_referenced(scenes, root_project_folder, workers)
+    report['superseded'] = find_superseded(increments, keep_last, referenced)
+    report['superseded_bytes'] = sum(file['size'] for file in report['superseded'])
+    report['duplicates'] = find_duplicates(textures, workers) if find_duplicate_textures else []
+    report['duplicate_bytes'] = sum(group['size'] * (len(group['paths']) - 1) for group in report['duplicates'])
+    return report
+
+
+def prune(report, dry_run=True, protected=()):
+    """
+    Removes the superseded increments of a report. A file is kept if it changed of size since the report.
+
+    Parameters:
+        report (dict): Report returned by analyze_project().
+        dry_run (bool): True to only list the files that would be removed.
+        protected (list): Paths of files never removed. Example: the scene opened in Maya and its references.
+
+    Returns:
+        tuple: Paths of the files removed (or to remove) and the bytes freed.
+    """
+    removed = []
+    freed = 0
+    protected = {path_key(path, report['root']) for path in protected}
+    for file in report['superseded']:
+        if path_key(file['path']) in protected:
+            continue
+        try:
+            if os.stat(file['path']).st_size != file['size'] or not os.path.isfile(file['latest']):
+                continue
+            if not dry_run:
+                os.remove(file['path'])
+        except OSError as e:
+            print(f"increment not removed : {e}")
+            continue
+        removed.append(file['path'])
+        freed += file['size']
+    return removed, freed
+
+
+def format_size(size):
+    """
+    Formats a number of bytes.
+
+    Parameters:
+        size (int): Number of bytes.
+
+    Returns:
+        str: Size with its unit. Example: 12.3 GB
+    """
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if size < 1024 or unit == "TB":
+            return f"{size:.1f} {unit}" if unit != "B" else f"{size} B"
+        size /= 1024
+
+
+def format_report(report, limit=20):
+    """
+    Formats a disk usage report as text lines, largest first.
+
+    Parameters:
+        report (dict): Report returned by analyze_project().
+        limit (int): Number of assets and file types listed.
+
+    Returns:
+        list: Lines of the report.
+    """
+    lines = [f"{report['root']} : {format_size(report['total'])} in {report['files']} files"]
+    for title, key, count in (("Departments", 'departments', None), ("Assets", 'assets', limit),
+                              ("File types", 'file_types', limit)):
+        lines.append(f"{title} :")
+        for name, size in sorted(report[key].items(), key=lambda item: item[1], reverse=True)[:count]:
+            lines.append(f"    {name or '(none)'} : {format_size(size)}")
+    lines.append(f"Superseded increments : {len(report['superseded'])} files, "
+                 f"{format_size(report['superseded_bytes'])}")
+    lines.append(f"Duplicate textures : {len(report['duplicates'])} groups, "
+                 f"{format_size(report['duplicate_bytes'])} to gain")
+    for group in sorted(report['duplicates'], key=lambda group: group['size'], reverse=True)[:limit]:
+        lines.append(f"    {format_size(group['size'])} x {len(group['paths'])} : {', '.join(group['paths'])}")
+    return lines
+
+
+def main(args=None):
+    """
+    Prints the disk usage report of a project, and prunes its superseded increments if asked.
+
+    Parameters:
+        args (list): Command line arguments, sys.argv if None.
+    """
+    parser = argparse.ArgumentParser(description="Disk usage and superseded increments of a tuyauLigne project.")
+    parser.add_argument("root_project_folder")
+    parser.add_argument("--keep-last", type=int, default=DEFAULT_KEEP_LAST)
+    parser.add_argument("--prune", action="store_true", help="remove the superseded increments")
+    parser.add_argument("--no-duplicates", action="store_true", help="skip the search of duplicate textures")
+    parser.add_argument("--workers", type=int, default=SCAN_WORKERS)
+    options = parser.parse_args(args)
+    report = analyze_project(options.root_project_folder, options.keep_last, not options.no_duplicates,
+                             options.workers)
+    for line in format_report(report):
+        print(line)
+    if options.prune:
+        removed, freed = prune(report, dry_run=False)
+        print(f"pruned : {len(removed)} files, {format_size(freed)}")
+
+
+if __name__ == "__main__":
+    main()
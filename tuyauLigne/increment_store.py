@@ -0,0 +1,414 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+
+from tuyauLigne import canonical_path as cpth
+
+"""
+Deduplicated storage of the increments saved by inc_save.
+
+Two increments of a Maya ASCII file are mostly the same lines. Each increment is cut in chunks, and each chunk is
+stored once, compressed, in a blob named by the hash of its content :
+    chunks : a chunk ends after a line whose hash matches BOUNDARY_MASK, so an edit only changes the chunks around
+             it, the next boundaries are found on the same lines as before. Chunks are between CHUNK_MIN_SIZE and
+             CHUNK_MAX_SIZE bytes.
+    blobs : blobs/<2 first characters of the hash>/<hash>, written once and never changed.
+    manifests : manifests/<path of the file relative to the project>.json, list of the chunks of one increment, with
+                the size and the hash of the whole file.
+
+Only the files inside the project are stored. The chunks are compressed and written by STORE_WORKERS threads, with at
+most STORE_WINDOW chunks in memory at once. A blob used by no manifest anymore (an increment stored again or removed)
+is deleted by collect_garbage(), once it is older than GARBAGE_GRACE_SECONDS : a blob just written by another session
+may not have its manifest yet.
+
+The store is in the data folder of the project, a project uses it once the folder exists. Disk use and copy time of
+the store grow with the size of each change, not with the size of the file times the number of increments. The files
+of the increments stay in the project : removing one once it is stored (release) is an explicit cleanup, and the file
+is written back from its blobs (materialize) when it is opened from the asset library.
+"""
+
+STORE_FOLDER_NAME = "increment_store"
+MANIFEST_VERSION = 1
+CHUNK_MIN_SIZE = 16 * 1024
+CHUNK_MAX_SIZE = 1024 * 1024
+BOUNDARY_MASK = 0xFF
+STORE_WORKERS = 4
+STORE_WINDOW = STORE_WORKERS * 2
+GARBAGE_GRACE_SECONDS = 3600
+
+
+def content_hash(data):
+    """
+    Hashes a chunk or a file.
+
+    Parameters:
+        data (bytes): Content to hash.
+
+    Returns:
+        str: Hexadecimal digest.
+    """
+    return hashlib.blake2b(data, digest_size=20).hexdigest()
+
+
+def iter_chunks(file_path):
+    """
+    Cuts a file in content-defined chunks, on line ends.
+
+    Parameters:
+        file_path (str): Path of the file.
+
+    Yields:
+        bytes: Content of each chunk.
+    """
+    chunk = []
+    chunk_size = 0
+    with open(file_path, 'rb') as f:
+        for line in f:
+            while len(line) > CHUNK_MAX_SIZE - chunk_size:
+                # a line longer than a chunk (binary file) is cut at CHUNK_MAX_SIZE
+                cut = CHUNK_MAX_SIZE - chunk_size
+                chunk.append(line[:cut])
+                yield b"".join(chunk)
+                chunk, chunk_size, line = [], 0, line[cut:]
+            chunk.append(line)
+            chunk_size += len(line)
+            if chunk_size >= CHUNK_MIN_SIZE and zlib.crc32(line) & BOUNDARY_MASK == 0:
+                yield b"".join(chunk)
+                chunk, chunk_size = [], 0
+    if chunk:
+        yield b"".join(chunk)
+
+
+class IncrementStore:
+    """
+    Blobs and manifests of the increments of a project.
+    """
+
+    def __init__(self, root_project_folder, store_folder):
+        self.root_project_folder = cpth.CanonicalPath(root_project_folder)
+        self.store_folder = cpth.CanonicalPath(store_folder)
+        self.blob_folder = self.store_folder.joinpath("blobs")
+        self.manifest_folder = self.store_folder.joinpath("manifests")
+
+    def blob_path(self, digest):
+        """
+        Gets the path of the blob of a chunk.
+
+        Parameters:
+            digest (str): Hash of the chunk.
+
+        Returns:
+            CanonicalPath: Path of the blob.
+        """
+        return self.blob_folder.joinpath(digest[:2], digest)
+
+    def relative_path(self, file_path):
+        """
+        Gets the path of a file relative to the project.
+
+        Parameters:
+            file_path (str): Path of the file.
+
+        Returns:
+            str: Relative path, None if the file is outside of the project.
+        """
+        file_path = cpth.CanonicalPath(file_path)
+        relative_path = file_path.relative_to(self.root_project_folder)
+        # another drive gives the path itself
+        if relative_path in (".", "..", str(file_path)) or relative_path.startswith("../"):
+            return None
+        return relative_path
+
+    def manifest_path(self, file_path):
+        """
+        Gets the path of the manifest of an increment.
+
+        Parameters:
+            file_path (str): Path of the increment inside the project.
+
+        Returns:
+            CanonicalPath: Path of the manifest.
+
+        Raises:
+            ValueError: If the file is outside of the project.
+        """
+        relative_path = self.relative_path(file_path)
+        if relative_path is None:
+            raise ValueError(f"{file_path} is outside of the project {self.root_project_folder}")
+        return self.manifest_folder.joinpath(relative_path + ".json")
+
+    def write_blob(self, chunk):
+        """
+        Writes the blob of a chunk, if it is not stored yet.
+
+        Parameters:
+            chunk (bytes): Content of the chunk.
+
+        Returns:
+            str: Hash of the chunk.
+        """
+        digest = content_hash(chunk)
+        blob_path = self.blob_path(digest)
+        try:
+            # a blob used again is made recent, so collect_garbage() keeps it until its manifest is written
+            os.utime(blob_path)
+            return digest
+        except FileNotFoundError:
+            pass
+        os.makedirs(blob_path.parent, exist_ok=True)
+        tmp_path = f"{blob_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(zlib.compress(chunk, 1))
+        os.replace(tmp_path, blob_path)
+        return digest
+
+    def read_blob(self, digest):
+        """
+        Reads the content of a chunk.
+
+        Parameters:
+            digest (str): Hash of the chunk.
+
+        Returns:
+            bytes: Content of the chunk.
+        """
+        with open(self.blob_path(digest), 'rb') as f:
+            return zlib.decompress(f.read())
+
+    def store(self, file_path):
+        """
+        Stores an increment. Only the chunks not stored yet are written.
+
+        Parameters:
+            file_path (str): Path of the increment inside the project.
+
+        Returns:
+            dict: Manifest of the increment.
+        """
+        file_digest = hashlib.blake2b(digest_size=20)
+        size = 0
+
+        def chunks():
+            nonlocal size
+            for chunk in iter_chunks(file_path):
+                file_digest.update(chunk)
+                size += len(chunk)
+                yield chunk
+
+        manifest_path = self.manifest_path(file_path)
+        digests = []
+        with ThreadPoolExecutor(max_workers=STORE_WORKERS) as executor:
+            # at most STORE_WINDOW chunks are read and not written yet
+            window = deque()
+            for chunk in chunks():
+                if len(window) >= STORE_WINDOW:
+                    digests.append(window.popleft().result())
+                window.append(executor.submit(self.write_blob, chunk))
+            digests.extend(future.result() for future in window)
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'name': cpth.CanonicalPath(file_path).name,
+            'size': size,
+            'mtime_ns': os.stat(file_path).st_mtime_ns,
+            'hash': file_digest.hexdigest(),
+            'chunks': digests,
+        }
+        os.makedirs(manifest_path.parent, exist_ok=True)
+        tmp_path = f"{manifest_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, separators=(",", ":"))
+        os.replace(tmp_path, manifest_path)
+        return manifest
+
+    def manifest(self, file_path):
+        """
+        Reads the manifest of an increment.
+
+        Parameters:
+            file_path (str): Path of the increment inside the project.
+
+        Returns:
+            dict: Manifest of the increment, None if the increment is not stored.
+        """
+        try:
+            with open(self.manifest_path(file_path), 'r') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if manifest.get('version') != MANIFEST_VERSION:
+            return None
+        return manifest
+
+    def is_stored(self, file_path):
+        """
+        Checks if the file of an increment is the one stored : same size, same content, and every blob of its
+        manifest still in the store.
+
+        Parameters:
+            file_path (str): Path of the increment inside the project.
+
+        Returns:
+            bool: True if the stored increment has the content of the file.
+        """
+        manifest = self.manifest(file_path)
+        if manifest is None or not os.path.isfile(file_path) or os.path.getsize(file_path) != manifest['size']:
+            return False
+        if not all(os.path.isfile(self.blob_path(digest)) for digest in manifest['chunks']):
+            return False
+        file_digest = hashlib.blake2b(digest_size=20)
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(CHUNK_MAX_SIZE), b""):
+                file_digest.update(block)
+        return file_digest.hexdigest() == manifest['hash']
+
+    def versions(self, folder_path):
+        """
+        Lists the increments stored for a folder of the project.
+
+        Parameters:
+            folder_path (str): Path of the folder inside the project. Example: the wip maya folder of an asset.
+
+        Returns:
+            list: Names of the stored increments.
+        """
+        try:
+            manifest_folder = self.manifest_path(folder_path)[:-len(".json")]
+            names = os.listdir(manifest_folder)
+        except (FileNotFoundError, NotADirectoryError, ValueError):
+            return []
+        return sorted(name[:-len(".json")] for name in names if name.endswith(".json"))
+
+    def materialize(self, file_path):
+        """
+        Writes the file of a stored increment back in the project, from its blobs.
+
+        Parameters:
+            file_path (str): Path of the increment inside the project.
+
+        Returns:
+            bool: True if the file is written, False if the increment is not stored.
+        """
+        manifest = self.manifest(file_path)
+        if manifest is None:
+            return False
+        file_digest = hashlib.blake2b(digest_size=20)
+        tmp_path = f"{file_path}.{os.getpid()}.tmp"
+        with ThreadPoolExecutor(max_workers=STORE_WORKERS) as executor, open(tmp_path, 'wb') as f:
+            for chunk in executor.map(self.read_blob, manifest['chunks']):
+                file_digest.update(chunk)
+                f.write(chunk)
+        if file_digest.hexdigest() != manifest['hash']:
+            os.remove(tmp_path)
+            raise ValueError(f"stored increment {file_path} is corrupted")
+        os.replace(tmp_path, file_path)
+        os.utime(file_path, ns=(manifest['mtime_ns'], manifest['mtime_ns']))
+        return True
+
+    def release(self, file_path):
+        """
+        Removes the file of an increment from the project once it is stored, with all its blobs. It can be
+        materialized again.
+
+        Parameters:
+            file_path (str): Path of the increment inside the project.
+
+        Returns:
+            bool: True if the file is removed.
+        """
+        if not self.is_stored(file_path):
+            return False
+        os.remove(file_path)
+        return True
+
+    def remove(self, file_path):
+        """
+        Removes a stored increment from the store. Its blobs are deleted by collect_garbage() if no other increment
+        uses them.
+
+        Parameters:
+            file_path (str): Path of the increment inside the project.
+
+        Returns:
+            bool: True if the increment was stored.
+        """
+        try:
+            os.remove(self.manifest_path(file_path))
+        except (FileNotFoundError, ValueError):
+            return False
+        return True
+
+    def blob_references(self):
+        """
+        Counts the manifests using each blob.
+
+        Returns:
+            Counter: Hash of the blob -> number of manifests using it.
+        """
+        references = Counter()
+        for folder, folder_names, file_names in os.walk(self.manifest_folder):
+            for file_name in file_names:
+                if not file_name.endswith(".json"):
+                    continue
+                try:
+                    with open(os.path.join(folder, file_name), 'r') as f:
+                        manifest = json.load(f)
+                except (OSError, ValueError):
+                    continue
+                references.update(set(manifest.get('chunks', ())))
+        return references
+
+    def collect_garbage(self, dry_run=False):
+        """
+        Deletes the blobs used by no manifest, older than GARBAGE_GRACE_SECONDS.
+
+        Parameters:
+            dry_run (bool): True to only count the blobs that would be deleted.
+
+        Returns:
+            tuple: Number of blobs deleted (or to delete) and the bytes freed.
+        """
+        references = self.blob_references()
+        oldest = time.time() - GARBAGE_GRACE_SECONDS
+        deleted = 0
+        freed = 0
+        for folder, folder_names, file_names in os.walk(self.blob_folder):
+            for file_name in file_names:
+                if file_name in references or file_name.endswith(".tmp"):
+                    continue
+                blob_path = os.path.join(folder, file_name)
+                try:
+                    stat = os.stat(blob_path)
+                    if stat.st_mtime > oldest:
+                        continue
+                    if not dry_run:
+                        os.remove(blob_path)
+                except OSError:
+                    continue
+                deleted += 1
+                freed += stat.st_size
+        return deleted, freed
+
+
+def get_store(root_project_folder, data_folder, create=False):
+    """
+    Gets the increment store of a project.
+
+    Parameters:
+        root_project_folder (str): Root folder of the project.
+        data_folder (str): Data folder of the project.
+        create (bool): True to create the store if the project does not use one yet.
+
+    Returns:
+        IncrementStore: Store of the project, None if the project does not use one.
+    """
+    store_folder = cpth.CanonicalPath(data_folder, STORE_FOLDER_NAME)
+    if create:
+        os.makedirs(store_folder, exist_ok=True)
+    elif not os.path.isdir(store_folder):
+        return None
+    return IncrementStore(root_project_folder, store_folder)
@@ -1,52 +1,97 @@
-import json
 import os
 
 from tuyauLigne import project_manager as pm
+from tuyauLigne import tracker_cache as trc
+from tuyauLigne import tracker_reconcile as trrc
+from tuyauLigne import tracker_report as trr
+from tuyauLigne import tracker_store as trs
+from tuyauLigne import tracker_writer as trw
+
+
+def get_tracker():
+    """
+    Gets the production tracker store of the current project.
+
+    Returns:
+        TrackerStore: Store of the production tracker.
+    """
+    return trc.get_tracker(pm.dict_main_folders().get("data_folder"))
 
 
 def create_production_tracker():
     """
-    Creates the production_tracker.json inside the data folder.
+    Creates an empty production tracker and its step schema inside the data folder. An existing tracker is emptied
+    through its store, whatever its backend (JSON files or SQLite database).
     """
-    data = {'assets': [{
-        "name": "no_assets",
-        "Modeling": "TODO",
-        "UV unfold": "TODO",
-        "Surfacing": "TODO"
-    }]}
-    file_path = os.path.join(pm.dict_main_folders().get("data_folder"), 'production_tracker.json')
-    with open(file_path, 'w') as f:
-        json.dump(data, f, indent=2)
+    data_folder = pm.dict_main_folders().get("data_folder")
+    if not os.path.isfile(os.path.join(data_folder, trs.SCHEMA_FILE_NAME)):
+        trs.save_schema(data_folder, trs.default_schema())
+    get_tracker().clear()
 
 
 def add_value(asset_name):
     """
-    Adds a dictionary of values of the asset inside the production_tracker.json file.
+    Adds a dictionary of values of the asset inside the production tracker.
+
+    Parameters:
+        asset_name (str): Name of the asset.
+    """
+    get_tracker().put(trs.new_record(asset_name))
+
+
+def register_assets(asset_names):
+    """
+    Adds all the assets that are not inside the production tracker yet, with a single write.
+
+    Parameters:
+        asset_names (list): Names of the assets.
+
+    Returns:
+        list: Names of the assets added to the production tracker.
+    """
+    return get_tracker().insert_missing([trs.new_record(asset_name) for asset_name in asset_names])
+
+
+def set_status(asset_name, step, status):
+    """
+    Sets the status of a production step of the asset inside the production tracker.
 
     Parameters:
         asset_name (str): Name of the asset.
+        step (str): Name of the production step. Example: Modeling
+        status (str): New status of the step. Example: WIP
     """
-    file_path = os.path.join(pm.dict_main_folders().get("data_folder"), 'production_tracker.json')
-    with open(file_path, 'r') as f:
-        datas = json.load(f)
-        if datas['assets'][0]['name'] == "no_assets":
-            datas['assets'][0] = {
-                "name": asset_name,
-                "Modeling": "TODO",
-                "UV unfold": "TODO",
-                "Surfacing": "TODO"
-            }
-        else:
-            new_asset = {
-                "name": asset_name,
-                "Modeling": "TODO",
-                "UV unfold": "TODO",
-                "Surfacing": "TODO"
-            }
-            datas['assets'].append(new_asset)
-            datas['assets'] = sorted(datas['assets'], key=lambda x: x['name'])
-    with open(file_path, 'w') as f:
-        json.dump(datas, f, indent=2)
+    get_tracker().set_status(asset_name, step, status)
+
+
+def create_status_queue():
+    """
+    Creates the write-behind queue used to save status edits of the current project in the background.
+
+    Returns:
+        StatusWriteQueue: Queue of the status edits.
+    """
+    return trw.StatusWriteQueue(pm.dict_main_folders().get("data_folder"))
+
+
+def add_production_step(step):
+    """
+    Adds a production step to the tracker schema. The records are not rewritten, every asset starts with the default
+    status on the new step.
+
+    Parameters:
+        step (str): Name of the production step. Example: Lookdev
+
+    Returns:
+        bool: True if the step is added, False if it already exists.
+    """
+    data_folder = pm.dict_main_folders().get("data_folder")
+    schema = trs.load_schema(data_folder)
+    if step in schema['steps']:
+        return False
+    schema['steps'].append(step)
+    trs.save_schema(data_folder, schema)
+    return True
 
 
 def check_existing_value(asset_name):
@@ -59,11 +104,53 @@ def check_existing_value(asset_name):
     Returns:
         bool: True if the asset is already in the production tracker file.
     """
-    existing_value = False
-    file_path = os.path.join(pm.dict_main_folders().get("data_folder"), 'production_tracker.json')
-    with open(file_path, 'r') as f:
-        datas = json.load(f)
-    for data in datas['assets']:
-        if asset_name == data['name']:
-            existing_value = True
-    return existing_value
+    return get_tracker().exists(asset_name)
+
+
+def migrate_production_tracker():
+    """
+    Moves the production tracker of the current project from the JSON files to a SQLite database.
+
+    Returns:
+        bool: True if the tracker is migrated, False if the project already uses the database.
+    """
+    data_folder = pm.dict_main_folders().get("data_folder")
+    trc.drop_tracker(data_folder)
+    return trs.migrate_to_sqlite(data_folder)
+
+
+def print_production_report():
+    """
+    Prints the throughput report of the current project : cycle time per step, WIP and assets done per day.
+
+    Returns:
+        dict: Report computed from the event log of the tracker.
+    """
+    data_folder = pm.dict_main_folders().get("data_folder")
+    report = trr.project_report(data_folder, get_tracker().schema)
+    for line in trr.format_report(report):
+        print(line)
+    return report
+
+
+def reconcile_production_tracker(advance=False):
+    """
+    Compares the production tracker of the current project with its asset and proxy folders.
+
+    Parameters:
+        advance (bool): Also adds the assets missing from the tracker and moves the statuses forward from the files
+                        found on disk.
+
+    Returns:
+        dict: Assets missing from the tracker, assets missing on disk, and (asset, step, old, new) status changes.
+    """
+    main_folders = pm.dict_main_folders()
+    result = trrc.reconcile(get_tracker(), main_folders.get("asset_folder"), main_folders.get("proxy_folder"),
+                            advance=advance)
+    for asset_name in result['missing_in_tracker']:
+        print(f"{asset_name} is not in the production tracker")
+    for asset_name in result['missing_on_disk']:
+        print(f"{asset_name} has no folder in the project")
+    for asset_name, step, old_status, new_status in result['changes']:
+        print(f"{asset_name} {step} : {old_status} -> {new_status}")
+    return result
@@ -4,9 +4,11 @@ import maya.cmds as mc
 import maya.mel as mel
 
 from tuyauLigne import arnold_shader as ars
+from tuyauLigne import canonical_path as cpth
 from tuyauLigne import matx_manager as matxm
-from tuyauLigne import naming_convention as naco
+from tuyauLigne import naming_profile as nprf
 from tuyauLigne import project_manager as pm
+from tuyauLigne import scene_context as sctx
 
 
 def check_arnold_connection():
@@ -17,7 +19,7 @@ def check_arnold_connection():
         bool: True if an Arnold shader connection is found, False otherwise.
     """
     arnold_connection = False
-    render_meshes = mc.listRelatives("render_*", allDescendents=True, fullPath=True, type="mesh")
+    render_meshes = mc.listRelatives(nprf.PROFILE.glob("render_group"), allDescendents=True, fullPath=True, type="mesh")
     for mesh in render_meshes:
         connections = mc.listConnections(mesh + ".instObjGroups", destination=True, source=False)
         for connection in connections:
@@ -52,7 +54,7 @@ def get_textures_list(asset_name):
     """
     asset_folder = pm.dict_main_folders().get("asset_folder")
     textures_folder = pm.dict_sub_asset_folders().get("texture_map_folder")
-    textures_path = os.path.join(asset_folder, asset_name, textures_folder).replace("\\", "/")
+    textures_path = cpth.CanonicalPath(asset_folder, asset_name, textures_folder)
     files = os.listdir(textures_path)
     texture_files = [file for file in files if file.endswith('.png')]
     return textures_path, texture_files
@@ -63,17 +65,17 @@ def assign_preview_mat():
     Assigns one usdPreviewSurface on all meshes inside proxy groups.
     """
     delete_unused_shaders()
-    proxy_groups = mc.ls("proxy_*", type="transform")
+    proxy_groups = mc.ls(nprf.PROFILE.glob("proxy_group"), type="transform")
     for proxy_group in proxy_groups:
-        prp_name = proxy_group.split("_")[1]
-        usd_preview = mc.shadingNode("usdPreviewSurface", name=f"usdPrev_{prp_name}", asShader=True)
-        usd_preview_sg = mc.sets(renderable=True, noSurfaceShader=True, empty=True, name=f"usdPrev_{prp_name}SG")
+        preview_name = nprf.PROFILE.element_name("usd_preview", nprf.PROFILE.short_name(proxy_group))
+        usd_preview = mc.shadingNode("usdPreviewSurface", name=preview_name, asShader=True)
+        usd_preview_sg = mc.sets(renderable=True, noSurfaceShader=True, empty=True, name=f"{preview_name}SG")
         mc.connectAttr(f"{usd_preview}.outColor", f"{usd_preview_sg}.surfaceShader")
         proxy_meshes = mc.listRelatives(proxy_group, allDescendents=True, type="mesh")
         for proxy_mesh in proxy_meshes:
             connections = mc.listConnections(proxy_mesh + ".instObjGroups", destination=True, source=False)
             for connection in connections:
-                if mc.nodeType(connection) == 'shadingEngine' and connection != f"usdPrev_{prp_name}SG":
+                if mc.nodeType(connection) == 'shadingEngine' and connection != f"{preview_name}SG":
                     mc.select(proxy_mesh)
                     mc.hyperShade(assign=usd_preview)
                     mc.select(d=True)
@@ -85,20 +87,20 @@ def assign_tmp_mat():
     Assigns one usdPreviewSurface on all meshes inside render group.
     """
     delete_unused_shaders()
-    render_group = mc.ls("render_*", type="transform")
+    render_group = mc.ls(nprf.PROFILE.glob("render_group"), type="transform")
     if len(render_group) != 1:
         print("there is no render group, or more than one render group")
     else:
         render_meshes = mc.listRelatives(render_group, allDescendents=True, type="mesh")
-        file_name = naco.get_file_name()
-        short_name = naco.dict_file_name_part(file_name).get("asset_short_name")
-        usd_preview = mc.shadingNode("usdPreviewSurface", name=f"mat_{short_name}", asShader=True)
-        usd_preview_sg = mc.sets(renderable=True, noSurfaceShader=True, empty=True, name=f"mat_{short_name}SG")
+        short_name = sctx.get_scene_context().name_parts.get("asset_short_name")
+        mat_name = nprf.PROFILE.element_name("material", short_name)
+        usd_preview = mc.shadingNode("usdPreviewSurface", name=mat_name, asShader=True)
+        usd_preview_sg = mc.sets(renderable=True, noSurfaceShader=True, empty=True, name=f"{mat_name}SG")
         mc.connectAttr(f"{usd_preview}.outColor", f"{usd_preview_sg}.surfaceShader")
         for mesh in render_meshes:
             connections = mc.listConnections(mesh + ".instObjGroups", destination=True, source=False)
             for connection in connections:
-                if mc.nodeType(connection) == 'shadingEngine' and connection != f"mat_{short_name}SG":
+                if mc.nodeType(connection) == 'shadingEngine' and connection != f"{mat_name}SG":
                     mc.select(mesh)
                     mc.hyperShade(assign=usd_preview)
                     mc.select(d=True)
@@ -109,10 +111,10 @@ def assign_matx():
     """
     Assigns a MaterialX shader to all meshes in the render group.
     """
-    file_name = naco.get_file_name()
-    asset_name = naco.dict_file_name_part(file_name).get("asset_name")
-    short_name = naco.dict_file_name_part(file_name).get("asset_short_name")
-    render_meshes = mc.listRelatives("render_*", allDescendents=True, fullPath=True, type="mesh")
+    name_parts = sctx.get_scene_context().name_parts
+    asset_name = name_parts.get("asset_name")
+    short_name = name_parts.get("asset_short_name")
+    render_meshes = mc.listRelatives(nprf.PROFILE.glob("render_group"), allDescendents=True, fullPath=True, type="mesh")
 
     textures_path, texture_files = get_textures_list(asset_name)
     matx_stack_shape = matxm.create_matx_stack_shape(short_name)
@@ -131,10 +133,10 @@ def assign_arnold_mat():
     Assigns an Arnold shader to all meshes in the render group.
     """
     delete_unused_shaders()
-    file_name = naco.get_file_name()
-    asset_name = naco.dict_file_name_part(file_name).get("asset_name")
-    short_name = naco.dict_file_name_part(file_name).get("asset_short_name")
-    render_meshes = mc.listRelatives("render_*", allDescendents=True, fullPath=True, type="mesh")
+    name_parts = sctx.get_scene_context().name_parts
+    asset_name = name_parts.get("asset_name")
+    short_name = name_parts.get("asset_short_name")
+    render_meshes = mc.listRelatives(nprf.PROFILE.glob("render_group"), allDescendents=True, fullPath=True, type="mesh")
 
     shading_node, shading_group = ars.create_core_nodes(short_name)
     # following code in comment : connecting placed2Dtexture (optional with usd mat)
@@ -186,10 +188,10 @@ def assign_preview_texture():
     Assigns a preview texture to all meshes in the proxy groups.
     """
     delete_unused_shaders()
-    file_name = naco.get_file_name()
-    asset_name = naco.dict_file_name_part(file_name).get("asset_name")
-    short_name = naco.dict_file_name_part(file_name).get("asset_short_name")
-    proxy_meshes = mc.listRelatives("proxy_*", allDescendents=True, fullPath=True, type="mesh")
+    name_parts = sctx.get_scene_context().name_parts
+    asset_name = name_parts.get("asset_name")
+    short_name = name_parts.get("asset_short_name")
+    proxy_meshes = mc.listRelatives(nprf.PROFILE.glob("proxy_group"), allDescendents=True, fullPath=True, type="mesh")
     for mesh in proxy_meshes:
         shading_groups = mc.listConnections(mesh, type='shadingEngine')
         if shading_groups:
@@ -202,11 +204,11 @@ def assign_preview_texture():
     textures_path, texture_files = get_textures_list(asset_name)
     usd_texture = ""
     for texture in texture_files:
-        if "usdPrev_" in texture:
+        if nprf.PROFILE.prefix("usd_preview") in texture:
             usd_texture = texture
 
     img_node = mc.shadingNode("file", asTexture=True, name=f'img_baseColor_{short_name}')
-    mc.setAttr(f'{img_node}.fileTextureName', os.path.join(textures_path, texture).replace("\\", "/"), type="string")
+    mc.setAttr(f'{img_node}.fileTextureName', textures_path.joinpath(texture), type="string")
 
     mc.connectAttr(f'{img_node}.outColor', f'{shading_node}.diffuseColor')
 
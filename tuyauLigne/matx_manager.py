@@ -5,6 +5,9 @@ import maya.cmds as mc
 import maya.mel as mel
 import ufe
 
+from tuyauLigne import canonical_path as cpth
+from tuyauLigne import naming_profile as nprf
+
 
 def duplicate_matx_template(textures_folder, short_name):
     """
@@ -24,7 +27,7 @@ def duplicate_matx_template(textures_folder, short_name):
         return
     doc_name = f'doc_{short_name}'
     file_name = f"{doc_name}.mtlx"
-    destination_path = os.path.join(textures_folder, file_name)
+    destination_path = cpth.CanonicalPath(textures_folder, file_name)
     shutil.copyfile(template_path, destination_path)
     return destination_path, doc_name
 
@@ -96,7 +99,7 @@ def assign_matx(shader_name):
     Parameters:
         shader_name (str): The name of the MaterialX shader to assign.
     """
-    meshes = mc.listRelatives("render_*", allDescendents=True, fullPath=True, type="mesh")
+    meshes = mc.listRelatives(nprf.PROFILE.glob("render_group"), allDescendents=True, fullPath=True, type="mesh")
     for mesh in meshes:
         mc.materialxAssign(edit=True, assign=True, sourcePath=shader_name)
 
@@ -113,8 +116,8 @@ def set_texture_path(compound_name, texture_path, texture_files, texture_types):
     """
     for texture_type in texture_types:
         for file in texture_files:
-            if "mat_" in file and texture_type in file:
-                file_path = os.path.join(texture_path, file).replace("\\", "/")
+            if nprf.PROFILE.prefix("material") in file and texture_type in file:
+                file_path = cpth.CanonicalPath(texture_path, file)
                 mc.setAttr(f"{compound_name}%img_{texture_type}.file", file_path)
 
 
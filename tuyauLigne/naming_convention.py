@@ -1,5 +1,10 @@
+import re
+from functools import lru_cache
+
 import maya.cmds as mc
 
+from tuyauLigne import naming_profile as nprf
+
 """
 GLOSSARY :
 A
@@ -23,9 +28,178 @@ file name :  name of the maya file with this structure : prp_jarA_001.ma
             prp_jarA : asset name
             jarA : asset short name
             001: inc number
-            ma : file type    
+            ma : file type
+
+The separator, the prefixes and the increment padding come from the naming profile (see naming_profile).
+The names are parsed with the patterns compiled from it, in a single match that checks the whole name. The parts of a
+name are an immutable record, and the last NAME_CACHE_SIZE names parsed are kept : parsing the same name again is a
+lookup. A name outside of the convention raises a NamingError telling which part is wrong.
 """
 
+NAME_CACHE_SIZE = 4096
+PROFILE = nprf.PROFILE
+FILE_NAME_PATTERN = PROFILE.file_name_matcher
+ELEMENT_NAME_PATTERN = PROFILE.element_name_matcher
+NAME_PART_PATTERN = PROFILE.part_matcher
+
+
+class NamingError(ValueError):
+    """
+    Name outside of the naming convention.
+    """
+
+
+class FileNameParts:
+    """
+    Components of a file name. Example: prp_jarA_001.ma
+    """
+
+    __slots__ = ("asset_type", "asset_short_name", "inc_number", "file_type")
+
+    def __init__(self, asset_type, asset_short_name, inc_number, file_type):
+        object.__setattr__(self, "asset_type", asset_type)
+        object.__setattr__(self, "asset_short_name", asset_short_name)
+        object.__setattr__(self, "inc_number", inc_number)
+        object.__setattr__(self, "file_type", file_type)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __eq__(self, other):
+        if not isinstance(other, FileNameParts):
+            return NotImplemented
+        return self.as_tuple() == other.as_tuple()
+
+    def __hash__(self):
+        return hash(self.as_tuple())
+
+    def __repr__(self):
+        return f"FileNameParts({self.file_name!r})"
+
+    @property
+    def asset_name(self):
+        """
+        str: Type and short name of the asset. Example: prp_jarA
+        """
+        return self.asset_type + PROFILE.separator + self.asset_short_name
+
+    @property
+    def file_name(self):
+        """
+        str: File name built back from its parts, the inc number padded by the profile. Example: prp_jarA_001.ma
+        """
+        return PROFILE.increment_name(self.asset_name, self.inc_number) + "." + self.file_type
+
+    def as_tuple(self):
+        """
+        Returns:
+            tuple: Asset type, short name, inc number and file type.
+        """
+        return self.asset_type, self.asset_short_name, self.inc_number, self.file_type
+
+    def as_dict(self):
+        """
+        Returns:
+            dict: All components of the file name, with the keys of dict_file_name_part().
+        """
+        return {
+            "asset_type": self.asset_type,
+            "asset_name": self.asset_name,
+            "asset_short_name": self.asset_short_name,
+            "inc_number": self.inc_number,
+            "file_type": self.file_type,
+        }
+
+
+class ElementNameParts:
+    """
+    Components of an element name. Example: grp_jarA
+    """
+
+    __slots__ = ("element_type", "element_short_name", "suffix")
+
+    def __init__(self, element_type, element_short_name, suffix=""):
+        object.__setattr__(self, "element_type", element_type)
+        object.__setattr__(self, "element_short_name", element_short_name)
+        object.__setattr__(self, "suffix", suffix)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __eq__(self, other):
+        if not isinstance(other, ElementNameParts):
+            return NotImplemented
+        return self.as_tuple() == other.as_tuple()
+
+    def __hash__(self):
+        return hash(self.as_tuple())
+
+    def __repr__(self):
+        return f"ElementNameParts({self.element_name + self.suffix!r})"
+
+    @property
+    def element_name(self):
+        """
+        str: Type and short name of the element. Example: grp_jarA
+        """
+        return self.element_type + PROFILE.separator + self.element_short_name
+
+    def as_tuple(self):
+        """
+        Returns:
+            tuple: Element type, short name and suffix.
+        """
+        return self.element_type, self.element_short_name, self.suffix
+
+    def as_dict(self):
+        """
+        Returns:
+            dict: All components of the element name, with the keys of dict_element_name_part().
+        """
+        return {
+            "element_type": self.element_type,
+            "element_name": self.element_name,
+            "element_short_name": self.element_short_name,
+        }
+
+
+class NameValidation:
+    """
+    Names of a batch sorted by validate_names().
+    """
+
+    __slots__ = ("valid", "wrong_prefix", "bad_short_name", "bad_increment")
+
+    def __init__(self):
+        self.valid = []
+        self.wrong_prefix = []
+        self.bad_short_name = []
+        self.bad_increment = []
+
+    def __repr__(self):
+        return (f"NameValidation(valid={len(self.valid)}, wrong_prefix={len(self.wrong_prefix)}, "
+                f"bad_short_name={len(self.bad_short_name)}, bad_increment={len(self.bad_increment)})")
+
+    @property
+    def invalid(self):
+        """
+        list: Names outside of the convention, whatever the reason.
+        """
+        return self.wrong_prefix + self.bad_short_name + self.bad_increment
+
+    @property
+    def ok(self):
+        """
+        bool: True if every name is valid.
+        """
+        return not (self.wrong_prefix or self.bad_short_name or self.bad_increment)
+
 
 def get_file_name():
     """
@@ -35,9 +209,106 @@ def get_file_name():
     return file_name
 
 
+def file_name_error(file_name):
+    """
+    Builds the error of a file name outside of the convention, telling which part is wrong.
+
+    Parameters:
+        file_name (str): File name that did not match FILE_NAME_PATTERN.
+
+    Returns:
+        NamingError: Error to raise.
+    """
+    stem, dot, file_type = file_name.rpartition(".")
+    parts = stem.split(PROFILE.separator)
+    if not file_name:
+        reason = "empty name"
+    elif not dot:
+        reason = "no file type"
+    elif len(parts) != 3:
+        reason = f"{len(parts)} parts separated by '{PROFILE.separator}' instead of 3"
+    elif parts[0] not in PROFILE.asset_types:
+        reason = f"asset type {parts[0]!r} is not one of {', '.join(PROFILE.asset_types)}"
+    elif not parts[2].isdigit():
+        reason = f"inc number {parts[2]!r} is not a number"
+    else:
+        wrong = [part for part in parts[:2] + [file_type] if not NAME_PART_PATTERN.match(part)]
+        reason = f"wrong part {wrong[0]!r}" if wrong else "wrong part"
+    separator = PROFILE.separator
+    example = PROFILE.increment_name(PROFILE.element_name(PROFILE.roles[PROFILE.asset_types[0]], "jarA"), 1) + ".ma"
+    return NamingError(f"file name {file_name!r} is outside of the naming convention ({reason}), expected "
+                       f"<asset type>{separator}<short name>{separator}<inc number>.<file type>, example: {example}")
+
+
+def element_name_error(element_name):
+    """
+    Builds the error of an element name outside of the convention, telling which part is wrong.
+
+    Parameters:
+        element_name (str): Element name that did not match ELEMENT_NAME_PATTERN.
+
+    Returns:
+        NamingError: Error to raise.
+    """
+    parts = element_name.split(PROFILE.separator)
+    if not element_name:
+        reason = "empty name"
+    elif len(parts) < 2:
+        reason = f"no '{PROFILE.separator}' between the type and the short name"
+    else:
+        wrong = [part for part in parts[:2] if not NAME_PART_PATTERN.match(part)]
+        reason = f"wrong part {wrong[0]!r}" if wrong else "wrong suffix"
+    separator = PROFILE.separator
+    return NamingError(f"element name {element_name!r} is outside of the naming convention ({reason}), expected "
+                       f"<element type>{separator}<short name>, example: {PROFILE.element_name('group', 'jarA')}")
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def parse_file_name(file_name):
+    """
+    Parses a file name in a single match of the whole name.
+
+    Parameters:
+        file_name (str): Name of the file. Example: prp_jarA_001.ma
+
+    Returns:
+        FileNameParts: Components of the file name.
+
+    Raises:
+        NamingError: The file name is outside of the naming convention.
+    """
+    match = FILE_NAME_PATTERN.match(file_name)
+    if match is None:
+        raise file_name_error(file_name)
+    return FileNameParts(match.group("asset_type"), match.group("asset_short_name"), int(match.group("inc_number")),
+                         match.group("file_type"))
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def parse_element_name(element_name):
+    """
+    Parses an element name in a single match of the whole name.
+
+    Parameters:
+        element_name (str): Name of the element. Example: grp_jarA
+
+    Returns:
+        ElementNameParts: Components of the element name.
+
+    Raises:
+        NamingError: The element name is outside of the naming convention.
+    """
+    match = ELEMENT_NAME_PATTERN.match(element_name)
+    if match is None:
+        raise element_name_error(element_name)
+    return ElementNameParts(match.group("element_type"), match.group("element_short_name"),
+                            match.group("suffix") or "")
+
+
 def dict_file_name_part(file_name):
     """
-    Stores all the components of the asset name, given the file name.
+    Stores all the components of the asset name, given the file name. Kept for the tools using a dict, see
+    parse_file_name().
 
     Parameters:
         file_name (str): Name of the file.
@@ -50,20 +321,16 @@ def dict_file_name_part(file_name):
 
     Returns:
         dict: All components of the file name.
+
+    Raises:
+        NamingError: The file name is outside of the naming convention.
     """
-    dict_file_name = {
-        "asset_type": file_name.split("_")[0],
-        "asset_name": file_name.split("_")[0] + "_" + file_name.split("_")[1],
-        "asset_short_name": file_name.split("_")[1],
-        "inc_number": int("{:03d}".format(int(file_name.split("_")[2].split(".")[0]))),
-        "file_type": file_name.split(".")[-1],
-    }
-    return dict_file_name
+    return parse_file_name(file_name).as_dict()
 
 
 def dict_element_name_part(element_name):
     """
-    Stores all the components of an element name.
+    Stores all the components of an element name. Kept for the tools using a dict, see parse_element_name().
 
     Parameters:
         element_name (str): Name of the element.
@@ -74,10 +341,67 @@ def dict_element_name_part(element_name):
 
     Returns:
         dict: All components of the element name.
+
+    Raises:
+        NamingError: The element name is outside of the naming convention.
+    """
+    return parse_element_name(element_name).as_dict()
+
+
+@lru_cache(maxsize=64)
+def batch_name_pattern(kinds, short_name=None):
+    """
+    Compiles the pattern sorting a batch of names, one line per name. The branch matching a line is the category of
+    the name, the first branch matching wins.
+
+    Parameters:
+        kinds (tuple): Element types expected.
+        short_name (str): Short name expected, None to accept any short name.
+
+    Returns:
+        Pattern: Compiled pattern, with a named group per category.
+    """
+    types = "|".join(re.escape(kind) for kind in kinds)
+    part = PROFILE.part_pattern
+    short = re.escape(short_name) if short_name is not None else part
+    sep = re.escape(PROFILE.separator)
+    padding = PROFILE.increment_padding
+    return re.compile(rf"^(?:(?P<valid>(?:{types}){sep}{short}(?:{sep}[0-9]{{{padding}}})?)"
+                      rf"|(?P<bad_increment>(?:{types}){sep}{short}{sep}[^\n]*)"
+                      rf"|(?P<other_short_name>(?:{types}){sep}{part}(?:{sep}[^\n]*)?)"
+                      rf"|(?P<wrong_prefix>{part}{sep}{part}(?:{sep}[^\n]*)?)"
+                      rf"|(?P<bad_short_name>[^\n]*))$", re.MULTILINE)
+
+
+def validate_names(names, kind, short_name=None):
+    """
+    Sorts a batch of element names against the convention, in a single pass of a compiled pattern over all of them.
+    The names are given as they come from a single mc.ls or mc.listRelatives call, a DAG path is checked on its last
+    part.
+
+    Parameters:
+        names (list): Names of the elements. Example: ["prp_jarA", "grp_jarA", "render_jarA"]
+        kind (str or tuple): Element type, or element types, expected. Example: ("proxy", "render")
+        short_name (str): Short name expected for every element, None to accept any short name.
+
+    Returns:
+        NameValidation: The names sorted in :
+            valid : names following the convention.
+            wrong_prefix : names whose element type is not the expected one.
+            bad_short_name : names without a short name, with a wrong character or with another short name.
+            bad_increment : names ending with something else than a padded increment. Example: grp_jarA_1
     """
-    dict_element_name = {
-        "element_type": element_name.split("_")[0],
-        "element_name": element_name.split("_")[0] + "_" + element_name.split("_")[1],
-        "element_short_name": element_name.split("_")[1]
+    kinds = (kind,) if isinstance(kind, str) else tuple(kind)
+    names = list(names)
+    result = NameValidation()
+    categories = {
+        "valid": result.valid,
+        "bad_increment": result.bad_increment,
+        "other_short_name": result.bad_short_name,
+        "wrong_prefix": result.wrong_prefix,
+        "bad_short_name": result.bad_short_name,
     }
-    return dict_element_name
+    short_names = "\n".join(name.rpartition("|")[2] for name in names)
+    for name, match in zip(names, batch_name_pattern(kinds, short_name).finditer(short_names)):
+        categories[match.lastgroup].append(name)
+    return result
@@ -0,0 +1,223 @@
+import json
+import os
+import re
+
+"""
+Naming convention of a tuyauLigne project, shared by the Maya and the Substance Painter plugins.
+
+The convention is only written in naming_profile.json, next to this file (the same file is shipped with both
+plugins). It is loaded once, when the module is imported, and compiled at that time :
+    separator : character between the parts of a name. Example: _
+    increment_padding : number of digits of an increment. Example: 3 for prp_jarA_001.ma
+    name_characters : characters allowed inside a part of a name, as a regular expression class.
+    tokens : prefix of each kind of element, by role. Example: "render_group": "render"
+    asset_types : roles of the elements that are assets, with their own files and folders.
+
+The tools ask for a role, never for a prefix : adapting the convention of a studio is a change of
+naming_profile.json only.
+"""
+
+PROFILE_FILE_NAME = "naming_profile.json"
+
+
+def get_profile_path():
+    """
+    Get the path of the naming profile shipped with the plugin.
+
+    Returns:
+        str: Path of naming_profile.json.
+    """
+    return os.path.join(os.path.dirname(os.path.realpath(__file__)), PROFILE_FILE_NAME)
+
+
+def load_profile(profile_path=None):
+    """
+    Loads a naming profile file.
+
+    Parameters:
+        profile_path (str): Path of the profile file, the one of the plugin if None.
+
+    Returns:
+        dict: Separator, increment padding, name characters, tokens and asset types of the convention.
+    """
+    with open(profile_path or get_profile_path(), 'r') as f:
+        return json.load(f)
+
+
+class NamingProfile:
+    """
+    Compiled naming convention : matchers and formatters of the names.
+    """
+
+    def __init__(self, profile):
+        self.separator = profile.get('separator', "_")
+        self.increment_padding = int(profile.get('increment_padding', 3))
+        self.tokens = dict(profile['tokens'])
+        self.roles = {token: role for role, token in self.tokens.items()}
+        self.asset_types = [self.tokens[role] for role in profile.get('asset_types', [])]
+
+        separator = re.escape(self.separator)
+        characters = profile.get('name_characters', 'A-Za-z0-9')
+        part = f"[{characters}]+"
+        asset_types = "|".join(re.escape(asset_type) for asset_type in self.asset_types)
+        self.part_pattern = part
+        self.part_matcher = re.compile(f"^{part}$")
+        self.file_name_matcher = re.compile(rf"^(?P<asset_type>{asset_types}){separator}"
+                                            rf"(?P<asset_short_name>{part}){separator}"
+                                            rf"(?P<inc_number>[0-9]+)\.(?P<file_type>{part})$")
+        self.element_name_matcher = re.compile(rf"^(?P<element_type>{part}){separator}"
+                                               rf"(?P<element_short_name>{part})"
+                                               rf"(?P<suffix>(?:{separator}[{characters}]*)+)?$")
+        self.increment_matcher = re.compile(rf"^(?P<stem>.+){separator}"
+                                            rf"(?P<inc_number>[0-9]{{{self.increment_padding},}})"
+                                            rf"(?P<extension>\.[^.]+)$")
+
+    def token(self, role):
+        """
+        Gets the prefix of a role.
+
+        Parameters:
+            role (str): Role of the element. Example: render_group
+
+        Returns:
+            str: Prefix of the role. Example: render
+        """
+        return self.tokens[role]
+
+    def prefix(self, role):
+        """
+        Gets the start of the names of a role, its token and the separator.
+
+        Parameters:
+            role (str): Role of the element. Example: render_group
+
+        Returns:
+            str: Start of the names. Example: render_
+        """
+        return self.tokens[role] + self.separator
+
+    def role(self, name):
+        """
+        Gets the role of a name, from its prefix.
+
+        Parameters:
+            name (str): Name of an element or a file. Example: render_jarA
+
+        Returns:
+            str: Role of the name, None if its prefix is not a token of the convention.
+        """
+        return self.roles.get(name.partition(self.separator)[0])
+
+    def is_role(self, name, role):
+        """
+        Checks if a name starts with the prefix of a role.
+
+        Parameters:
+            name (str): Name of an element or a file. Example: prp_jarA
+            role (str): Role expected. Example: prop
+
+        Returns:
+            bool: True if the name has the prefix of the role.
+        """
+        return name.startswith(self.prefix(role))
+
+    def short_name(self, name):
+        """
+        Gets the short name of a name, the part after its prefix.
+
+        Parameters:
+            name (str): Name of an element or a file. Example: proxy_jarA_001
+
+        Returns:
+            str: Short name. Example: jarA
+        """
+        return name.split(self.separator, 2)[1] if self.separator in name else ""
+
+    def element_name(self, role, short_name, *suffixes):
+        """
+        Builds the name of an element.
+
+        Parameters:
+            role (str): Role of the element. Example: render_group
+            short_name (str): Short name of the element. Example: jarA
+            *suffixes (str): Parts added after the short name.
+
+        Returns:
+            str: Name of the element. Example: render_jarA
+        """
+        return self.separator.join((self.tokens[role], short_name) + suffixes)
+
+    def swap_role(self, name, role):
+        """
+        Builds the name of another element of the same asset. Example: set_jarA -> assembly_jarA
+
+        Parameters:
+            name (str): Name of an element.
+            role (str): Role of the element to build.
+
+        Returns:
+            str: Name with the prefix of the role.
+        """
+        return self.prefix(role) + name.partition(self.separator)[2]
+
+    def increment(self, inc_number):
+        """
+        Formats an increment.
+
+        Parameters:
+            inc_number (int): Number of the increment. Example: 1
+
+        Returns:
+            str: Padded increment. Example: 001
+        """
+        return f"{inc_number:0{self.increment_padding}d}"
+
+    def increment_name(self, asset_name, inc_number):
+        """
+        Builds the name of an increment of an asset, without its file type.
+
+        Parameters:
+            asset_name (str): Name of the asset. Example: prp_jarA
+            inc_number (int): Number of the increment.
+
+        Returns:
+            str: Name of the increment. Example: prp_jarA_001
+        """
+        return asset_name + self.separator + self.increment(inc_number)
+
+    def increment_number(self, file_name, asset_name, file_type=None):
+        """
+        Gets the number of an increment of an asset from its file name.
+
+        Parameters:
+            file_name (str): Name of a file. Example: prp_jarA_012.ma
+            asset_name (str): Name of the asset. Example: prp_jarA
+            file_type (str): File type expected, any if None. Example: ma
+
+        Returns:
+            int: Number of the increment, None if the file is not an increment of the asset.
+        """
+        start = asset_name + self.separator
+        if not file_name.startswith(start):
+            return None
+        inc_number, dot, name_file_type = file_name[len(start):].partition(".")
+        if not dot or not inc_number.isascii() or not inc_number.isdigit():
+            return None
+        if file_type is not None and name_file_type != file_type:
+            return None
+        return int(inc_number)
+
+    def glob(self, role):
+        """
+        Builds the wildcard matching every element of a role, for Maya or Substance Painter queries.
+
+        Parameters:
+            role (str): Role of the elements. Example: proxy_group
+
+        Returns:
+            str: Wildcard. Example: proxy_*
+        """
+        return self.prefix(role) + "*"
+
+
+PROFILE = NamingProfile(load_profile())
@@ -1,6 +1,31 @@
+import maya.api.OpenMaya as om
 import maya.cmds as mc
 
-from tuyauLigne import naming_convention as naco
+from tuyauLigne import naming_profile as nprf
+from tuyauLigne import scene_context as sctx
+
+"""
+Groups of the outliner : master group, parenting, visibility and transforms.
+
+The transforms of a list of groups are read through the plugs of the nodes (OpenMaya), instead of one getAttr
+command per channel and per group. They are written with setAttr, inside one undo chunk so that a restore or a lock is
+undone in one step :
+    restore : one command per attribute (translate, rotate, scale) and per element when the three channels of the
+              attribute are given, one command per channel otherwise.
+    lock : one command per attribute and per element, the attribute itself is locked. Unlocking also unlocks the
+           channels locked one by one (older scenes), only the ones found locked are changed.
+The values are in the units of the scene, the same as getAttr : translate in the linear unit, rotate in the angular
+unit.
+
+The locks of all the channels and of their attributes are checked before anything is written, a locked channel leaves
+every element as it was.
+"""
+
+TRANSLATE_CHANNELS = ("tx", "ty", "tz")
+ROTATE_CHANNELS = ("rx", "ry", "rz")
+SCALE_CHANNELS = ("sx", "sy", "sz")
+TRANSFORM_CHANNELS = TRANSLATE_CHANNELS + ROTATE_CHANNELS + SCALE_CHANNELS
+TRANSFORM_ATTRIBUTES = (("t", TRANSLATE_CHANNELS), ("r", ROTATE_CHANNELS), ("s", SCALE_CHANNELS))
 
 
 def get_master_grp_name():
@@ -10,9 +35,131 @@ def get_master_grp_name():
     Returns:
         str: Name of the master group.
     """
-    file_name = mc.file(q=True, sceneName=True, shortName=True)
-    master_grp = naco.dict_file_name_part(file_name).get("asset_name")
-    return master_grp
+    return sctx.get_scene_context().master_grp
+
+
+def get_transform_nodes(elements):
+    """
+    Finds the nodes of a list of elements, each name once. A selection list merges the names of a same node, so each
+    name gets its own.
+
+    Parameters:
+        elements (list): Names of the elements.
+
+    Returns:
+        list: Dependency node function set of each element, in the same order.
+    """
+    nodes = {}
+    for element in elements:
+        if element not in nodes:
+            selection = om.MSelectionList()
+            selection.add(element)
+            nodes[element] = om.MFnDependencyNode(selection.getDependNode(0))
+    return [nodes[element] for element in elements]
+
+
+def get_channel(plug, channel):
+    """
+    Reads a transform channel, in the units of the scene.
+
+    Parameters:
+        plug (MPlug): Plug of the channel.
+        channel (str): Short name of the channel. Example: rx
+
+    Returns:
+        float: Value of the channel.
+    """
+    if channel in TRANSLATE_CHANNELS:
+        return plug.asMDistance().asUnits(om.MDistance.uiUnit())
+    if channel in ROTATE_CHANNELS:
+        return plug.asMAngle().asUnits(om.MAngle.uiUnit())
+    return plug.asDouble()
+
+
+def get_transforms(elements):
+    """
+    Stores the translate, rotate and scale of a list of elements at once.
+
+    Parameters:
+        elements (list): Names of the elements.
+
+    Returns:
+        dict: Element -> transforms of the element. Keys: tx, ty, tz, rx, ry, rz, sx, sy, sz.
+    """
+    transforms = {}
+    for element, node in zip(elements, get_transform_nodes(elements)):
+        transforms[element] = {channel: get_channel(node.findPlug(channel, False), channel)
+                               for channel in TRANSFORM_CHANNELS}
+    return transforms
+
+
+def is_locked(node, channel):
+    """
+    Checks if a transform channel is locked, by itself or by its attribute.
+
+    Parameters:
+        node (MFnDependencyNode): Node of the element.
+        channel (str): Short name of the channel. Example: rx
+
+    Returns:
+        bool: True if the channel cannot be written.
+    """
+    return node.findPlug(channel, False).isLocked or node.findPlug(channel[0], False).isLocked
+
+
+def set_transforms(element_transforms):
+    """
+    Restores the transforms of a list of elements at once. The channels missing from the transforms of an element
+    are not changed.
+
+    Parameters:
+        element_transforms (dict): Element -> transforms, as returned by get_transforms().
+
+    Raises:
+        RuntimeError: A channel to write is locked, nothing is written.
+    """
+    elements = list(element_transforms)
+    locked = [f"{element}.{channel}" for element, node in zip(elements, get_transform_nodes(elements))
+              for channel in element_transforms[element] if is_locked(node, channel)]
+    if locked:
+        raise RuntimeError(f"locked channels : {', '.join(locked)}")
+    mc.undoInfo(openChunk=True, chunkName="set_transforms")
+    try:
+        for element in elements:
+            transforms = element_transforms[element]
+            for attribute, channels in TRANSFORM_ATTRIBUTES:
+                if all(channel in transforms for channel in channels):
+                    mc.setAttr(f"{element}.{attribute}", *(transforms[channel] for channel in channels))
+                    continue
+                for channel in channels:
+                    if channel in transforms:
+                        mc.setAttr(f"{element}.{channel}", transforms[channel])
+    finally:
+        mc.undoInfo(closeChunk=True)
+
+
+def set_transforms_lock(elements, lock):
+    """
+    Locks or unlocks the translate, rotate and scale of a list of elements at once.
+
+    Parameters:
+        elements (list): Names of the elements.
+        lock (bool): True to lock the channels, False to unlock them.
+    """
+    elements = list(elements)
+    # the channels locked one by one, by an older version of the tools, are unlocked too
+    locked_channels = [] if lock else [
+        f"{element}.{channel}" for element, node in zip(elements, get_transform_nodes(elements))
+        for channel in TRANSFORM_CHANNELS if node.findPlug(channel, False).isLocked]
+    mc.undoInfo(openChunk=True, chunkName="set_transforms_lock")
+    try:
+        for element in elements:
+            for attribute, _ in TRANSFORM_ATTRIBUTES:
+                mc.setAttr(f"{element}.{attribute}", lock=lock)
+        for channel_path in locked_channels:
+            mc.setAttr(channel_path, lock=False)
+    finally:
+        mc.undoInfo(closeChunk=True)
 
 
 def lock_main_attr(element):
@@ -22,10 +169,7 @@ def lock_main_attr(element):
     Parameters:
         element (str): Name of the element. Can be a group, a mesh, etc.
     """
-    attributs = ["tx", "ty", "tz", "rx", "ry", "rz", "sx", "sy", "sz"]
-
-    for attribut in attributs:
-        mc.setAttr(f"{element}.{attribut}", lock=True)
+    set_transforms_lock([element], True)
 
 
 def unlock_main_attr(element):
@@ -35,10 +179,7 @@ def unlock_main_attr(element):
     Parameters:
         element (str): Name of the element. Can be a group, a mesh, etc.
     """
-    attributs = ["tx", "ty", "tz", "rx", "ry", "rz", "sx", "sy", "sz"]
-
-    for attribut in attributs:
-        mc.setAttr(f"{element}.{attribut}", lock=False)
+    set_transforms_lock([element], False)
 
 
 def unparent(asset_name):
@@ -81,21 +222,9 @@ def store_element_transforms(asset_name):
         asset_name (str): Name of the asset.
 
     Returns:
-         dict: Stores the transforms. Keys: tx, ty, tz, rx, ry, rz.
+         dict: Stores the transforms. Keys: tx, ty, tz, rx, ry, rz, sx, sy, sz.
     """
-    asset_transforms = {
-        "tx": mc.getAttr(f"{asset_name}.tx"),
-        "ty": mc.getAttr(f"{asset_name}.ty"),
-        "tz": mc.getAttr(f"{asset_name}.tz"),
-        "rx": mc.getAttr(f"{asset_name}.rx"),
-        "ry": mc.getAttr(f"{asset_name}.ry"),
-        "rz": mc.getAttr(f"{asset_name}.rz"),
-        "sx": mc.getAttr(f"{asset_name}.sx"),
-        "sy": mc.getAttr(f"{asset_name}.sy"),
-        "sz": mc.getAttr(f"{asset_name}.sz"),
-    }
-
-    return asset_transforms
+    return get_transforms([asset_name])[asset_name]
 
 
 def center_element_world(asset_name):
@@ -105,9 +234,17 @@ def center_element_world(asset_name):
     Parameters:
         asset_name (str): Name of the asset.
     """
-    transforms = ["tx", "ty", "tz", "rx", "ry", "rz"]
-    for transform in transforms:
-        mc.setAttr(f"{asset_name}.{transform}", 0)
+    center_elements_world([asset_name])
+
+
+def center_elements_world(elements):
+    """
+    Places a list of elements at the center of world coordinates, and rotates them to 0,0,0, at once.
+
+    Parameters:
+        elements (list): Names of the elements.
+    """
+    set_transforms({element: dict.fromkeys(TRANSLATE_CHANNELS + ROTATE_CHANNELS, 0) for element in elements})
 
 
 def restore_element_transforms(asset_name, asset_transforms):
@@ -118,8 +255,7 @@ def restore_element_transforms(asset_name, asset_transforms):
         asset_name (str): Name of the asset.
         asset_transforms (dict): Translate and rotate of the asset.
     """
-    for key, value in asset_transforms.items():
-        mc.setAttr(f"{asset_name}.{key}", value)
+    set_transforms({asset_name: asset_transforms})
 
 
 def create_render_group(prp_group):
@@ -134,9 +270,7 @@ def create_render_group(prp_group):
     """
     prp_transforms = store_element_transforms(prp_group)
 
-    short_name = prp_group.split("_")[1]
-    render_group = mc.group(name=f"render_{short_name}", empty=True)
-    for key, value in prp_transforms.items():
-        mc.setAttr(f"{render_group}.{key}", value)
+    render_group = mc.group(name=nprf.PROFILE.swap_role(prp_group, "render_group"), empty=True)
+    set_transforms({render_group: prp_transforms})
     mc.parent(render_group, prp_group)
     return render_group
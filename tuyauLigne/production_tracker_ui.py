@@ -1,13 +1,12 @@
-import json
-import os
 import sys
 
+import maya.cmds as mc
 import maya.OpenMayaUI as omui
 
 try:
-    from PySide6 import QtCore, QtWidgets
+    from PySide6 import QtCore, QtGui, QtWidgets
 except ImportError:
-    from PySide2 import QtCore, QtWidgets
+    from PySide2 import QtCore, QtGui, QtWidgets
 
 try:
     from PySide6.QtCore import Qt
@@ -19,9 +18,17 @@ try:
 except ImportError:
     from shiboken2 import wrapInstance
 
-from functools import partial
+from tuyauLigne import json_manager as jsm
+from tuyauLigne import naming_profile as nprf
+from tuyauLigne import tracker_search as trsi
+from tuyauLigne import tracker_store as trs
 
-from tuyauLigne import project_manager as pm
+STATUS_COLORS = {
+    "TODO": "#670101",
+    "WIP": "#7f7a14",
+    "RETAKE": "#714a08",
+    "DONE": "#365f29",
+}
 
 
 class ProductionTrackerLaunch:
@@ -57,14 +64,170 @@ class ProductionTrackerLaunch:
         return win
 
 
+class TrackerTableModel(QtCore.QAbstractTableModel):
+    """
+    Table of the production tracker : one row per asset, the asset name then one column per production step.
+    Only the rows visible in the view are asked for their data, nothing is created per asset.
+    """
+
+    def __init__(self, assets, schema, status_queue, search_index, parent=None):
+        super(TrackerTableModel, self).__init__(parent)
+        self.assets = assets
+        self.steps = schema['steps']
+        self.default_status = schema['default_status']
+        self.status_queue = status_queue
+        self.search_index = search_index
+        self.brushes = {status: QtGui.QBrush(QtGui.QColor(color)) for status, color in STATUS_COLORS.items()}
+
+    def set_assets(self, assets):
+        """
+        Replaces all the rows of the table.
+
+        Parameters:
+            assets (list): Records of the assets.
+        """
+        self.beginResetModel()
+        self.assets = assets
+        self.endResetModel()
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.assets)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.steps) + 1
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            if section == 0:
+                return "Asset name"
+            return self.steps[section - 1]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        asset = self.assets[index.row()]
+        if index.column() == 0:
+            if role in (Qt.DisplayRole, Qt.EditRole):
+                return asset['name']
+            return None
+        status = asset.get(self.steps[index.column() - 1], self.default_status)
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return status
+        if role == Qt.BackgroundRole:
+            return self.brushes.get(status)
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        if index.column() == 0:
+            return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable
+
+    def setData(self, index, value, role=Qt.EditRole):
+        """
+        Edits the status of a production step. The edit is queued and written in the background.
+        """
+        if role != Qt.EditRole or not index.isValid() or index.column() == 0:
+            return False
+        step = self.steps[index.column() - 1]
+        asset = self.assets[index.row()]
+        if asset.get(step, self.default_status) == value:
+            return False
+        asset = dict(asset)
+        asset[step] = value
+        self.assets[index.row()] = asset
+        self.status_queue.queue(asset['name'], step, value)
+        self.search_index.update_status(asset['name'], step, value)
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole, Qt.BackgroundRole])
+        return True
+
+
+class TrackerFilterModel(QtCore.QSortFilterProxyModel):
+    """
+    Shows only the rows of the assets found by the search index.
+    """
+
+    def __init__(self, parent=None):
+        super(TrackerFilterModel, self).__init__(parent)
+        self.matches = None
+
+    def set_matches(self, matches):
+        """
+        Sets the assets to show.
+
+        Parameters:
+            matches (set): Names of the assets to show, None to show every asset.
+        """
+        self.matches = matches
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self.matches is None:
+            return True
+        return self.sourceModel().assets[source_row]['name'] in self.matches
+
+
+class StatusComboDelegate(QtWidgets.QStyledItemDelegate):
+    """
+    Edits the status cells with a combo box, created only for the cell being edited.
+    """
+
+    def __init__(self, statuses, parent=None):
+        super(StatusComboDelegate, self).__init__(parent)
+        self.statuses = statuses
+
+    def createEditor(self, parent, option, index):
+        combobox = QtWidgets.QComboBox(parent)
+        combobox.addItems(self.statuses)
+        combobox.currentIndexChanged.connect(lambda: self.commit_and_close(combobox))
+        return combobox
+
+    def setEditorData(self, editor, index):
+        editor.blockSignals(True)
+        editor.setCurrentText(index.data(Qt.EditRole))
+        editor.blockSignals(False)
+        set_combobox_background_color(editor, editor.currentText())
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.currentText(), Qt.EditRole)
+
+    def commit_and_close(self, combobox):
+        """
+        Saves the status as soon as it is selected in the combo box.
+
+        Parameters:
+            combobox (QComboBox): Editor of the status cell.
+        """
+        self.commitData.emit(combobox)
+        self.closeEditor.emit(combobox, QtWidgets.QAbstractItemDelegate.NoHint)
+
+
+def set_combobox_background_color(combobox, status):
+    """
+    Sets the background color of the ComboBox based on the current text.
+
+    Parameters:
+        combobox (QComboBox): ComboBox associated with the asset and its production step.
+        status (str): Text selected inside the ComboBox.
+    """
+    color = STATUS_COLORS.get(status)
+    if color:
+        combobox.setStyleSheet(f"background-color: {color};")
+
+
 class ProductionTrackerUI(QtWidgets.QDialog):
-    lbl_name_ = {}
-    combo_modeling_ = {}
-    combo_uv_ = {}
-    combo_surfacing_ = {}
 
     def __init__(self, parent=None):
         super(ProductionTrackerUI, self).__init__(parent)
+        self.status_queue = jsm.create_status_queue()
         self.setWindowTitle("Production Tracker")
         self.setFixedWidth(500)
         self.setMaximumHeight(500)
@@ -80,220 +243,82 @@ class ProductionTrackerUI(QtWidgets.QDialog):
         self.entry_search = QtWidgets.QLineEdit()
         self.entry_search.setMaximumHeight(26)
 
-        self.lbl_asset_name = QtWidgets.QLabel("Asset name")
-        self.lbl_modeling = QtWidgets.QLabel("Modeling")
-        self.lbl_uv_unfold = QtWidgets.QLabel("UV unfold")
-        self.lbl_surfacing = QtWidgets.QLabel("Surfacing")
+        self.btn_reconcile = QtWidgets.QPushButton("Sync with disk")
+        self.btn_reconcile.setMaximumHeight(26)
+
+        tracker = jsm.get_tracker()
+        schema = tracker.schema
+        assets = tracker.assets()
+        self.search_index = trsi.TrackerSearchIndex(assets, schema['steps'], schema['default_status'])
+        self.model = TrackerTableModel(assets, schema, self.status_queue, self.search_index, self)
+        self.proxy_model = TrackerFilterModel(self)
+        self.proxy_model.setSourceModel(self.model)
+
+        self.table_assets = QtWidgets.QTableView()
+        self.table_assets.setModel(self.proxy_model)
+        self.table_assets.setItemDelegate(StatusComboDelegate(schema['statuses'], self.table_assets))
+        self.table_assets.setEditTriggers(QtWidgets.QAbstractItemView.AllEditTriggers)
+        self.table_assets.setSelectionMode(QtWidgets.QAbstractItemView.NoSelection)
+        self.table_assets.verticalHeader().hide()
+        self.table_assets.verticalHeader().setDefaultSectionSize(24)
+        self.table_assets.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Stretch)
 
     def create_layout(self):
-        working_steps = ["TODO", "WIP", "DONE", "RETAKE"]
-
-        file_path = os.path.join(pm.dict_main_folders().get("data_folder"), 'production_tracker.json')
-        with open(file_path) as f:
-            asset_list = json.load(f)
-        assets = asset_list['assets']
-
         # creates the boxes
         main_layout = QtWidgets.QVBoxLayout()
         hbox_search = QtWidgets.QHBoxLayout()
-        self.grid_layout = QtWidgets.QGridLayout(self)
         vbox_asset_list = QtWidgets.QVBoxLayout()
 
-        # add grid_layout to a widget
-        layout_widget = QtWidgets.QWidget()
-        layout_widget.setLayout(self.grid_layout)
-
-        # create scroll_area
-        scroll_area = QtWidgets.QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setWidget(layout_widget)
-
         # add boxes to the main layout
         main_layout.addLayout(hbox_search)
         main_layout.addLayout(vbox_asset_list)
-        main_layout.addStretch()
         self.setLayout(main_layout)
 
         # add widgets to boxes
         hbox_search.addWidget(self.combo_asset_type)
         hbox_search.addWidget(self.entry_search)
+        hbox_search.addWidget(self.btn_reconcile)
 
-        self.grid_layout.addWidget(self.lbl_asset_name, 0, 0)
-        self.grid_layout.addWidget(self.lbl_modeling, 0, 1)
-        self.grid_layout.addWidget(self.lbl_uv_unfold, 0, 2)
-        self.grid_layout.addWidget(self.lbl_surfacing, 0, 3)
-
-        vbox_asset_list.addWidget(scroll_area)
-
-        # create and set all rows of assets status / widgets per cell in the grid
-        for asset in assets:
-            asset_name = asset.get('name')
-            modeling_status = asset.get('Modeling')
-            uv_status = asset.get("UV unfold")
-            surfacing_status = asset.get("Surfacing")
-            row = self.grid_layout.rowCount() + 1
-            column_modeling = 1
-            column_uv = 2
-            column_surfacing = 3
-
-            # create widgets
-            self.lbl_name_[asset_name] = QtWidgets.QLabel(asset_name)
-            self.combo_modeling_[asset_name] = QtWidgets.QComboBox()
-            self.combo_uv_[asset_name] = QtWidgets.QComboBox()
-            self.combo_surfacing_[asset_name] = QtWidgets.QComboBox()
-            for step in working_steps:
-                self.combo_modeling_[asset_name].addItem(step)
-                self.combo_uv_[asset_name].addItem(step)
-                self.combo_surfacing_[asset_name].addItem(step)
-
-            # set current status by looking at the json file        
-            self.set_combo_text(self.combo_modeling_[asset_name], modeling_status)
-            self.set_combo_text(self.combo_uv_[asset_name], uv_status)
-            self.set_combo_text(self.combo_surfacing_[asset_name], surfacing_status)
-
-            # set the color of combobox box by looking at their status
-            index = self.combo_modeling_[asset_name].currentIndex()
-            status = self.combo_modeling_[asset_name].itemText(index)
-            self.set_combobox_background_color(self.combo_modeling_[asset_name], status)
-            index = self.combo_uv_[asset_name].currentIndex()
-            status = self.combo_uv_[asset_name].itemText(index)
-            self.set_combobox_background_color(self.combo_uv_[asset_name], status)
-            index = self.combo_surfacing_[asset_name].currentIndex()
-            status = self.combo_surfacing_[asset_name].itemText(index)
-            self.set_combobox_background_color(self.combo_surfacing_[asset_name], status)
-
-            # add the widgets in their row                                                                                                    
-            self.grid_layout.addWidget(self.lbl_name_[asset_name], row, 0)
-            self.grid_layout.addWidget(self.combo_modeling_[asset_name], row, column_modeling)
-            self.grid_layout.addWidget(self.combo_uv_[asset_name], row, column_uv)
-            self.grid_layout.addWidget(self.combo_surfacing_[asset_name], row, column_surfacing)
-
-            # connect each combobox to their function called when changed
-            self.combo_modeling_[asset_name].currentIndexChanged.connect(
-                partial(self.edit_json_status, column_modeling, asset_name, self.combo_modeling_[asset_name]))
-            self.combo_uv_[asset_name].currentIndexChanged.connect(
-                partial(self.edit_json_status, column_uv, asset_name, self.combo_uv_[asset_name]))
-            self.combo_surfacing_[asset_name].currentIndexChanged.connect(
-                partial(self.edit_json_status, column_surfacing, asset_name, self.combo_surfacing_[asset_name]))
+        vbox_asset_list.addWidget(self.table_assets)
 
     def create_connections(self):
         self.combo_asset_type.currentIndexChanged.connect(self.update_searched_asset)
         self.entry_search.textChanged.connect(self.update_searched_asset)
+        self.btn_reconcile.clicked.connect(self.reconcile_with_disk)
+        self.finished.connect(self.save_pending_status)
 
     def initial_state_ui(self):
-        asset_types = ["all", "prx", "prp"]
+        asset_types = ["all", nprf.PROFILE.token("proxy_asset"), nprf.PROFILE.token("prop")]
         self.combo_asset_type.addItems(asset_types)
 
-    def edit_json_status(self, column, asset_name, combobox, combo_index):
-        """
-        Edits the status of the asset inside the production_tracker.json file.
-
-        Parameters:
-            column (int): Index of the column task.
-            asset_name (str): Name of the asset.
-            combobox (QComboBox): ComboBox associated with the asset and its production step.
-            combo_index (int): Index of the text selected inside the ComboBox.
+    def save_pending_status(self):
         """
-        status = combobox.itemText(combo_index)
-        task_item = self.grid_layout.itemAtPosition(0, column)
-        task_widget = task_item.widget()
-        task_str = task_widget.text()
-        file_path = os.path.join(pm.dict_main_folders().get("data_folder"), 'production_tracker.json')
-
-        with open(file_path, 'r') as f:
-            asset_data = json.load(f)
-        for asset in asset_data['assets']:
-            if asset['name'] == asset_name:
-                asset[task_str] = status
-                break
-        with open(file_path, 'w') as f:
-            json.dump(asset_data, f, indent=2)
-
-        if column == 1:
-            self.set_combobox_background_color(self.combo_modeling_[asset_name], status)
-        elif column == 2:
-            self.set_combobox_background_color(self.combo_uv_[asset_name], status)
-        elif column == 3:
-            self.set_combobox_background_color(self.combo_surfacing_[asset_name], status)
-
-    def set_combobox_background_color(self, combobox, status):
+        Writes the status edits still queued when the window is closed.
         """
-        Sets the background color of the ComboBox based on the current text.
+        self.status_queue.flush(compact=True)
 
-        Parameters:
-            combobox (QComboBox): ComboBox associated with the asset and its production step.
-            status (str): Text selected inside the ComboBox.
-        """
-        if status == "TODO":
-            combobox.setStyleSheet("background-color: #670101;")
-        elif status == "WIP":
-            combobox.setStyleSheet("background-color: #7f7a14;")
-        elif status == "RETAKE":
-            combobox.setStyleSheet("background-color: #714a08;")
-        elif status == "DONE":
-            combobox.setStyleSheet("background-color: #365f29;")
-
-    def set_combo_text(self, combobox, status):
+    def reconcile_with_disk(self):
         """
-        Sets the status of the ComboBox based on the production_tracker.json.
-
-        Parameters:
-            combobox (QComboBox): ComboBox associated with the asset and its production step.
-            status (str): Status inside the production_tracker.json.
+        Adds the assets found in the project folders and moves their statuses forward, then reloads the table.
         """
-        if status == "TODO":
-            combobox.setCurrentText("TODO")
-        elif status == "WIP":
-            combobox.setCurrentText("WIP")
-        elif status == "DONE":
-            combobox.setCurrentText("DONE")
-        elif status == "RETAKE":
-            combobox.setCurrentText("RETAKE")
+        self.status_queue.flush(wait=True)
+        result = jsm.reconcile_production_tracker(advance=True)
+        tracker = jsm.get_tracker()
+        for asset_name in result['missing_in_tracker']:
+            self.search_index.add(tracker.get(asset_name) or trs.new_record(asset_name))
+        for asset_name, step, old_status, new_status in result['changes']:
+            self.search_index.update_status(asset_name, step, new_status)
+        self.model.set_assets(tracker.assets())
+        self.update_searched_asset()
+        mc.confirmDialog(message=f"{len(result['missing_in_tracker'])} assets added, "
+                                 f"{len(result['changes'])} statuses moved forward, "
+                                 f"{len(result['missing_on_disk'])} assets without folder", button="ok")
 
     def update_searched_asset(self):
         """
         Displays the assets inside the UI by looking at the search entry of the user.
         """
-        asset_to_hide = []
-        self.show_all_asset_line()
-        if self.combo_asset_type.currentText() == "all":
-            str_searched = self.entry_search.text()
-        else:
-            str_searched = self.combo_asset_type.currentText() + "_" + self.entry_search.text()
-        if str_searched:
-            file_path = os.path.join(pm.dict_main_folders().get("data_folder"), 'production_tracker.json')
-            with open(file_path) as f:
-                asset_list = json.load(f)
-            assets = asset_list['assets']
-            for asset in assets:
-                if str_searched not in asset['name']:
-                    asset_to_hide.append(asset['name'])
-            for asset in asset_to_hide:
-                self.hide_asset_line(asset)
-
-    def hide_asset_line(self, asset_name):
-        """
-        Hides the asset line inside the UI.
-
-        Parameters:
-            asset_name (str): Name of the asset to hide.
-        """
-        self.lbl_name_[asset_name].hide()
-        self.combo_modeling_[asset_name].hide()
-        self.combo_uv_[asset_name].hide()
-        self.combo_surfacing_[asset_name].hide()
-
-    def show_all_asset_line(self):
-        """
-        Shows all asset lines.
-        """
-        file_path = os.path.join(pm.dict_main_folders().get("data_folder"), 'production_tracker.json')
-        with open(file_path) as f:
-            asset_list = json.load(f)
-        assets = asset_list['assets']
-        for asset in assets:
-            asset_name = asset['name']
-            self.lbl_name_[asset_name].show()
-            self.combo_modeling_[asset_name].show()
-            self.combo_uv_[asset_name].show()
-            self.combo_surfacing_[asset_name].show()
+        asset_type = self.combo_asset_type.currentText()
+        if asset_type == "all":
+            asset_type = None
+        self.proxy_model.set_matches(self.search_index.search(self.entry_search.text(), asset_type))
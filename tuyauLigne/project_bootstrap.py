@@ -0,0 +1,108 @@
+import os
+import shutil
+
+import maya.cmds as mc
+
+from tuyauLigne import json_manager as jsm
+from tuyauLigne import path_template as ptl
+from tuyauLigne import project_manager as pm
+
+"""
+Creation of a new project in a single pass :
+    workspace : workspace.mel is written in one go from workspace_template/workspace.mel, with the file rules of the
+                data folder, then opened once by Maya.
+    folders : every main folder is created in the same call.
+    datas : the tracker schema, the production tracker and the project catalog are written in the data folder.
+    starter files : optionally, the content of a folder is copied into the new project (scene templates, ...).
+
+Each step calls the progress callback with its name, the number of steps done and the number of steps.
+"""
+
+WORKSPACE_FILE_NAME = "workspace.mel"
+STEPS = ["workspace", "folders", "datas", "starter files"]
+
+
+def get_workspace_template_path():
+    """
+    Get the path of the workspace.mel template shipped with the plugin.
+
+    Returns:
+        str: Path of the template.
+    """
+    script_dir = os.path.dirname(os.path.realpath(__file__))
+    return os.path.join(script_dir, "workspace_template", WORKSPACE_FILE_NAME)
+
+
+def write_workspace_file(root_project_folder):
+    """
+    Writes the workspace.mel of a project from the template, with the data folder set for every data file rule.
+
+    Parameters:
+        root_project_folder (str): Root folder of the project.
+    """
+    data_folder = ptl.LAYOUT.main_folders.get("data_folder")
+    data_file_rules = "".join(f'workspace -fr "{rule}" "{data_folder}";\n' for rule in pm.DATA_FILE_RULES)
+    with open(get_workspace_template_path(), 'r') as f:
+        template = f.read()
+    with open(os.path.join(root_project_folder, WORKSPACE_FILE_NAME), 'w') as f:
+        f.write(template.format(data_file_rules=data_file_rules))
+
+
+def print_progress(step, done, total):
+    """
+    Default progress callback, prints the step being done.
+
+    Parameters:
+        step (str): Name of the step.
+        done (int): Number of steps done.
+        total (int): Number of steps.
+    """
+    print(f"create project : {step} ({done}/{total})")
+
+
+def bootstrap_project(parent_folder, project_name, starter_folder=None, progress=print_progress):
+    """
+    Creates a project, its workspace, its folders and its datas.
+
+    Parameters:
+        parent_folder (str): Path of the parent folder of the project.
+        project_name (str): Name of the project specified by the user.
+        starter_folder (str): Folder whose content is copied into the new project, None to skip this step.
+        progress (function): Called before each step with the name of the step, the number of steps done and the
+                             number of steps.
+
+    Returns:
+        bool: True if the project is created, False if it isn't.
+    """
+    root_project_folder = os.path.join(parent_folder, project_name)
+    if not os.path.exists(parent_folder):
+        mc.confirmDialog(message=f"parent folder {parent_folder} does not exists or field is empty", button="ok")
+        return False
+    elif not project_name:
+        mc.confirmDialog(message="project name field is empty", button="ok")
+        return False
+    elif os.path.exists(root_project_folder):
+        mc.confirmDialog(message="project folder already exist or field is empty", button="ok")
+        return False
+
+    steps = STEPS if starter_folder else STEPS[:-1]
+    progress(steps[0], 0, len(steps))
+    os.makedirs(root_project_folder)
+    write_workspace_file(root_project_folder)
+    mc.workspace(root_project_folder, openWorkspace=True)
+    pm.clear_project_paths()
+
+    progress(steps[1], 1, len(steps))
+    pm.scaffold_folders([pm.dict_main_folders().values()])
+
+    progress(steps[2], 2, len(steps))
+    jsm.create_production_tracker()
+    pm.get_project_index().save_catalog()
+
+    if starter_folder:
+        progress(steps[3], 3, len(steps))
+        shutil.copytree(starter_folder, root_project_folder, dirs_exist_ok=True)
+
+    progress("done", len(steps), len(steps))
+    mc.confirmDialog(message="project folder is created", button="ok")
+    return True
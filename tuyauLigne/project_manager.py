@@ -1,56 +1,241 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 import maya.cmds as mc
 
-from tuyauLigne import naming_convention as naco
+from tuyauLigne import disk_usage as du
+from tuyauLigne import increment_store as incs
+from tuyauLigne import naming_profile as nprf
+from tuyauLigne import path_template as ptl
+from tuyauLigne import project_index as pidx
+from tuyauLigne import scene_context as sctx
 
+"""
+The folder names come from the project layout (see path_template), shared with the Substance Painter plugin.
+The folder paths of the current project are resolved by a ProjectPaths object, built once for the workspace root.
+Main folders are computed when it is built, and the folders of each asset, set and proxy are kept in an LRU cache.
+The resolver is dropped when Maya changes of workspace, so asking for a path in a publish loop is only a lookup.
+"""
 
-def create_workspace(parent_folder, project_name):
+PATH_CACHE_SIZE = 4096
+DATA_FILE_RULES = ['ASS', 'ASS Export', 'Alembic', 'Arnold-USD', 'BIF', 'CATIAV4_ATF', 'CATIAV5_ATF',
+                   'CATIAV5_ATF Export', 'DAE_FBX', 'DAE_FBX export', 'DWG_ATF', 'DWG_ATF Export', 'DXF_ATF',
+                   'DXF_ATF Export', 'FBX', 'FBX export', 'IGES_ATF', 'IGES_ATF Export', 'JT_ATF', 'JT_ATF Export',
+                   'NX_ATF', 'NX_ATF Export', 'OBJ', 'OBJexport', 'PARASOLID_ATF', 'PARASOLID_ATF Export',
+                   'PROE_ATF', 'SAT_ATF', 'SAT_ATF Export', 'STEP_ATF', 'STEP_ATF Export', 'SVG', 'USD Export',
+                   'USD Import', 'WIRE_ATF', 'WIRE_ATF Export', 'eps', 'illustrator', 'move', 'translatorData']
+SCAFFOLD_WORKERS = 8
+_project_paths = None
+_workspace_job = None
+
+
+class ProjectPaths:
+    """
+    Folder paths of a project, precomputed from its root folder.
+    """
+
+    def __init__(self, root_project_folder):
+        self.root_project_folder = root_project_folder
+        self.main_folders = ptl.LAYOUT.main_folder_paths(root_project_folder)
+        self.asset_folder = lru_cache(maxsize=PATH_CACHE_SIZE)(self._asset_folder)
+        self.set_folder = lru_cache(maxsize=PATH_CACHE_SIZE)(self._set_folder)
+        self.proxy_folder = lru_cache(maxsize=PATH_CACHE_SIZE)(self._proxy_folder)
+
+    def _asset_folder(self, asset_name, sub_folder=None):
+        """
+        Gets the folder of an asset, or one of its sub-folders.
+
+        Parameters:
+            asset_name (str): Name of the asset.
+            sub_folder (str): Key of the sub-folder in dict_sub_asset_folders(), None for the asset folder itself.
+
+        Returns:
+            str: Path of the folder.
+        """
+        if sub_folder is None:
+            return ptl.LAYOUT.path("asset", self.root_project_folder, asset_name=asset_name)
+        return ptl.LAYOUT.path("asset." + sub_folder, self.root_project_folder, asset_name=asset_name)
+
+    def _set_folder(self, set_name, sub_folder=None):
+        """
+        Gets the folder of a set, or one of its sub-folders.
+
+        Parameters:
+            set_name (str): Name of the set.
+            sub_folder (str): Key of the sub-folder in dict_sub_set_folders(), None for the set folder itself.
+
+        Returns:
+            str: Path of the folder.
+        """
+        if sub_folder is None:
+            return ptl.LAYOUT.path("set", self.root_project_folder, set_name=set_name)
+        return ptl.LAYOUT.path("set." + sub_folder, self.root_project_folder, set_name=set_name)
+
+    def _proxy_folder(self, proxy_name):
+        """
+        Gets the folder of a proxy.
+
+        Parameters:
+            proxy_name (str): Name of the proxy.
+
+        Returns:
+            str: Path of the folder.
+        """
+        return ptl.LAYOUT.path("proxy", self.root_project_folder, proxy_name=proxy_name)
+
+
+def get_project_paths():
     """
-    Create and set the workspace for the specified project.
+    Gets the path resolver of the current workspace, built the first time it is asked for.
+
+    Returns:
+        ProjectPaths: Folder paths of the current project.
+    """
+    global _project_paths
+    if _project_paths is None:
+        watch_workspace()
+        _project_paths = ProjectPaths(mc.workspace(q=True, rootDirectory=True))
+    return _project_paths
+
+
+def get_project_index():
+    """
+    Gets the index of the folders of the current project, shared by all the tools.
+
+    Returns:
+        ProjectIndex: Index of the project folders.
+    """
+    return pidx.get_index(get_project_paths().root_project_folder)
+
+
+def get_increment_store(create=False):
+    """
+    Gets the store of the increments of the current project.
 
     Parameters:
-        parent_folder (str): Path of the parent folder of the project.
-        project_name (str): Name of the project specified by the user.
+        create (bool): True to create the store if the project does not use one yet.
 
     Returns:
-        bool: True if the workspace is created, False if it isn't.
+        IncrementStore: Store of the project, None if the project does not use one.
     """
-    root_project_folder = os.path.join(parent_folder, project_name)
-    if not os.path.exists(parent_folder):
-        mc.confirmDialog(message=f"parent folder {parent_folder} does not exists or field is empty", button="ok")
-        return False
-    elif not project_name:
-        mc.confirmDialog(message=f"project name field is empty", button="ok")
-        return False
-    elif not os.path.exists(root_project_folder):
-        os.makedirs(root_project_folder)
-        mc.workspace(root_project_folder, o=True)
-        set_data_workspace()
-        mc.workspace(saveWorkspace=True)
-        mc.confirmDialog(message="project folder is created", button="ok")
-        return True
-    else:
-        mc.confirmDialog(message="project folder already exist or field is empty", button="ok")
+    project_paths = get_project_paths()
+    return incs.get_store(project_paths.root_project_folder, project_paths.main_folders["data_folder"], create)
+
+
+def get_wip_file(file_path):
+    """
+    Gets a wip file of the current project, written back from the increment store if only its blobs are kept.
+
+    Parameters:
+        file_path (str): Path of the wip file.
+
+    Returns:
+        str: Path of the file, None if it is neither on disk nor in the store.
+    """
+    if os.path.isfile(file_path):
+        return file_path
+    store = get_increment_store()
+    if store is not None and store.materialize(file_path):
+        return file_path
+    return None
+
+
+def store_increment(file_path, previous_file_path=None):
+    """
+    Stores a new increment in the store of the project, if the project uses one. The previous increment is also stored
+    if it is not yet. Both files stay in the project, see release_increments().
+
+    Parameters:
+        file_path (str): Path of the increment just saved.
+        previous_file_path (str): Path of the increment it was saved from, None if there is none.
+
+    Returns:
+        bool: True if the increment is stored.
+    """
+    store = get_increment_store()
+    if store is None or store.relative_path(file_path) is None:
         return False
+    if previous_file_path and os.path.isfile(previous_file_path) and previous_file_path != file_path and \
+            store.relative_path(previous_file_path) is not None and not store.is_stored(previous_file_path):
+        store.store(previous_file_path)
+    store.store(file_path)
+    return True
 
 
-def set_data_workspace():
+def release_increments(keep_last=du.DEFAULT_KEEP_LAST, dry_run=True):
     """
-    Configure the data folder inside the workspace file according to various data types.
+    Removes from the current project the files of the superseded increments, once they are in the increment store.
+    They are written back when they are opened from the asset library. Protected the same way as a prune : the
+    scene opened, its references, and the increments referenced by a scene of the project are kept.
+
+    Parameters:
+        keep_last (int): Number of increments of each series that are kept.
+        dry_run (bool): True to only list the files that would be removed.
 
-    Sets different file rules in the workspace configuration for various data types such as 'ASS', 'Alembic', 'FBX',
-     'OBJ', and others.
+    Returns:
+        list: Paths of the files removed (or to remove).
+    """
+    store = get_increment_store()
+    if store is None:
+        return []
+    root_project_folder = get_project_paths().root_project_folder
+    report = du.analyze_project(root_project_folder, keep_last, find_duplicate_textures=False)
+    opened_files = mc.file(query=True, list=True, withoutCopyNumber=True) or []
+    protected = {du.path_key(path, root_project_folder) for path in opened_files}
+    released = []
+    for file in report['superseded']:
+        if du.path_key(file['path']) in protected or store.relative_path(file['path']) is None:
+            continue
+        if dry_run:
+            released.append(file['path'])
+            continue
+        if not store.is_stored(file['path']):
+            store.store(file['path'])
+        if store.release(file['path']):
+            released.append(file['path'])
+    return released
+
+
+def reserve_increment(folder_path, asset_name, file_type="ma"):
+    """
+    Reserves the next increment of an asset in the current project, after the ones on disk and the ones kept only in
+    the increment store.
+
+    Parameters:
+        folder_path (str): Path of the folder of the increments. Example: the wip maya folder of the asset.
+        asset_name (str): Name of the asset.
+        file_type (str): File type of the increments.
+
+    Returns:
+        CanonicalPath: Path of the file reserved, created empty.
     """
-    data_folder = dict_main_folders().get("data_folder")
-    data_type = ['ASS', 'ASS Export', 'Alembic', 'Arnold-USD', 'BIF', 'CATIAV4_ATF', 'CATIAV5_ATF',
-                 'CATIAV5_ATF Export', 'DAE_FBX', 'DAE_FBX export', 'DWG_ATF', 'DWG_ATF Export', 'DXF_ATF',
-                 'DXF_ATF Export', 'FBX', 'FBX export', 'IGES_ATF', 'IGES_ATF Export', 'JT_ATF', 'JT_ATF Export',
-                 'NX_ATF', 'NX_ATF Export', 'OBJ', 'OBJexport', 'PARASOLID_ATF', 'PARASOLID_ATF Export', 'PROE_ATF',
-                 'SAT_ATF', 'SAT_ATF Export', 'STEP_ATF', 'STEP_ATF Export', 'SVG', 'USD Export', 'USD Import',
-                 'WIRE_ATF', 'WIRE_ATF Export', 'eps', 'illustrator', 'move', 'translatorData']
-    for data in data_type:
-        mc.workspace(fileRule=[data, data_folder])
+    stored = 0
+    store = get_increment_store()
+    if store is not None:
+        for name in store.versions(folder_path):
+            inc_number = nprf.PROFILE.increment_number(name, asset_name, file_type)
+            if inc_number is not None and inc_number > stored:
+                stored = inc_number
+    return get_project_index().reserve_increment(folder_path, asset_name, file_type, stored)
+
+
+def clear_project_paths():
+    """
+    Drops the path resolver, the next get_project_paths() builds it again from the current workspace.
+    """
+    global _project_paths
+    _project_paths = None
+    sctx.clear_scene_context()
+
+
+def watch_workspace():
+    """
+    Drops the path resolver each time Maya changes of workspace. Done once per Maya session.
+    """
+    global _workspace_job
+    if _workspace_job is None or not mc.scriptJob(exists=_workspace_job):
+        _workspace_job = mc.scriptJob(event=["workspaceChanged", clear_project_paths])
 
 
 def check_workspace():
@@ -60,13 +245,7 @@ def check_workspace():
     Returns:
         bool: True if the current scene is in the correct workspace, False otherwise.
     """
-    project_folder = mc.workspace(q=True, rootDirectory=True)
-    file_path = mc.file(q=True, sceneName=True)
-    if project_folder in file_path:
-        good_workspace = True
-    else:
-        good_workspace = False
-    return good_workspace
+    return sctx.get_scene_context().in_workspace
 
 
 def dict_main_folders():
@@ -76,16 +255,7 @@ def dict_main_folders():
     Returns:
         dict: All main folders for each key step of the project.
     """
-    root_project_folder = mc.workspace(q=True, rootDirectory=True)
-    main_folders = {
-        "preprod_folder": os.path.join(root_project_folder, "000_preprod"),
-        "proxy_folder": os.path.join(root_project_folder, "010_proxy"),
-        "asset_folder": os.path.join(root_project_folder, "020_mod_surf"),
-        "env_folder": os.path.join(root_project_folder, "030_sets_envs"),
-        "shot_folder": os.path.join(root_project_folder, "040_shot_renders"),
-        "data_folder": os.path.join(root_project_folder, "999_datas")
-    }
-    return main_folders
+    return dict(get_project_paths().main_folders)
 
 
 def dict_sub_asset_folders():
@@ -95,15 +265,7 @@ def dict_sub_asset_folders():
     Returns:
         dict: Sub-folders for each key step within the asset folder.
     """
-    asset_sub_folders = {
-        "publish_folder": "publish",
-        "texture_map_folder": "publish/texture_maps",
-        "wip_folder": "wip",
-        "wip_maya_folder": "wip/maya",
-        "wip_substance_folder": "wip/substance",
-        "wip_usd_folder": "wip/usd"
-    }
-    return asset_sub_folders
+    return dict(ptl.LAYOUT.sub_folders["asset"])
 
 
 def dict_sub_set_folders():
@@ -113,13 +275,7 @@ def dict_sub_set_folders():
     Returns:
         dict: Sub-folders for each key step within the set folder.
     """
-    set_sub_folders = {
-        "publish_folder": "publish",
-        "wip_folder": "wip",
-        "wip_substance_folder": "wip/substance",
-        "wip_usd_folder": "wip/usd"
-    }
-    return set_sub_folders
+    return dict(ptl.LAYOUT.sub_folders["set"])
 
 
 def get_publish_folder(asset_name):
@@ -132,10 +288,33 @@ def get_publish_folder(asset_name):
     Returns:
         publish_folder (str): Path of the publish folder.
     """
-    main_asset_folder = dict_main_folders().get("asset_folder")
-    publish_folder = main_asset_folder + "/" + asset_name + "/publish"
+    return get_project_paths().asset_folder(asset_name, "publish_folder")
+
+
+def get_publish_file(asset_name):
+    """
+    Get the published USD file of an asset.
+
+    Parameters:
+        asset_name (str): Name of the asset.
+
+    Returns:
+        str: Path of the published USD file.
+    """
+    return ptl.LAYOUT.path("asset_publish_file", get_project_paths().root_project_folder, asset_name=asset_name)
 
-    return publish_folder
+
+def get_publish_set_file(set_name):
+    """
+    Get the published USD file of a set.
+
+    Parameters:
+        set_name (str): Name of the set.
+
+    Returns:
+        str: Path of the published USD file.
+    """
+    return ptl.LAYOUT.path("set_publish_file", get_project_paths().root_project_folder, set_name=set_name)
 
 
 def get_publish_set_folder(set_name):
@@ -148,10 +327,7 @@ def get_publish_set_folder(set_name):
     Returns:
         publish_set_folder (str): Path of the publish set folder.
     """
-    main_env_folder = dict_main_folders().get("env_folder")
-    publish_set_folder = os.path.join(main_env_folder, set_name, "publish")
-
-    return publish_set_folder
+    return get_project_paths().set_folder(set_name, "publish_folder")
 
 
 def get_wip_modeling_folder(asset_name):
@@ -164,10 +340,7 @@ def get_wip_modeling_folder(asset_name):
     Returns:
         wip_folder (str): Path of the WIP folder.
     """
-    main_asset_folder = dict_main_folders().get("asset_folder")
-    wip_folder = main_asset_folder + "/" + asset_name + "/wip/maya"
-
-    return wip_folder
+    return get_project_paths().asset_folder(asset_name, "wip_maya_folder")
 
 
 def get_wip_usd_folder(asset_name):
@@ -180,10 +353,7 @@ def get_wip_usd_folder(asset_name):
     Returns:
         str: Path of the WIP USD folder.
     """
-    main_asset_folder = dict_main_folders().get("asset_folder")
-    wip_folder = main_asset_folder + "/" + asset_name + "/wip/usd"
-
-    return wip_folder
+    return get_project_paths().asset_folder(asset_name, "wip_usd_folder")
 
 
 def get_proxy_folder(asset_name):
@@ -196,10 +366,7 @@ def get_proxy_folder(asset_name):
     Returns:
         str: Path of the proxy folder.
     """
-    main_proxy_folder = dict_main_folders().get("proxy_folder")
-    proxy_folder = main_proxy_folder + "/" + asset_name
-
-    return proxy_folder
+    return get_project_paths().proxy_folder(asset_name)
 
 
 def get_wip_set_folder(set_name):
@@ -212,10 +379,7 @@ def get_wip_set_folder(set_name):
     Returns:
         wip_set_folder (str): Path of the WIP set folder.
     """
-    main_env_folder = dict_main_folders().get("env_folder")
-    wip_set_folder = os.path.join(main_env_folder, set_name, "wip")
-
-    return wip_set_folder
+    return get_project_paths().set_folder(set_name, "wip_folder")
 
 
 def get_wip_usd_set_folder(set_name):
@@ -228,22 +392,124 @@ def get_wip_usd_set_folder(set_name):
     Returns:
         wip_usd_set_folder (str): Path of the WIP usd set folder.
     """
-    main_env_folder = dict_main_folders().get("env_folder")
-    wip_usd_set_folder = os.path.join(main_env_folder, set_name, "wip/usd")
+    return get_project_paths().set_folder(set_name, "wip_usd_folder")
+
+
+def print_disk_usage(keep_last=du.DEFAULT_KEEP_LAST, prune=False):
+    """
+    Prints the disk usage of the current project : bytes per asset, per department and per file type, superseded
+    increments and duplicate textures.
 
-    return wip_usd_set_folder
+    Parameters:
+        keep_last (int): Number of increments of each series that are not superseded.
+        prune (bool): True to remove the superseded increments. The scene opened and its references are kept.
+
+    Returns:
+        dict: Report returned by disk_usage.analyze_project().
+    """
+    report = du.analyze_project(get_project_paths().root_project_folder, keep_last)
+    for line in du.format_report(report):
+        print(line)
+    if prune:
+        opened_files = mc.file(query=True, list=True, withoutCopyNumber=True) or []
+        removed, freed = du.prune(report, dry_run=False, protected=opened_files)
+        print(f"pruned : {len(removed)} files, {du.format_size(freed)}")
+        store = get_increment_store()
+        if store is not None:
+            deleted, freed = store.collect_garbage()
+            print(f"increment store : {deleted} unused blobs deleted, {du.format_size(freed)}")
+    return report
 
 
-def create_main_folders(main_folders):
+def make_folders(folders):
     """
-    Create the main folders specified in a dictionary inside the project folder.
+    Creates folders that may already exist. Parents are created before their children, so each new folder costs a
+    single mkdir.
 
     Parameters:
-        dict: Use the values of main_folders to get the main folders' names.
+        folders (list): Paths of the folders, sorted.
+
+    Returns:
+        int: Number of folders created.
     """
-    root_project_folder = mc.workspace(q=True, rootDirectory=True)
-    for main_folder in main_folders.values():
-        os.makedirs(os.path.join(root_project_folder, main_folder))
+    created = 0
+    for folder in folders:
+        try:
+            os.mkdir(folder)
+            created += 1
+        except FileExistsError:
+            continue
+        except FileNotFoundError:
+            # parent outside of the list, created by the first folder that needs it
+            os.makedirs(folder, exist_ok=True)
+            created += 1
+    return created
+
+
+def scaffold_folders(folder_trees, workers=0):
+    """
+    Creates several folder trees at once. Can be called again on the same trees, existing folders are skipped.
+
+    Parameters:
+        folder_trees (list): List of the folders of each tree, a tree being created by a single worker.
+        workers (int): Number of threads creating the trees, useful on network shares. 0 creates them one by one.
+
+    Returns:
+        int: Number of folders created.
+    """
+    seen = set()
+    trees = []
+    for folders in folder_trees:
+        folders = sorted(set(os.path.normpath(folder) for folder in folders) - seen)
+        seen.update(folders)
+        if folders:
+            trees.append(folders)
+    if workers and len(trees) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return sum(executor.map(make_folders, trees))
+    return sum(make_folders(folders) for folders in trees)
+
+
+def scaffold_assets(asset_names, workers=0):
+    """
+    Creates the folders and sub-folders of several assets inside the main asset folder.
+
+    Parameters:
+        asset_names (list): Names of the assets.
+        workers (int): Number of threads, SCAFFOLD_WORKERS is a good value on a network share.
+
+    Returns:
+        int: Number of folders created.
+    """
+    paths = get_project_paths()
+    sub_folders = dict_sub_asset_folders()
+    folder_trees = []
+    for asset_name in asset_names:
+        folders = [paths.asset_folder(asset_name)]
+        folders.extend(paths.asset_folder(asset_name, sub_folder) for sub_folder in sub_folders)
+        folder_trees.append(folders)
+    return scaffold_folders(folder_trees, workers)
+
+
+def scaffold_sets(set_names, workers=0):
+    """
+    Creates the folders and sub-folders of several sets inside the main env folder.
+
+    Parameters:
+        set_names (list): Names of the sets.
+        workers (int): Number of threads, SCAFFOLD_WORKERS is a good value on a network share.
+
+    Returns:
+        int: Number of folders created.
+    """
+    paths = get_project_paths()
+    sub_folders = dict_sub_set_folders()
+    folder_trees = []
+    for set_name in set_names:
+        folders = [paths.set_folder(set_name)]
+        folders.extend(paths.set_folder(set_name, sub_folder) for sub_folder in sub_folders)
+        folder_trees.append(folders)
+    return scaffold_folders(folder_trees, workers)
 
 
 def create_sub_asset_folders(asset_name):
@@ -253,15 +519,7 @@ def create_sub_asset_folders(asset_name):
     Parameters:
         asset_name (str): Name of the asset.
     """
-    main_asset_folder = dict_main_folders().get("asset_folder")
-    asset_sub_folders = dict_sub_asset_folders()
-
-    asset_folder = main_asset_folder + "/" + asset_name
-    if not os.path.exists(asset_folder):
-        os.makedirs(asset_folder)
-
-    for sub_folder in asset_sub_folders.values():
-        os.makedirs(os.path.join(asset_folder, sub_folder))
+    scaffold_assets([asset_name])
 
 
 def create_sub_set_folders(set_name):
@@ -271,14 +529,7 @@ def create_sub_set_folders(set_name):
     Parameters:
         set_name (str): Name of the set.
     """
-    main_set_folder = dict_main_folders().get("env_folder")
-    set_sub_folders = dict_sub_set_folders()
-    set_folder = main_set_folder + "/" + set_name
-    if not os.path.exists(set_folder):
-        os.makedirs(set_folder)
-
-    for sub_folder in set_sub_folders.values():
-        os.makedirs(os.path.join(set_folder, sub_folder))
+    scaffold_sets([set_name])
 
 
 def create_proxy_folder(proxy_name, proxy_folder):
@@ -310,23 +561,9 @@ def create_env_folder():
     The function also creates a layout folder within the new environment folder.
     """
     env_folder = dict_main_folders().get("env_folder")
-    file_name = naco.get_file_name()
-    env_name = "env_" + naco.dict_file_name_part(file_name).get("asset_short_name")
+    short_name = sctx.get_scene_context().name_parts.get("asset_short_name")
+    env_name = nprf.PROFILE.element_name("env", short_name)
     os.makedirs(os.path.join(env_folder, env_name))
     env_path = os.path.join(env_folder, env_name)
-    lay_name = "lay_" + naco.dict_file_name_part(file_name).get("asset_short_name")
+    lay_name = nprf.PROFILE.element_name("layout", short_name)
     os.makedirs(os.path.join(env_path, lay_name))
-
-
-def create_project(parent_folder, project_name):
-    """
-    Create the project folder, its workspace, and the main folders within it.
-
-    Parameters:
-        parent_folder (str) : path of the parent folder of the project.
-        project_name (str): Name of the project.
-    """
-    workspace = create_workspace(parent_folder, project_name)
-    if workspace:
-        main_folders = dict_main_folders()
-        create_main_folders(main_folders)
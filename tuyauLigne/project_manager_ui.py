@@ -20,8 +20,9 @@ import sys
 import maya.OpenMayaUI as omui
 import maya.cmds as mc
 from tuyauLigne import asset_manager as am
-from tuyauLigne import json_manager as jsm
+from tuyauLigne import naming_profile as nprf
 from tuyauLigne import outliner_manager as outm
+from tuyauLigne import project_bootstrap as pbs
 from tuyauLigne import project_manager as pm
 
 
@@ -193,7 +194,7 @@ class ProjectManagerLaunchUi(QtWidgets.QDialog):
 
     def initial_state_ui(self):
         self.set_lbl_current_workspace()
-        my_assets = ["prx", "prp"]
+        my_assets = [nprf.PROFILE.token("proxy_asset"), nprf.PROFILE.token("prop")]
         self.combo_asset_type.addItems(my_assets)
         increments = list(string.ascii_uppercase)
         self.combo_increment.addItems(increments)
@@ -219,8 +220,7 @@ class ProjectManagerLaunchUi(QtWidgets.QDialog):
         """
         parent_folder = self.entry_parent_folder.text()
         project_name = self.entry_project_name.text()
-        pm.create_project(parent_folder, project_name)
-        jsm.create_production_tracker()
+        pbs.bootstrap_project(parent_folder, project_name)
 
     def create_asset(self):
         """
@@ -229,21 +229,21 @@ class ProjectManagerLaunchUi(QtWidgets.QDialog):
         asset_type = self.combo_asset_type.currentText()
         short_name = self.entry_asset_name.text()
         increment = self.combo_increment.currentText()
-        asset_name = asset_type + "_" + short_name + increment
-        if asset_type == "prx":
+        asset_name = asset_type + nprf.PROFILE.separator + short_name + increment
+        if asset_type == nprf.PROFILE.token("proxy_asset"):
             proxy_folder = pm.dict_main_folders().get("proxy_folder")
             pm.create_proxy_folder(asset_name, proxy_folder)
             am.create_proxy_maya(asset_name)
             main_grp = mc.group(name=asset_name, em=True)
             outm.lock_main_attr(main_grp)
             mc.file(save=True, type="mayaAscii")
-        elif asset_type == "prp":
+        elif asset_type == nprf.PROFILE.token("prop"):
             asset_folder = pm.dict_main_folders().get("asset_folder")
             pm.create_asset_folder(asset_name, asset_folder)
             pm.create_sub_asset_folders(asset_name)
             am.create_prp_maya(asset_name, asset_folder)
             main_grp = mc.group(name=asset_name, em=True)
-            proxy_grp = mc.group(name=asset_name.replace("prp_", "proxy_"), em=True)
+            proxy_grp = mc.group(name=nprf.PROFILE.swap_role(asset_name, "proxy_group"), em=True)
             mc.parent(proxy_grp, main_grp)
             outm.lock_main_attr(main_grp)
             mc.file(save=True, type="mayaAscii")
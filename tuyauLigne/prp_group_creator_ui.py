@@ -18,6 +18,7 @@ import sys
 
 import maya.OpenMayaUI as omui
 import maya.cmds as mc
+from tuyauLigne import naming_profile as nprf
 from tuyauLigne import outliner_manager as outm
 
 
@@ -67,7 +68,7 @@ class GroupCreatorUi(QtWidgets.QDialog):
         self.create_layout()
 
     def create_widgets(self):
-        self.lbl_name = QtWidgets.QLabel("prp_name :")
+        self.lbl_name = QtWidgets.QLabel(f"{nprf.PROFILE.prefix('prop')}name :")
         self.entry_name = QtWidgets.QLineEdit()
         self.combo_increment = QtWidgets.QComboBox()
         self.btn_create = QtWidgets.QPushButton("create")
@@ -185,16 +186,17 @@ class GroupCreatorUi(QtWidgets.QDialog):
         user.
         """
         name = self.get_entry_name()
+        prp_name = nprf.PROFILE.element_name("prop", name)
         master_grp = outm.get_master_grp_name()
         if not self.entry_name.text():
             mc.confirmDialog(message="no name specified", button="ok")
         elif not mc.objExists(master_grp):
             mc.confirmDialog(message=f"no group '{master_grp}' found", button="ok")
-        elif mc.objExists(f"prp_{name}"):
-            mc.confirmDialog(message=f"prp_{name} already exists", button="ok")
+        elif mc.objExists(prp_name):
+            mc.confirmDialog(message=f"{prp_name} already exists", button="ok")
         else:
-            prp_group = mc.group(name=f"prp_{name}", empty=True)
-            proxy_group = mc.group(name=f"proxy_{name}", empty=True)
+            prp_group = mc.group(name=prp_name, empty=True)
+            proxy_group = mc.group(name=nprf.PROFILE.element_name("proxy_group", name), empty=True)
             mc.parent(proxy_group, prp_group)
             if self.chkbox_cube.isChecked():
                 default_cube = self.create_default_cube()
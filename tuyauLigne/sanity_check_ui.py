@@ -13,7 +13,6 @@ try:
 except ImportError:
     from shiboken2 import wrapInstance
 
-import os
 import sys
 from functools import partial
 
@@ -22,9 +21,11 @@ import maya.cmds as mc
 
 from tuyauLigne import asset_manager as am
 from tuyauLigne import naming_convention as naco
+from tuyauLigne import naming_profile as nprf
 from tuyauLigne import outliner_manager as outm
 from tuyauLigne import project_manager as pm
 from tuyauLigne import sanity_check_list as scl
+from tuyauLigne import scene_context as sctx
 
 
 class SanityCheckLaunch:
@@ -351,16 +352,10 @@ class SanityCheckUi(QtWidgets.QDialog):
             bool : True if all conditions are ok
         """
         self.list_report.clear()
-        group_to_check = []
-        self.summary_prefix_prp = []
-        groups = mc.ls(type="transform")
         master_grp = outm.get_master_grp_name()
-        for group in groups:
-            if mc.listRelatives(group, parent=True) == [master_grp]:
-                group_to_check.append(group)
-        for group in group_to_check:
-            if group.split("_")[0] != "prp":
-                self.summary_prefix_prp.append(group)
+        groups = mc.listRelatives(master_grp, children=True, type="transform") or []
+        # only the part before the first separator is checked, as "prp" or "prp_jar-A" pass
+        self.summary_prefix_prp = [group for group in groups if nprf.PROFILE.role(group) != "prop"]
         check_ok = self.return_summary_bool(function, self.summary_prefix_prp)
 
         return check_ok
@@ -386,26 +381,25 @@ class SanityCheckUi(QtWidgets.QDialog):
         """
         self.list_report.clear()
         self.summary_prp_hierarchy_naming = []
-        prp_groups = []
         master_grp = outm.get_master_grp_name()
-        groups_in_master = mc.listRelatives(master_grp, allDescendents=True, type="transform")
-        if "prp_" in master_grp:
-            prp_groups.append(master_grp)
-
-        for group in groups_in_master:
-            if "prp_" in group:
-                prp_groups.append(group)
-        for prp_group in prp_groups:
-            prp_name = prp_group.split("_")[1]
-            prp_children = mc.listRelatives(prp_group, children=True)
-            for prp_child in prp_children:
-                if "_" not in prp_child:
-                    self.summary_prp_hierarchy_naming.append(prp_child)
-                else:
-                    child_name = prp_child.split("_")[1]
-                    child_prefix = prp_child.split("_")[0]
-                    if child_name != prp_name or child_prefix != "proxy" and child_prefix != "render":
-                        self.summary_prp_hierarchy_naming.append(prp_child)
+        # a single call for the whole hierarchy, the children of each group are found from the paths
+        paths = mc.listRelatives(master_grp, allDescendents=True, type="transform", fullPath=True) or []
+        children = {}
+        for path in paths:
+            parent_path, _, name = path.rpartition("|")
+            children.setdefault(parent_path, []).append(name)
+        prp_paths = [path for path in paths if nprf.PROFILE.is_role(path.rpartition("|")[2], "prop")]
+        if nprf.PROFILE.is_role(master_grp, "prop"):
+            prp_paths.insert(0, mc.ls(master_grp, long=True)[0])
+        for prp_path in prp_paths:
+            try:
+                prp_name = naco.parse_element_name(prp_path.rpartition("|")[2]).element_short_name
+            except naco.NamingError:
+                self.summary_prp_hierarchy_naming.append(prp_path.rpartition("|")[2])
+                continue
+            purpose_types = (nprf.PROFILE.token("proxy_group"), nprf.PROFILE.token("render_group"))
+            validation = naco.validate_names(children.get(prp_path, []), purpose_types, prp_name)
+            self.summary_prp_hierarchy_naming.extend(validation.wrong_prefix + validation.bad_short_name)
 
         check_ok = self.return_summary_bool(function, self.summary_prp_hierarchy_naming)
 
@@ -431,12 +425,12 @@ class SanityCheckUi(QtWidgets.QDialog):
             bool : True if all conditions are ok
         """
         self.list_report.clear()
-        groups_in_master = mc.listRelatives("prp_*", allDescendents=True, type="transform")
+        groups_in_master = mc.listRelatives(nprf.PROFILE.glob("prop"), allDescendents=True, type="transform")
         self.summary_purpose_grp_hierarchy = []
         for group in groups_in_master:
-            if "proxy_" in group or "render_" in group:
+            if nprf.PROFILE.prefix("proxy_group") in group or nprf.PROFILE.prefix("render_group") in group:
                 parent = mc.listRelatives(group, parent=True)
-                if "prp_" not in parent[0]:
+                if nprf.PROFILE.prefix("prop") not in parent[0]:
                     self.summary_purpose_grp_hierarchy.append(group)
 
         check_ok = self.return_summary_bool(function, self.summary_purpose_grp_hierarchy)
@@ -532,7 +526,7 @@ class SanityCheckUi(QtWidgets.QDialog):
         groups_in_master = mc.listRelatives(master_grp, allDescendents=True, type="transform")
         self.summary_prp_in_master = []
         for group in groups_in_master:
-            if "prp_" in group and mc.listRelatives(group, parent=True)[0] != master_grp:
+            if nprf.PROFILE.prefix("prop") in group and mc.listRelatives(group, parent=True)[0] != master_grp:
                 self.summary_prp_in_master.append(group)
 
         check_ok = self.return_summary_bool(function, self.summary_prp_in_master)
@@ -559,11 +553,16 @@ class SanityCheckUi(QtWidgets.QDialog):
             bool : True if all conditions are ok
         """
         self.list_report.clear()
-        self.summary_grp_name = []
-        transforms_in_purpose = mc.listRelatives("proxy_*", allDescendents=True, type="transform")
-        for transform in transforms_in_purpose:
-            if not mc.listRelatives(transform, children=True, type="mesh") and "grp_" not in transform:
-                self.summary_grp_name.append(transform)
+        proxy_groups = nprf.PROFILE.glob("proxy_group")
+        transforms_in_purpose = mc.listRelatives(proxy_groups, allDescendents=True, type="transform",
+                                                 fullPath=True) or []
+        meshes_in_purpose = mc.listRelatives(proxy_groups, allDescendents=True, type="mesh", fullPath=True) or []
+        mesh_transforms = {mesh.rpartition("|")[0] for mesh in meshes_in_purpose}
+        groups = [transform for transform in transforms_in_purpose if transform not in mesh_transforms]
+        # the prefix anywhere in the name passes, as "ns:grp_a"
+        group_prefix = nprf.PROFILE.prefix("group")
+        self.summary_grp_name = [group.rpartition("|")[2] for group in groups
+                                 if group_prefix not in group.rpartition("|")[2]]
 
         check_ok = self.return_summary_bool(function, self.summary_grp_name)
 
@@ -622,18 +621,17 @@ class SanityCheckUi(QtWidgets.QDialog):
         """
         self.list_report.clear()
         self.summary_existing_prp = []
-        asset_folder = pm.dict_main_folders().get("asset_folder")
-        asset_folders = os.listdir(asset_folder)
+        asset_folders = pm.get_project_index().names("prp")
         master_grp = outm.get_master_grp_name()
         prp_grp = mc.listRelatives(master_grp, children=True, type="transform")
-        if "prp_" in master_grp:
-            if os.path.isdir(asset_folder):
+        if nprf.PROFILE.prefix("prop") in master_grp:
+            if asset_folders is not None:
                 for asset in asset_folders:
                     if master_grp in asset:
                         self.summary_existing_prp.append(asset)
-        if os.path.isdir(asset_folder):
+        if asset_folders is not None:
             for asset in asset_folders:
-                if "prp_" in asset and asset in prp_grp:
+                if nprf.PROFILE.prefix("prop") in asset and asset in prp_grp:
                     self.summary_existing_prp.append(asset)
 
         check_ok = self.return_summary_bool(function, self.summary_existing_prp)
@@ -661,12 +659,11 @@ class SanityCheckUi(QtWidgets.QDialog):
         """
         self.list_report.clear()
         self.summary_existing_set = []
-        set_folder = pm.dict_main_folders().get("env_folder")
-        set_folders = os.listdir(set_folder)
+        set_folders = pm.get_project_index().names("set") or []
         master_grp = outm.get_master_grp_name()
-        if "prx_" in master_grp:
+        if nprf.PROFILE.prefix("proxy_asset") in master_grp:
             for set_folder in set_folders:
-                if master_grp == set_folder.replace("set_", "prx_"):
+                if master_grp == nprf.PROFILE.swap_role(set_folder, "proxy_asset"):
                     self.summary_existing_set.append(set_folder)
 
         check_ok = self.return_summary_bool(function, self.summary_existing_set)
@@ -791,7 +788,6 @@ class SanityCheckUi(QtWidgets.QDialog):
         groups_to_default = []
         grp_groups = []
         master_grp = outm.get_master_grp_name()
-        master_transform = outm.store_element_transforms(master_grp)
         all_groups = mc.listRelatives(master_grp, allDescendents=True, type="transform")
         expected_transforms = {
             "tx": 0,
@@ -805,12 +801,16 @@ class SanityCheckUi(QtWidgets.QDialog):
             "sz": 1,
         }
         for group in all_groups:
-            if "prp_" in group:
+            if nprf.PROFILE.prefix("prop") in group:
                 prp_groups.append(group)
-            elif "proxy_" in group or "render_" in group or mc.listRelatives(group, children=True, type="mesh"):
+            elif (nprf.PROFILE.prefix("proxy_group") in group or nprf.PROFILE.prefix("render_group") in group
+                  or mc.listRelatives(group, children=True, type="mesh")):
                 groups_to_default.append(group)
             # elif "grp_" in group:
 
+        # the transforms of the master group, of the groups to check and of the "prp" groups are read at once
+        all_transforms = outm.get_transforms([master_grp] + groups_to_default + prp_groups)
+        master_transform = all_transforms[master_grp]
         for transform, expected_value in expected_transforms.items():
             if master_transform[transform] != expected_value and master_grp not in self.summary_transforms:
                 self.summary_transforms.append(master_grp)
@@ -818,20 +818,21 @@ class SanityCheckUi(QtWidgets.QDialog):
 
         if groups_to_default and ok_all_pivot:
             for group in groups_to_default:
-                group_transforms = outm.store_element_transforms(group)
+                group_transforms = all_transforms[group]
 
                 for transform, expected_value in expected_transforms.items():
                     if group_transforms[transform] != expected_value and group not in self.summary_transforms:
                         self.summary_transforms.append(group)
 
         if prp_groups and ok_all_pivot:
-            for group in prp_groups:
-                group_transforms = outm.store_element_transforms(group)
-                outm.center_element_world(group)
-                pivot = mc.xform(group, query=True, worldSpace=True, rotatePivot=True)
-                if pivot != [0, 0, 0] and group not in self.summary_transforms:
-                    self.summary_transforms.append(group)
-                outm.restore_element_transforms(group, group_transforms)
+            outm.center_elements_world(prp_groups)
+            try:
+                for group in prp_groups:
+                    pivot = mc.xform(group, query=True, worldSpace=True, rotatePivot=True)
+                    if pivot != [0, 0, 0] and group not in self.summary_transforms:
+                        self.summary_transforms.append(group)
+            finally:
+                outm.set_transforms({group: all_transforms[group] for group in prp_groups})
 
         check_ok = self.return_summary_bool(function, self.summary_transforms)
 
@@ -862,7 +863,7 @@ class SanityCheckUi(QtWidgets.QDialog):
         master_grp = outm.get_master_grp_name()
         all_groups = mc.listRelatives(master_grp, allDescendents=True, type="transform")
         for group in all_groups:
-            if "proxy_" in group:
+            if nprf.PROFILE.prefix("proxy_group") in group:
                 meshes_in_proxy = mc.listRelatives(group, allDescendents=True, type="mesh")
                 for mesh in meshes_in_proxy:
                     sg_connections = mc.listConnections(mesh + ".instObjGroups", destination=True, source=False)
@@ -902,7 +903,7 @@ class SanityCheckUi(QtWidgets.QDialog):
         master_grp = outm.get_master_grp_name()
         all_groups = mc.listRelatives(master_grp, allDescendents=True, type="transform")
         for group in all_groups:
-            if "render_" in group:
+            if nprf.PROFILE.prefix("render_group") in group:
                 meshes_in_proxy = mc.listRelatives(group, allDescendents=True, type="mesh")
                 for mesh in meshes_in_proxy:
                     sg_connections = mc.listConnections(mesh + ".instObjGroups", destination=True, source=False)
@@ -947,10 +948,10 @@ class SanityCheckUi(QtWidgets.QDialog):
         master_grp = outm.get_master_grp_name()
         all_groups = mc.listRelatives(master_grp, allDescendents=True, type="transform")
         for group in all_groups:
-            if "proxy_" in group:
-                short_name = group.split("_")[1]
-                standard_sg_name = "usdPrev_" + short_name + "SG"
-                standard_shader_name = "usdPrev_" + short_name
+            if nprf.PROFILE.prefix("proxy_group") in group:
+                short_name = nprf.PROFILE.short_name(group)
+                standard_shader_name = nprf.PROFILE.element_name("usd_preview", short_name)
+                standard_sg_name = standard_shader_name + "SG"
                 meshes_in_proxy = mc.listRelatives(group, allDescendents=True, type="mesh")
                 for mesh in meshes_in_proxy:
                     sg_connections = mc.listConnections(mesh + ".instObjGroups", destination=True, source=False)
@@ -962,13 +963,13 @@ class SanityCheckUi(QtWidgets.QDialog):
                         for shader_connexion in shader_connexions:
                             if shader_connexion != standard_shader_name:
                                 self.summary_shader_naming.append(shader_connexion)
-            elif "render_" in group:
-                short_name = group.split("_")[1]
-                standard_sg_name = "mat_" + short_name + "SG"
-                standard_shader_name = "mat_" + short_name
+            elif nprf.PROFILE.prefix("render_group") in group:
+                short_name = nprf.PROFILE.short_name(group)
+                standard_shader_name = nprf.PROFILE.element_name("material", short_name)
+                standard_sg_name = standard_shader_name + "SG"
                 # TMP patch for allowing publish of matx and arnold shader
                 matx_sg_name = "matx_" + short_name + "SG"
-                mat_arnold_name = "mat_" + short_name + "_SG"
+                mat_arnold_name = standard_shader_name + "_SG"
                 # ----------------------------------------------
                 meshes_in_render = mc.listRelatives(group, allDescendents=True, type="mesh")
 
@@ -1085,11 +1086,10 @@ class SanityCheckUi(QtWidgets.QDialog):
             bool: True if the sanity check passes, indicating the context is clean.
         """
         sanity = False
-        maya_file_name = mc.file(q=True, sceneName=True, shortName=True)
-        asset_type = naco.dict_file_name_part(maya_file_name).get("asset_type")
-        if asset_type == "prx":
+        asset_type = sctx.get_scene_context().name_parts.get("asset_type")
+        if asset_type == nprf.PROFILE.token("proxy_asset"):
             sanity = self.proxy_sanity_check()
-        elif asset_type == "prp":
+        elif asset_type == nprf.PROFILE.token("prop"):
             sanity = self.prp_sanity_check()
         return sanity
 
@@ -1102,10 +1102,9 @@ class SanityCheckUi(QtWidgets.QDialog):
         """
 
         sanity = self.sanity_check()
-        maya_file_name = mc.file(q=True, sceneName=True, shortName=True)
-        asset_type = naco.dict_file_name_part(maya_file_name).get("asset_type")
+        asset_type = sctx.get_scene_context().name_parts.get("asset_type")
         if sanity:
-            if asset_type == "prx":
+            if asset_type == nprf.PROFILE.token("proxy_asset"):
                 am.create_asset_from_proxy()
-            elif asset_type == "prp":
+            elif asset_type == nprf.PROFILE.token("prop"):
                 am.create_asset_from_prp()
@@ -0,0 +1,69 @@
+import maya.api.OpenMaya as om
+import maya.cmds as mc
+
+from tuyauLigne import naming_convention as naco
+
+"""
+Context of the scene currently open in Maya : workspace root, scene path, file name and its parts, master group.
+
+Publishing or running the sanity checks asks for these values dozens of times. They are read from Maya once, then
+kept until a scene is opened, created or saved (a save can rename the scene) or until the workspace changes.
+"""
+
+SCENE_EVENTS = [
+    om.MSceneMessage.kAfterOpen,
+    om.MSceneMessage.kAfterNew,
+    om.MSceneMessage.kAfterSave,
+]
+_context = None
+_callback_ids = []
+
+
+class SceneContext:
+    """
+    Values of the current scene, read from Maya once.
+    """
+
+    def __init__(self):
+        self.workspace_root = mc.workspace(q=True, rootDirectory=True)
+        self.scene_path = mc.file(q=True, sceneName=True)
+        self.file_name = mc.file(q=True, sceneName=True, shortName=True)
+        try:
+            self.name_parts = naco.dict_file_name_part(self.file_name)
+        except naco.NamingError:
+            # untitled scene, or a file name outside of the naming convention
+            self.name_parts = {}
+        self.master_grp = self.name_parts.get("asset_name")
+        self.in_workspace = self.workspace_root in self.scene_path
+
+
+def get_scene_context():
+    """
+    Gets the context of the current scene, read from Maya only if the scene changed since the last call.
+
+    Returns:
+        SceneContext: Values of the current scene.
+    """
+    global _context
+    if _context is None:
+        watch_scene()
+        _context = SceneContext()
+    return _context
+
+
+def clear_scene_context(*args):
+    """
+    Forgets the context, the next get_scene_context() reads it again from Maya. Called by the scene callbacks.
+    """
+    global _context
+    _context = None
+
+
+def watch_scene():
+    """
+    Registers the callbacks that clear the context when the scene changes. Done once per Maya session.
+    """
+    if _callback_ids:
+        return
+    for event in SCENE_EVENTS:
+        _callback_ids.append(om.MSceneMessage.addCallback(event, clear_scene_context))
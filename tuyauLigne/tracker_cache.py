@@ -0,0 +1,65 @@
+import os
+
+from tuyauLigne import tracker_store as trs
+
+"""
+Shared cache of the production tracker.
+
+Each data folder gets one store, opened the first time it is asked for and then shared by every tool (publish,
+production tracker window, ...). The store keeps the parsed tracker and its name index in memory. Before handing it
+out, the cache compares the tracker files on disk with what the store loaded : the store is parsed again only when
+another program or Maya session has changed them.
+"""
+
+_stores = {}
+
+
+def get_tracker(data_folder):
+    """
+    Gets the up-to-date tracker store of a data folder.
+
+    Parameters:
+        data_folder (str): Path of the data folder of the project.
+
+    Returns:
+        TrackerStore: Store of the production tracker.
+    """
+    data_folder = os.path.normpath(data_folder)
+    store = _stores.get(data_folder)
+    if store is None:
+        store = trs.open_store(data_folder)
+        _stores[data_folder] = store
+    else:
+        refresh(store)
+    return store
+
+
+def refresh(store):
+    """
+    Reloads a store if its files changed on disk since it was last read or written.
+
+    Parameters:
+        store (TrackerStore): Store to refresh.
+
+    Returns:
+        bool: True if the store has been reloaded.
+    """
+    with store.lock:
+        if store.has_pending_writes():
+            return False
+        if store.signature() == store.loaded_signature:
+            return False
+        store.load()
+    return True
+
+
+def drop_tracker(data_folder):
+    """
+    Forgets the store of a data folder, the next get_tracker() opens it again.
+
+    Parameters:
+        data_folder (str): Path of the data folder of the project.
+    """
+    store = _stores.pop(os.path.normpath(data_folder), None)
+    if isinstance(store, trs.SqliteTrackerStore):
+        store.close()
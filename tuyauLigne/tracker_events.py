@@ -0,0 +1,83 @@
+import json
+import os
+import time
+
+"""
+Event log of the production tracker.
+
+Every asset added to the tracker and every status change is appended to production_tracker_events.jsonl, inside the
+data folder, one JSON object per line :
+    {"time": 1700000000.0, "event": "add", "asset": "prp_chair"}
+    {"time": 1700000100.0, "event": "status", "asset": "prp_chair", "step": "Modeling", "from": "TODO", "to": "WIP"}
+
+The log is never rewritten. It is read line by line, so reports stay cheap even after years of production.
+"""
+
+EVENTS_FILE_NAME = "production_tracker_events.jsonl"
+
+
+def add_event(asset_name):
+    """
+    Creates the event of an asset added to the tracker.
+
+    Parameters:
+        asset_name (str): Name of the asset.
+
+    Returns:
+        dict: Event to append to the log.
+    """
+    return {"time": time.time(), "event": "add", "asset": asset_name}
+
+
+def status_event(asset_name, step, old_status, new_status):
+    """
+    Creates the event of a status change.
+
+    Parameters:
+        asset_name (str): Name of the asset.
+        step (str): Name of the production step. Example: Modeling
+        old_status (str): Status before the change. Example: TODO
+        new_status (str): Status after the change. Example: WIP
+
+    Returns:
+        dict: Event to append to the log.
+    """
+    return {"time": time.time(), "event": "status", "asset": asset_name, "step": step, "from": old_status,
+            "to": new_status}
+
+
+def append_events(data_folder, events):
+    """
+    Appends events to the log of a data folder, in a single write.
+
+    Parameters:
+        data_folder (str): Path of the data folder of the project.
+        events (list): Events to append.
+    """
+    if not events:
+        return
+    lines = "".join(json.dumps(event, separators=(",", ":")) + "\n" for event in events)
+    with open(os.path.join(data_folder, EVENTS_FILE_NAME), 'a') as f:
+        f.write(lines)
+
+
+def read_events(data_folder):
+    """
+    Reads the events of a data folder one by one, without loading the whole log.
+
+    Parameters:
+        data_folder (str): Path of the data folder of the project.
+
+    Returns:
+        generator: Events, oldest first.
+    """
+    events_path = os.path.join(data_folder, EVENTS_FILE_NAME)
+    if not os.path.isfile(events_path):
+        return
+    with open(events_path, 'r') as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                # line cut by a crash while it was written
+                continue
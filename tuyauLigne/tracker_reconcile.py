@@ -0,0 +1,173 @@
+import os
+
+from tuyauLigne import naming_profile as nprf
+from tuyauLigne import path_template as ptl
+from tuyauLigne import tracker_store as trs
+
+"""
+Reconciliation of the production tracker with the project folders.
+
+The asset and proxy folders are walked once with os.scandir, only the folders of the pipeline are opened. What is
+found on disk gives a hint of the progress of each asset :
+    wip_maya : a Maya file in wip/maya (proxy : in the proxy folder).
+    substance : a Substance Painter file in wip/substance.
+    published : the <asset>_publish.usdc file in publish.
+    textures : at least one texture in publish/texture_maps.
+
+The hints are then compared to the tracker in a single pass. Statuses are only moved forward, from the default status
+along ADVANCE_ORDER. A status set by hand to something else (RETAKE, ...) is never changed.
+"""
+
+MAYA_EXTENSIONS = (".ma", ".mb")
+SUBSTANCE_EXTENSIONS = (".spp",)
+ADVANCE_ORDER = ["WIP", "DONE"]
+STATUS_HINTS = [
+    ("Modeling", "WIP", "wip_maya"),
+    ("Modeling", "DONE", "published"),
+    ("UV unfold", "DONE", "textures"),
+    ("Surfacing", "WIP", "substance"),
+    ("Surfacing", "DONE", "textures"),
+]
+
+
+def list_files(folder_path):
+    """
+    Lists the names of the files of a folder, without failing if the folder does not exist.
+
+    Parameters:
+        folder_path (str): Path of the folder.
+
+    Returns:
+        list: Names of the files.
+    """
+    try:
+        with os.scandir(folder_path) as entries:
+            return [entry.name for entry in entries if entry.is_file()]
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+
+
+def list_folders(folder_path):
+    """
+    Lists the sub-folders of a folder, without failing if the folder does not exist.
+
+    Parameters:
+        folder_path (str): Path of the folder.
+
+    Returns:
+        list: (name, path) of each sub-folder.
+    """
+    try:
+        with os.scandir(folder_path) as entries:
+            return [(entry.name, entry.path) for entry in entries if entry.is_dir()]
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+
+
+def asset_hints(asset_name, asset_path):
+    """
+    Looks at the files of an asset folder to know how far the asset is.
+
+    Parameters:
+        asset_name (str): Name of the asset.
+        asset_path (str): Path of the asset folder, inside the main asset folder.
+
+    Returns:
+        dict: Hints found on disk, see the module description.
+    """
+    sub_folders = ptl.LAYOUT.sub_folders["asset"]
+    publish_file_name = os.path.basename(ptl.LAYOUT.path("asset_publish_file", asset_name=asset_name))
+    return {
+        "wip_maya": any(name.endswith(MAYA_EXTENSIONS)
+                        for name in list_files(os.path.join(asset_path, sub_folders["wip_maya_folder"]))),
+        "substance": any(name.endswith(SUBSTANCE_EXTENSIONS)
+                         for name in list_files(os.path.join(asset_path, sub_folders["wip_substance_folder"]))),
+        "published": publish_file_name in list_files(os.path.join(asset_path, sub_folders["publish_folder"])),
+        "textures": bool(list_files(os.path.join(asset_path, sub_folders["texture_map_folder"])))
+    }
+
+
+def scan_project(asset_folder, proxy_folder):
+    """
+    Walks the asset and proxy folders of a project once.
+
+    Parameters:
+        asset_folder (str): Path of the main asset folder (020_mod_surf).
+        proxy_folder (str): Path of the main proxy folder (010_proxy).
+
+    Returns:
+        dict: Asset name -> hints found on disk.
+    """
+    found = {}
+    for asset_name, asset_path in list_folders(asset_folder):
+        if nprf.PROFILE.is_role(asset_name, "prop"):
+            found[asset_name] = asset_hints(asset_name, asset_path)
+    for proxy_name, proxy_path in list_folders(proxy_folder):
+        if nprf.PROFILE.is_role(proxy_name, "proxy_asset"):
+            found[proxy_name] = {
+                "wip_maya": any(name.endswith(MAYA_EXTENSIONS) for name in list_files(proxy_path))
+            }
+    return found
+
+
+def suggested_statuses(record, hints, schema):
+    """
+    Finds the statuses of an asset that the files on disk move forward.
+
+    Parameters:
+        record (dict): Tracker record of the asset.
+        hints (dict): Hints found on disk for the asset.
+        schema (dict): Step schema of the tracker.
+
+    Returns:
+        dict: Step -> new status, only for the steps that move forward.
+    """
+    default_status = schema['default_status']
+    advance_order = [default_status] + ADVANCE_ORDER
+    suggested = {}
+    for step, status, hint in STATUS_HINTS:
+        if step not in schema['steps'] or not hints.get(hint):
+            continue
+        current = suggested.get(step, record.get(step, default_status))
+        if current in advance_order and advance_order.index(status) > advance_order.index(current):
+            suggested[step] = status
+    return suggested
+
+
+def reconcile(store, asset_folder, proxy_folder, advance=False):
+    """
+    Compares the production tracker with the project folders.
+
+    Parameters:
+        store (TrackerStore): Store of the production tracker.
+        asset_folder (str): Path of the main asset folder (020_mod_surf).
+        proxy_folder (str): Path of the main proxy folder (010_proxy).
+        advance (bool): Also adds the missing assets to the tracker and writes the suggested statuses.
+
+    Returns:
+        dict: Assets missing from the tracker, assets missing on disk, and (asset, step, old, new) status changes.
+    """
+    found = scan_project(asset_folder, proxy_folder)
+    default_status = store.schema['default_status']
+    missing_in_tracker = []
+    changes = []
+    for asset_name in sorted(found):
+        record = store.get(asset_name)
+        if record is None:
+            missing_in_tracker.append(asset_name)
+            record = trs.new_record(asset_name)
+        for step, status in suggested_statuses(record, found[asset_name], store.schema).items():
+            changes.append((asset_name, step, record.get(step, default_status), status))
+    missing_on_disk = [record['name'] for record in store.assets() if record['name'] not in found]
+
+    if advance and (missing_in_tracker or changes):
+        with store.batch():
+            store.insert_missing([trs.new_record(asset_name) for asset_name in missing_in_tracker])
+            for asset_name, step, old_status, new_status in changes:
+                store.set_status(asset_name, step, new_status)
+
+    return {
+        "missing_in_tracker": missing_in_tracker,
+        "missing_on_disk": missing_on_disk,
+        "changes": changes
+    }
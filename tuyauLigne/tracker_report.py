@@ -0,0 +1,139 @@
+import datetime
+
+from tuyauLigne import tracker_events as tre
+
+"""
+Throughput report of the production tracker, computed from its event log.
+
+The log is read in a single pass. Only the current status of each asset and the running totals are kept in memory,
+never the events themselves :
+    cycle_time : per step, time between the first time an asset leaves the default status and the time it is done.
+    wip : per day, number of assets in progress on each step at the end of the day.
+    done_per_day : per day, number of assets done on each step.
+    added_per_day : per day, number of assets added to the tracker.
+"""
+
+WIP_STATUS = "WIP"
+DONE_STATUS = "DONE"
+
+
+def event_day(event):
+    """
+    Gets the local day of an event.
+
+    Parameters:
+        event (dict): Event of the log.
+
+    Returns:
+        date: Day of the event.
+    """
+    return datetime.date.fromtimestamp(event['time'])
+
+
+def build_report(events, default_status="TODO", wip_status=WIP_STATUS, done_status=DONE_STATUS):
+    """
+    Computes the throughput of the production from a stream of events.
+
+    Parameters:
+        events (iterable): Events of the log, oldest first.
+        default_status (str): Status of a step that has not been started.
+        wip_status (str): Status counted as work in progress.
+        done_status (str): Status of a finished step.
+
+    Returns:
+        dict: Cycle time per step, WIP per day, assets done per day and assets added per day.
+    """
+    cycle_time = {}
+    wip = {}
+    done_per_day = {}
+    added_per_day = {}
+
+    started = {}
+    statuses = {}
+    wip_counts = {}
+    current_day = None
+    for event in events:
+        day = event_day(event)
+        if current_day is not None and day != current_day:
+            # days without events keep the WIP of the last day
+            while current_day < day:
+                wip[current_day] = dict(wip_counts)
+                current_day += datetime.timedelta(days=1)
+        current_day = day
+
+        if event['event'] == "add":
+            added_per_day[day] = added_per_day.get(day, 0) + 1
+            continue
+
+        key = (event['asset'], event['step'])
+        step = event['step']
+        old_status = statuses.get(key, event.get('from', default_status))
+        new_status = event['to']
+        statuses[key] = new_status
+        if old_status == wip_status:
+            wip_counts[step] = wip_counts.get(step, 0) - 1
+        if new_status == wip_status:
+            wip_counts[step] = wip_counts.get(step, 0) + 1
+
+        if new_status != default_status and key not in started:
+            started[key] = event['time']
+        if new_status == done_status:
+            day_counts = done_per_day.setdefault(day, {})
+            day_counts[step] = day_counts.get(step, 0) + 1
+            start = started.pop(key, event['time'])
+            step_time = cycle_time.setdefault(step, {"count": 0, "total": 0.0, "min": None, "max": None})
+            duration = event['time'] - start
+            step_time["count"] += 1
+            step_time["total"] += duration
+            step_time["min"] = duration if step_time["min"] is None else min(step_time["min"], duration)
+            step_time["max"] = duration if step_time["max"] is None else max(step_time["max"], duration)
+
+    if current_day is not None:
+        wip[current_day] = dict(wip_counts)
+    for step_time in cycle_time.values():
+        step_time["mean"] = step_time["total"] / step_time["count"]
+
+    return {
+        "cycle_time": cycle_time,
+        "wip": wip,
+        "done_per_day": done_per_day,
+        "added_per_day": added_per_day
+    }
+
+
+def project_report(data_folder, schema):
+    """
+    Computes the throughput report of a project from its event log.
+
+    Parameters:
+        data_folder (str): Path of the data folder of the project.
+        schema (dict): Step schema of the tracker.
+
+    Returns:
+        dict: Cycle time per step, WIP per day, assets done per day and assets added per day.
+    """
+    return build_report(tre.read_events(data_folder), default_status=schema['default_status'])
+
+
+def format_report(report):
+    """
+    Formats a throughput report as text lines.
+
+    Parameters:
+        report (dict): Report returned by build_report().
+
+    Returns:
+        list: Lines of the report.
+    """
+    lines = ["Cycle time (days) :"]
+    for step, step_time in report['cycle_time'].items():
+        lines.append(f"    {step} : mean {step_time['mean'] / 86400:.1f}, min {step_time['min'] / 86400:.1f}, "
+                     f"max {step_time['max'] / 86400:.1f} ({step_time['count']} assets)")
+    lines.append("Per day :")
+    days = sorted(set(report['wip']) | set(report['done_per_day']) | set(report['added_per_day']))
+    for day in days:
+        wip = ", ".join(f"{step} {count}" for step, count in report['wip'].get(day, {}).items() if count)
+        done = ", ".join(f"{step} {count}" for step, count in report['done_per_day'].get(day, {}).items())
+        lines.append(f"    {day} : added {report['added_per_day'].get(day, 0)} | wip {wip or '-'} | "
+                     f"done {done or '-'}")
+    return lines
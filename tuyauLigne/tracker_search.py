@@ -0,0 +1,155 @@
+import bisect
+
+from tuyauLigne import naming_profile as nprf
+from tuyauLigne import tracker_store as trs
+
+"""
+Search index of the production tracker.
+
+The index is built once from the tracker records, then kept up to date asset by asset :
+    names : sorted list of the asset names, for prefix lookups with bisect.
+    grams : every substring of 1 to GRAM_SIZE characters of the names -> names containing it. A longer search is
+            the intersection of the sets of its grams, checked against the names left.
+    types : asset type (prp, prx, ...) -> names.
+    statuses : (step, status) -> names.
+"""
+
+GRAM_SIZE = 3
+
+
+def name_grams(asset_name):
+    """
+    Lists the substrings of 1 to GRAM_SIZE characters of an asset name.
+
+    Parameters:
+        asset_name (str): Name of the asset.
+
+    Returns:
+        set: Substrings of the name.
+    """
+    grams = set()
+    for size in range(1, GRAM_SIZE + 1):
+        for start in range(len(asset_name) - size + 1):
+            grams.add(asset_name[start:start + size])
+    return grams
+
+
+class TrackerSearchIndex:
+    """
+    Prefix, substring, type and status lookups over the assets of the production tracker.
+    """
+
+    def __init__(self, assets=(), steps=None, default_status=trs.DEFAULT_STATUS):
+        self.steps = steps or trs.STEPS
+        self.default_status = default_status
+        self.names = []
+        self.grams = {}
+        self.types = {}
+        self.statuses = {}
+        self.records = {}
+        for asset in assets:
+            self._index(asset)
+        self.names = sorted(self.records)
+
+    def _index(self, asset):
+        """
+        Adds an asset to every lookup table except the sorted name list.
+        """
+        asset_name = asset['name']
+        self.records[asset_name] = dict(asset)
+        for gram in name_grams(asset_name):
+            self.grams.setdefault(gram, set()).add(asset_name)
+        self.types.setdefault(asset_name.partition(nprf.PROFILE.separator)[0], set()).add(asset_name)
+        for step in self.steps:
+            status = asset.get(step, self.default_status)
+            self.statuses.setdefault((step, status), set()).add(asset_name)
+
+    def add(self, asset):
+        """
+        Adds a new asset to the index, or replaces the statuses of an asset already indexed.
+
+        Parameters:
+            asset (dict): Record of the asset.
+        """
+        asset_name = asset['name']
+        if asset_name in self.records:
+            for step in self.steps:
+                self.update_status(asset_name, step, asset.get(step, self.default_status))
+            return
+        self._index(asset)
+        bisect.insort(self.names, asset_name)
+
+    def update_status(self, asset_name, step, status):
+        """
+        Moves an asset to its new status of a production step.
+
+        Parameters:
+            asset_name (str): Name of the asset.
+            step (str): Name of the production step. Example: Modeling
+            status (str): New status of the step. Example: WIP
+        """
+        record = self.records.get(asset_name)
+        if record is None:
+            return
+        old_status = record.get(step, self.default_status)
+        self.statuses.get((step, old_status), set()).discard(asset_name)
+        self.statuses.setdefault((step, status), set()).add(asset_name)
+        record[step] = status
+
+    def prefix(self, text):
+        """
+        Finds the assets whose name starts with a text.
+
+        Parameters:
+            text (str): Start of the name.
+
+        Returns:
+            set: Names of the assets found.
+        """
+        start = bisect.bisect_left(self.names, text)
+        end = bisect.bisect_left(self.names, text + "\uffff")
+        return set(self.names[start:end])
+
+    def substring(self, text):
+        """
+        Finds the assets whose name contains a text.
+
+        Parameters:
+            text (str): Part of the name.
+
+        Returns:
+            set: Names of the assets found.
+        """
+        if len(text) <= GRAM_SIZE:
+            return set(self.grams.get(text, ()))
+        found = None
+        for start in range(len(text) - GRAM_SIZE + 1):
+            names = self.grams.get(text[start:start + GRAM_SIZE])
+            if not names:
+                return set()
+            found = set(names) if found is None else found & names
+        return {asset_name for asset_name in found if text in asset_name}
+
+    def search(self, text="", asset_type=None, statuses=None):
+        """
+        Finds the assets matching all the given criteria.
+
+        Parameters:
+            text (str): Part of the name, or start of the short name when an asset type is given.
+            asset_type (str): Type of the asset, None for every type. Example: prp
+            statuses (dict): Status searched per production step. Example: {"Modeling": "WIP"}
+
+        Returns:
+            set: Names of the assets found, None if there is no criteria (every asset matches).
+        """
+        found = None
+        if asset_type and not text:
+            found = set(self.types.get(asset_type, ()))
+        elif asset_type:
+            found = self.prefix(asset_type + nprf.PROFILE.separator + text)
+        elif text:
+            found = self.substring(text)
+        for step, status in (statuses or {}).items():
+            names = self.statuses.get((step, status), set())
+            found = set(names) if found is None else found & names
+        return found
@@ -0,0 +1,850 @@
+import bisect
+import heapq
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from tuyauLigne import tracker_events as tre
+
+"""
+Storage engine of the production tracker.
+
+The production steps and their statuses are defined once in tracker_schema.json, inside the data folder. A record
+only stores the statuses that differ from the default status, so adding a step to the schema changes nothing in the
+tracker itself : every asset simply starts with the default status on the new step.
+
+By default, the tracker is kept in two files inside the data folder :
+    production_tracker.json : snapshot stored column-wise, the sorted asset names then, for each step, the assets
+                              whose status is not the default one ({'version': 2, 'assets': [...], 'columns': {...}}).
+                              The older layout ({'assets': [records]}) is still read.
+    production_tracker.journal : append-only log, one JSON record per line, replayed over the snapshot when loading.
+
+All the records are kept in memory in a name -> record index. Writing an asset only appends one line to the journal.
+When the journal is long enough, it is compacted : the snapshot is rewritten once and the journal is emptied.
+
+Optionally, a project can be migrated to production_tracker.db, a SQLite database in WAL mode. Once the database
+exists, it is used instead of the JSON files. Every write is a transaction, so several Maya sessions can publish and
+edit statuses at the same time without losing updates.
+
+With both backends, the assets added and the status changes are also appended to the event log (see tracker_events),
+once they are written.
+"""
+
+TRACKER_FILE_NAME = "production_tracker.json"
+JOURNAL_FILE_NAME = "production_tracker.journal"
+DATABASE_FILE_NAME = "production_tracker.db"
+SCHEMA_FILE_NAME = "tracker_schema.json"
+SNAPSHOT_VERSION = 2
+EMPTY_ASSET_NAME = "no_assets"
+STEPS = ["Modeling", "UV unfold", "Surfacing"]
+STATUSES = ["TODO", "WIP", "DONE", "RETAKE"]
+DEFAULT_STATUS = "TODO"
+COMPACT_THRESHOLD = 256
+
+
+def new_record(asset_name):
+    """
+    Creates the tracker record of a new asset. Every step has the default status, so nothing else is stored.
+
+    Parameters:
+        asset_name (str): Name of the asset.
+
+    Returns:
+        dict: Record of the asset.
+    """
+    return {"name": asset_name}
+
+
+def default_schema():
+    """
+    Creates the step schema used when the project has no tracker_schema.json.
+
+    Returns:
+        dict: Production steps, statuses, and default status of the tracker.
+    """
+    return {
+        "steps": list(STEPS),
+        "statuses": list(STATUSES),
+        "default_status": DEFAULT_STATUS
+    }
+
+
+def load_schema(data_folder):
+    """
+    Loads the step schema of the production tracker.
+
+    Parameters:
+        data_folder (str): Path of the data folder of the project.
+
+    Returns:
+        dict: Production steps, statuses, and default status of the tracker.
+    """
+    schema = default_schema()
+    schema_path = os.path.join(data_folder, SCHEMA_FILE_NAME)
+    if os.path.isfile(schema_path):
+        with open(schema_path, 'r') as f:
+            schema.update(json.load(f))
+    return schema
+
+
+def save_schema(data_folder, schema):
+    """
+    Writes the step schema of the production tracker.
+
+    Parameters:
+        data_folder (str): Path of the data folder of the project.
+        schema (dict): Production steps, statuses, and default status of the tracker.
+    """
+    schema_path = os.path.join(data_folder, SCHEMA_FILE_NAME)
+    tmp_path = f"{schema_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(schema, f, indent=2)
+    os.replace(tmp_path, schema_path)
+
+
+def open_store(data_folder):
+    """
+    Opens the tracker store of a data folder, with the SQLite backend if the project has been migrated to it.
+    Use tracker_cache.get_tracker() to share the opened store between all the tools.
+
+    Parameters:
+        data_folder (str): Path of the data folder of the project.
+
+    Returns:
+        TrackerStore: Store of the production tracker.
+    """
+    if os.path.isfile(os.path.join(data_folder, DATABASE_FILE_NAME)):
+        return SqliteTrackerStore(data_folder)
+    return TrackerStore(data_folder)
+
+
+def file_signature(file_path):
+    """
+    Gets the modification time and the size of a file, used to know if a file has changed since it was read.
+
+    Parameters:
+        file_path (str): Path of the file.
+
+    Returns:
+        tuple: Modification time in nanoseconds and size in bytes, None if the file does not exist.
+    """
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def journal_ends_with_newline(journal_path):
+    """
+    Checks if the last line of a journal is complete. A session stopped while writing leaves a partial line.
+
+    Parameters:
+        journal_path (str): Path of the journal.
+
+    Returns:
+        bool: True if the journal is empty or ends with a new line.
+    """
+    try:
+        with open(journal_path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            if not f.tell():
+                return True
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+    except FileNotFoundError:
+        return True
+
+
+def migrate_to_sqlite(data_folder):
+    """
+    Copies the JSON production tracker of a data folder into a new SQLite database. Done only once : the JSON files
+    are left untouched as a backup, but are not used anymore.
+
+    Parameters:
+        data_folder (str): Path of the data folder of the project.
+
+    Returns:
+        bool: True if the database is created, False if the project already uses one.
+    """
+    data_folder = os.path.normpath(data_folder)
+    database_path = os.path.join(data_folder, DATABASE_FILE_NAME)
+    if os.path.isfile(database_path):
+        return False
+
+    assets = TrackerStore(data_folder).assets()
+    tmp_path = database_path + ".tmp"
+    if os.path.isfile(tmp_path):
+        os.remove(tmp_path)
+    store = SqliteTrackerStore(data_folder, database_path=tmp_path)
+    # the assets are already in the event log
+    store.log_events = False
+    store.insert_missing(assets)
+    store.close()
+    os.replace(tmp_path, database_path)
+    return True
+
+
+class TrackerStore:
+    """
+    In-memory index of the production tracker, backed by a snapshot file and an append-only journal.
+    """
+
+    def __init__(self, data_folder, compact_threshold=COMPACT_THRESHOLD):
+        self.data_folder = data_folder
+        self.snapshot_path = os.path.join(data_folder, TRACKER_FILE_NAME)
+        self.journal_path = os.path.join(data_folder, JOURNAL_FILE_NAME)
+        self.schema_path = os.path.join(data_folder, SCHEMA_FILE_NAME)
+        self.compact_threshold = compact_threshold
+        self.schema = default_schema()
+        self.records = {}
+        self._order = []
+        self._pending = []
+        self._events = []
+        self.log_events = True
+        self._journal_lines = 0
+        self._batch_depth = 0
+        self.lock = threading.RLock()
+        self.loaded_signature = None
+        self.load()
+
+    def signature(self):
+        """
+        Gets the state of the tracker files on disk.
+
+        Returns:
+            tuple: Signatures of the snapshot, of the journal and of the step schema.
+        """
+        return (file_signature(self.snapshot_path), file_signature(self.journal_path),
+                file_signature(self.schema_path))
+
+    def has_pending_writes(self):
+        """
+        Checks if some records are waiting to be written, in which case the store must not be reloaded.
+
+        Returns:
+            bool: True if a batch is opened or records are not written yet.
+        """
+        return bool(self._batch_depth or self._pending)
+
+    def _log(self, event):
+        """
+        Keeps an event until its record is written to the journal.
+        """
+        if self.log_events:
+            self._events.append(event)
+
+    def load(self):
+        """
+        Loads the step schema and the snapshot, then replays the journal over it.
+        """
+        schema = load_schema(self.data_folder)
+        records = {}
+        if os.path.isfile(self.snapshot_path):
+            with open(self.snapshot_path, 'r') as f:
+                datas = json.load(f)
+            if datas.get('version', 1) >= SNAPSHOT_VERSION:
+                for asset_name in datas['assets']:
+                    records[asset_name] = {"name": asset_name}
+                for step, column in datas['columns'].items():
+                    for asset_name, status in column.items():
+                        records[asset_name][step] = status
+            else:
+                for record in datas.get('assets', []):
+                    if record['name'] != EMPTY_ASSET_NAME:
+                        records[record['name']] = record
+
+        journal_lines = 0
+        if os.path.isfile(self.journal_path):
+            with open(self.journal_path, 'r') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # line only partly written by a session that stopped, the next appends start on a new line
+                        continue
+                    records[record['name']] = record
+                    journal_lines += 1
+
+        with self.lock:
+            self.schema = schema
+            self.records = records
+            self._order = sorted(records)
+            self._pending = []
+            self._journal_lines = journal_lines
+            self.loaded_signature = self.signature()
+
+    def exists(self, asset_name):
+        """
+        Checks if an asset is inside the tracker.
+
+        Parameters:
+            asset_name (str): Name of the asset.
+
+        Returns:
+            bool: True if the asset is in the tracker.
+        """
+        return asset_name in self.records
+
+    def get(self, asset_name):
+        """
+        Gets the record of an asset.
+
+        Parameters:
+            asset_name (str): Name of the asset.
+
+        Returns:
+            dict: Record of the asset, None if the asset is not in the tracker.
+        """
+        return self.records.get(asset_name)
+
+    def assets(self):
+        """
+        Gets all the records sorted by asset name.
+
+        Returns:
+            list: Records of all the assets.
+        """
+        with self.lock:
+            return [self.records[name] for name in self._order]
+
+    def find_by_status(self, step, status):
+        """
+        Gets the names of the assets having a status on a production step.
+
+        Parameters:
+            step (str): Name of the production step. Example: Modeling
+            status (str): Status searched. Example: WIP
+
+        Returns:
+            list: Names of the assets, sorted.
+        """
+        default_status = self.schema['default_status']
+        with self.lock:
+            return [name for name in self._order if self.records[name].get(step, default_status) == status]
+
+    def put(self, record):
+        """
+        Adds or replaces the record of an asset. Written immediately, or at the end of the current batch.
+
+        Parameters:
+            record (dict): Record of the asset, must contain its name.
+        """
+        with self.lock:
+            if record['name'] not in self.records:
+                bisect.insort(self._order, record['name'])
+                self._log(tre.add_event(record['name']))
+            self.records[record['name']] = record
+            self._pending.append(record)
+            if not self._batch_depth:
+                self.commit()
+
+    def insert_missing(self, records):
+        """
+        Adds the records of the assets that are not in the tracker yet, in one write.
+
+        Parameters:
+            records (list): Records to add, each one containing the asset name.
+
+        Returns:
+            list: Names of the assets added, sorted.
+        """
+        with self.lock:
+            new_records = {}
+            for record in records:
+                if record['name'] not in self.records:
+                    new_records[record['name']] = record
+            if not new_records:
+                return []
+            new_names = sorted(new_records)
+            self._order = list(heapq.merge(self._order, new_names))
+            for name in new_names:
+                self.records[name] = new_records[name]
+                self._pending.append(new_records[name])
+                self._log(tre.add_event(name))
+            if not self._batch_depth:
+                self.commit()
+        return new_names
+
+    def set_status(self, asset_name, step, status):
+        """
+        Sets the status of one production step of an asset.
+
+        Parameters:
+            asset_name (str): Name of the asset.
+            step (str): Name of the production step. Example: Modeling
+            status (str): New status. Example: WIP
+
+        Returns:
+            bool: True if the asset exists in the tracker.
+        """
+        with self.lock:
+            record = self.records.get(asset_name)
+            if record is None:
+                return False
+            old_status = record.get(step, self.schema['default_status'])
+            if old_status == status:
+                return True
+            record = dict(record)
+            record[step] = status
+            self._log(tre.status_event(asset_name, step, old_status, status))
+            self.put(record)
+        return True
+
+    @contextmanager
+    def batch(self):
+        """
+        Groups every put() done inside the block into a single journal write and a single fsync.
+        """
+        with self.lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self.lock:
+                self._batch_depth -= 1
+                if not self._batch_depth:
+                    self.commit()
+
+    def commit(self):
+        """
+        Appends the pending records to the journal, then compacts it if it is too long.
+        """
+        with self.lock:
+            if not self._pending:
+                return
+            with open(self.journal_path, 'a') as f:
+                if not journal_ends_with_newline(self.journal_path):
+                    f.write("\n")
+                for record in self._pending:
+                    f.write(json.dumps(record, separators=(",", ":")) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._journal_lines += len(self._pending)
+            self._pending = []
+            tre.append_events(self.data_folder, self._events)
+            self._events = []
+            if self._journal_lines >= self.compact_threshold:
+                self.compact()
+            self.loaded_signature = self.signature()
+
+    def compact(self):
+        """
+        Rewrites the snapshot with every record and empties the journal.
+        """
+        with self.lock:
+            default_status = self.schema['default_status']
+            columns = {}
+            for asset_name in self._order:
+                for step, status in self.records[asset_name].items():
+                    if step != "name" and status != default_status:
+                        columns.setdefault(step, {})[asset_name] = status
+            datas = {'version': SNAPSHOT_VERSION, 'assets': self._order, 'columns': columns}
+            # each session writes its own temporary file, two sessions can compact at the same time
+            tmp_path = f"{self.snapshot_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(datas, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+            # the journal is replayed over the snapshot, so a crash before this line loses nothing
+            open(self.journal_path, 'w').close()
+            self._journal_lines = 0
+            self.loaded_signature = self.signature()
+
+    def clear(self):
+        """
+        Removes every asset from the tracker : an empty snapshot is written and the journal is emptied.
+        """
+        with self.lock:
+            self.records = {}
+            self._order = []
+            self._pending = []
+            self._events = []
+            self.compact()
+
+
+class SqliteTrackerStore:
+    """
+    Production tracker stored in a SQLite database, same interface as TrackerStore.
+
+    The records are kept in memory like in TrackerStore. The database data_version changes when another connection
+    commits, which is how tracker_cache knows the store must be reloaded. Lookups by status use the statuses_by_status
+    index.
+    """
+
+    def __init__(self, data_folder, database_path=None):
+        self.data_folder = data_folder
+        self.database_path = database_path or os.path.join(data_folder, DATABASE_FILE_NAME)
+        self.schema_path = os.path.join(data_folder, SCHEMA_FILE_NAME)
+        self.schema = default_schema()
+        self.records = {}
+        self._order = []
+        self._events = []
+        self.log_events = True
+        self._batch_depth = 0
+        self._queued = []
+        self._queued_names = set()
+        self.lock = threading.RLock()
+        self.loaded_signature = None
+        self._connection = sqlite3.connect(self.database_path, timeout=30, isolation_level=None,
+                                           check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute("PRAGMA foreign_keys=ON")
+        with self._transaction():
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS assets (name TEXT PRIMARY KEY) WITHOUT ROWID")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS statuses ("
+                "name TEXT NOT NULL REFERENCES assets(name) ON DELETE CASCADE, "
+                "step TEXT NOT NULL, "
+                "status TEXT NOT NULL, "
+                "PRIMARY KEY (name, step)) WITHOUT ROWID")
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS statuses_by_status ON statuses (step, status)")
+        self.load()
+
+    @contextmanager
+    def _transaction(self):
+        """
+        Opens a write transaction.
+        """
+        with self.lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._connection
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+
+    def signature(self):
+        """
+        Gets the version of the database, changed each time another connection commits, and the state of the step
+        schema file.
+
+        Returns:
+            tuple: Data version of the database and signature of the step schema.
+        """
+        with self.lock:
+            data_version = self._connection.execute("PRAGMA data_version").fetchone()[0]
+        return data_version, file_signature(self.schema_path)
+
+    def has_pending_writes(self):
+        """
+        Checks if a batch is opened or has writes not committed yet, in which case the store must not be reloaded.
+
+        Returns:
+            bool: True if a batch is opened.
+        """
+        return bool(self._batch_depth or self._queued)
+
+    def _log(self, event):
+        """
+        Keeps an event until its transaction is committed.
+        """
+        if self.log_events:
+            self._events.append(event)
+
+    def _flush_events(self):
+        """
+        Appends the events of the committed writes to the event log, unless a batch is still opened.
+        """
+        if self._batch_depth:
+            return
+        tre.append_events(self.data_folder, self._events)
+        self._events = []
+
+    def load(self):
+        """
+        Reads the step schema and all the records from the database.
+        """
+        records = {}
+        with self.lock:
+            self.schema = load_schema(self.data_folder)
+            rows = self._connection.execute(
+                "SELECT assets.name, statuses.step, statuses.status FROM assets "
+                "LEFT JOIN statuses ON statuses.name = assets.name ORDER BY assets.name")
+            order = []
+            for name, step, status in rows:
+                if not order or order[-1] != name:
+                    order.append(name)
+                    records[name] = {"name": name}
+                if step is not None:
+                    records[name][step] = status
+            self.records = records
+            self._order = order
+            self.loaded_signature = self.signature()
+
+    def close(self):
+        """
+        Closes the connection to the database.
+        """
+        with self.lock:
+            self._connection.close()
+
+    def exists(self, asset_name):
+        """
+        Checks if an asset is inside the tracker.
+
+        Parameters:
+            asset_name (str): Name of the asset.
+
+        Returns:
+            bool: True if the asset is in the tracker.
+        """
+        return asset_name in self.records
+
+    def get(self, asset_name):
+        """
+        Gets the record of an asset.
+
+        Parameters:
+            asset_name (str): Name of the asset.
+
+        Returns:
+            dict: Record of the asset, None if the asset is not in the tracker.
+        """
+        return self.records.get(asset_name)
+
+    def assets(self):
+        """
+        Gets all the records sorted by asset name.
+
+        Returns:
+            list: Records of all the assets.
+        """
+        with self.lock:
+            return [self.records[name] for name in self._order]
+
+    def find_by_status(self, step, status):
+        """
+        Gets the names of the assets having a status on a production step.
+
+        Parameters:
+            step (str): Name of the production step. Example: Modeling
+            status (str): Status searched. Example: WIP
+
+        Returns:
+            list: Names of the assets, sorted.
+        """
+        with self.lock:
+            if status == self.schema['default_status']:
+                # no row means the default status
+                rows = self._connection.execute(
+                    "SELECT name FROM assets WHERE name NOT IN "
+                    "(SELECT name FROM statuses WHERE step = ? AND status != ?) ORDER BY name", (step, status))
+            else:
+                rows = self._connection.execute(
+                    "SELECT name FROM statuses WHERE step = ? AND status = ? ORDER BY name", (step, status))
+            return [row[0] for row in rows]
+
+    def _write_record(self, connection, record):
+        """
+        Writes the asset and all the statuses of a record, inside the transaction of the caller.
+        """
+        connection.execute("INSERT OR IGNORE INTO assets (name) VALUES (?)", (record['name'],))
+        connection.executemany(
+            "INSERT OR REPLACE INTO statuses (name, step, status) VALUES (?, ?, ?)",
+            [(record['name'], step, status) for step, status in record.items() if step != "name"])
+
+    def _remember(self, record):
+        """
+        Merges a record written in the database into the records kept in memory.
+        """
+        merged = dict(self.records.get(record['name'], {}))
+        merged.update(record)
+        if record['name'] not in self.records:
+            bisect.insort(self._order, record['name'])
+        self.records[record['name']] = merged
+
+    def _put(self, connection, record):
+        """
+        Writes a record inside a transaction.
+
+        Returns:
+            tuple: Result of put(), records to keep in memory and events to log once committed.
+        """
+        is_new = not connection.execute("SELECT 1 FROM assets WHERE name = ?", (record['name'],)).fetchone()
+        self._write_record(connection, record)
+        return None, [record], [tre.add_event(record['name'])] if is_new else []
+
+    def _insert_missing(self, connection, records):
+        """
+        Writes the records of the assets not in the database inside a transaction.
+
+        Returns:
+            tuple: Result of insert_missing(), records to keep in memory and events to log once committed.
+        """
+        new_records = []
+        for record in sorted(records, key=lambda x: x['name']):
+            if connection.execute("SELECT 1 FROM assets WHERE name = ?", (record['name'],)).fetchone():
+                continue
+            self._write_record(connection, record)
+            new_records.append(record)
+        return ([record['name'] for record in new_records], new_records,
+                [tre.add_event(record['name']) for record in new_records])
+
+    def _set_status(self, connection, asset_name, step, status):
+        """
+        Writes the status of a step inside a transaction. The previous status is read in the same transaction, the
+        records in memory can be older than the database when another session has written.
+
+        Returns:
+            tuple: Result of set_status(), records to keep in memory and events to log once committed.
+        """
+        if not connection.execute("SELECT 1 FROM assets WHERE name = ?", (asset_name,)).fetchone():
+            return False, [], []
+        row = connection.execute("SELECT status FROM statuses WHERE name = ? AND step = ?",
+                                 (asset_name, step)).fetchone()
+        old_status = row[0] if row else self.schema['default_status']
+        if old_status == status:
+            return True, [{"name": asset_name, step: status}], []
+        connection.execute("INSERT OR REPLACE INTO statuses (name, step, status) VALUES (?, ?, ?)",
+                           (asset_name, step, status))
+        return True, [{"name": asset_name, step: status}], [tre.status_event(asset_name, step, old_status, status)]
+
+    def _commit_operations(self, operations):
+        """
+        Runs write operations in a single transaction, then updates the records in memory and the event log.
+
+        Parameters:
+            operations (list): Method writing inside a transaction and its arguments, for each write.
+
+        Returns:
+            list: Result of each operation.
+        """
+        results = []
+        records = []
+        events = []
+        with self.lock:
+            with self._transaction() as connection:
+                for operation, args in operations:
+                    result, operation_records, operation_events = operation(connection, *args)
+                    results.append(result)
+                    records.extend(operation_records)
+                    events.extend(operation_events)
+            for record in records:
+                self._remember(record)
+            for event in events:
+                self._log(event)
+            self._flush_events()
+        return results
+
+    def _write(self, operation, args, batched_result=None):
+        """
+        Runs a write operation in its own transaction, or queues it until the end of the current batch.
+        """
+        with self.lock:
+            if self._batch_depth:
+                self._queued.append((operation, args))
+                return batched_result
+        return self._commit_operations([(operation, args)])[0]
+
+    def put(self, record):
+        """
+        Adds or replaces the record of an asset.
+
+        Parameters:
+            record (dict): Record of the asset, must contain its name.
+        """
+        with self.lock:
+            if self._batch_depth:
+                self._queued_names.add(record['name'])
+            self._write(self._put, (record,))
+
+    def insert_missing(self, records):
+        """
+        Adds the records of the assets that are not in the tracker yet, in one transaction.
+
+        Parameters:
+            records (list): Records to add, each one containing the asset name.
+
+        Returns:
+            list: Names of the assets added, sorted. Inside a batch, the names missing from the records in memory.
+        """
+        with self.lock:
+            batched_names = []
+            if self._batch_depth:
+                batched_names = sorted({record['name'] for record in records
+                                        if record['name'] not in self.records} - self._queued_names)
+                self._queued_names.update(batched_names)
+            return self._write(self._insert_missing, (records,), batched_names)
+
+    def set_status(self, asset_name, step, status):
+        """
+        Sets the status of one production step of an asset.
+
+        Parameters:
+            asset_name (str): Name of the asset.
+            step (str): Name of the production step. Example: Modeling
+            status (str): New status. Example: WIP
+
+        Returns:
+            bool: True if the asset exists in the tracker. Inside a batch, found from the records in memory and the
+                  assets added in the batch.
+        """
+        with self.lock:
+            batched_result = asset_name in self.records or asset_name in self._queued_names
+            return self._write(self._set_status, (asset_name, step, status), batched_result)
+
+    @contextmanager
+    def batch(self):
+        """
+        Groups every write done inside the block into a single transaction. The writes are queued, and the
+        transaction is opened once the block is done : the other sessions are only blocked while the writes run.
+        """
+        with self.lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        except BaseException:
+            with self.lock:
+                self._batch_depth -= 1
+                if not self._batch_depth:
+                    # nothing was written yet
+                    self._queued = []
+                    self._queued_names = set()
+            raise
+        with self.lock:
+            self._batch_depth -= 1
+            if self._batch_depth:
+                return
+            operations = self._queued
+            self._queued = []
+            self._queued_names = set()
+            if operations:
+                self._commit_operations(operations)
+
+    def commit(self):
+        """
+        Nothing to do, every write is committed by its own transaction.
+        """
+
+    def compact(self):
+        """
+        Moves the content of the WAL file back into the database.
+        """
+        with self.lock:
+            self._connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def clear(self):
+        """
+        Removes every asset from the tracker, in one transaction.
+        """
+        with self.lock:
+            with self._transaction() as connection:
+                connection.execute("DELETE FROM statuses")
+                connection.execute("DELETE FROM assets")
+            self.records = {}
+            self._order = []
+            self._events = []
+            self._queued = []
+            self._queued_names = set()
+            self.loaded_signature = self.signature()
@@ -0,0 +1,88 @@
+import sqlite3
+import threading
+
+from tuyauLigne import tracker_cache as trc
+
+"""
+Write-behind queue for the status edits of the production tracker window.
+
+Each edit is only stored in memory, and the queue is written a short time after the last edit, from a background
+thread. When the same step of the same asset is edited several times inside that window, only the last status is
+written.
+"""
+
+WRITE_DELAY = 0.5
+
+
+class StatusWriteQueue:
+    """
+    Coalesces status edits and writes them to the tracker of a data folder outside the UI thread.
+    """
+
+    def __init__(self, data_folder, delay=WRITE_DELAY):
+        self.data_folder = data_folder
+        self.delay = delay
+        self._edits = {}
+        self._timer = None
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    def queue(self, asset_name, step, status):
+        """
+        Adds a status edit to the queue and restarts the write delay.
+
+        Parameters:
+            asset_name (str): Name of the asset.
+            step (str): Name of the production step. Example: Modeling
+            status (str): New status of the step. Example: WIP
+        """
+        with self._lock:
+            self._edits[(asset_name, step)] = status
+            if self._timer:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.delay, self.write)
+            self._timer.start()
+
+    def flush(self, compact=False, wait=False):
+        """
+        Writes the queued edits now, without waiting for the end of the delay.
+
+        Parameters:
+            compact (bool): Also rewrites the tracker snapshot (temporary file then rename) once the edits are written.
+            wait (bool): Blocks until the edits are written.
+        """
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+        thread = threading.Thread(target=self.write, args=(compact,))
+        thread.start()
+        if wait:
+            thread.join()
+
+    def write(self, compact=False):
+        """
+        Writes all the queued edits in a single batch. Called from the background thread.
+
+        Parameters:
+            compact (bool): Also rewrites the tracker snapshot once the edits are written.
+        """
+        with self._write_lock:
+            with self._lock:
+                edits = self._edits
+                self._edits = {}
+            if not edits and not compact:
+                return
+            try:
+                store = trc.get_tracker(self.data_folder)
+                with store.batch():
+                    for (asset_name, step), status in edits.items():
+                        store.set_status(asset_name, step, status)
+                if compact:
+                    store.compact()
+            except (OSError, ValueError, sqlite3.Error) as e:
+                print(f"production tracker not saved : {e}")
+                with self._lock:
+                    # edits made during the failed write are newer, keep them
+                    for key, status in edits.items():
+                        self._edits.setdefault(key, status)
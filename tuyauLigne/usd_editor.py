@@ -1,9 +1,10 @@
-import os
-
 import maya.cmds as mc
 from pxr import Usd, Sdf, UsdGeom, UsdUtils, UsdShade
 
+from tuyauLigne import canonical_path as cpth
 from tuyauLigne import material_manager as matm
+from tuyauLigne import naming_convention as naco
+from tuyauLigne import naming_profile as nprf
 from tuyauLigne import project_manager as pm
 
 """
@@ -26,6 +27,25 @@ Glossary :
 """
 
 
+def get_name_parts(asset_name):
+    """
+    Parses the name of an asset. A name outside of the naming convention is reported, then split on the separator
+    as before (prp_jar-A).
+
+    Parameters:
+        asset_name (str): Name of the asset.
+
+    Returns:
+        ElementNameParts: Components of the asset name.
+    """
+    try:
+        return naco.parse_element_name(asset_name)
+    except naco.NamingError as e:
+        print(e)
+        parts = asset_name.split(nprf.PROFILE.separator)
+        return naco.ElementNameParts(parts[0], parts[1] if len(parts) > 1 else "")
+
+
 def get_prim_proxy_path(asset_name):
     """
     Get the path of the proxy prim (the proxy group inside Maya).
@@ -36,8 +56,8 @@ def get_prim_proxy_path(asset_name):
     Returns:
         prim_proxy_path (str): Usd path of the proxy's group asset.
     """
-    short_name = asset_name.split("_")[1]
-    prim_proxy_path = f"/{asset_name}/proxy_{short_name}"
+    short_name = get_name_parts(asset_name).element_short_name
+    prim_proxy_path = f"/{asset_name}/{nprf.PROFILE.element_name('proxy_group', short_name)}"
     return prim_proxy_path
 
 
@@ -51,8 +71,8 @@ def get_prim_render_path(asset_name):
     Returns:
         prim_render_path (str): Usd path of the render's group asset.
     """
-    no_prefix_name = asset_name.split("_")[1]
-    prim_render_path = f"/{asset_name}/render_{no_prefix_name}"
+    no_prefix_name = get_name_parts(asset_name).element_short_name
+    prim_render_path = f"/{asset_name}/{nprf.PROFILE.element_name('render_group', no_prefix_name)}"
     return prim_render_path
 
 
@@ -183,9 +203,9 @@ def rename_mtl_scope(asset_name):
         asset_name (str): Name of the asset to rename the material scope for.
     """
     wip_usd_folder = pm.get_wip_usd_folder(asset_name)
-    short_name = asset_name.split("_")[1]
-    usd_file_name = "modeling_" + asset_name.split("_")[1]
-    usd_file_path = wip_usd_folder + "/" + usd_file_name + ".usd"
+    short_name = get_name_parts(asset_name).element_short_name
+    usd_file_name = nprf.PROFILE.element_name("modeling_layer", short_name)
+    usd_file_path = cpth.CanonicalPath(wip_usd_folder, usd_file_name + ".usd")
 
     layer = Sdf.Layer.FindOrOpen(usd_file_path)
 
@@ -239,15 +259,15 @@ def create_mod_sublayer_usd(asset_name):
     extension_usd = "usda"
     mc.select(asset_name, r=True)
     wip_usd_folder = pm.get_wip_usd_folder(asset_name)
-    usd_file_name = "modeling_" + asset_name.split("_")[1]
-    usd_mod_path = wip_usd_folder + "/" + usd_file_name + ".usd"
+    usd_file_name = nprf.PROFILE.element_name("modeling_layer", get_name_parts(asset_name).element_short_name)
+    usd_mod_path = cpth.CanonicalPath(wip_usd_folder, usd_file_name + ".usd")
     if not matm.check_arnold_connection():
-        mc.file(usd_mod_path.split(".")[0],
+        mc.file(usd_mod_path.with_suffix(""),
                 options=f";exportColorSets=0;mergeTransformAndShape=1;exportComponentTags=0;"
                         f"defaultUSDFormat={extension_usd}",
                 typ="USD Export", pr=True, ch=True, chn=True, exportSelected=True, f=True)
     else:
-        mc.file(usd_mod_path.split(".")[0],
+        mc.file(usd_mod_path.with_suffix(""),
                 options=f";exportColorSets=0;mergeTransformAndShape=1;exportComponentTags=0;"
                         f"defaultUSDFormat={extension_usd};jobContext=[Arnold];convertMaterialsTo=[UsdPreviewSurface];"
                         f"defaultMeshScheme=catmullClark;exportRelativeTextures=relative",
@@ -272,8 +292,8 @@ def create_surf_sublayer_usd(asset_name):
     """
     extension_usd = "usda"
     wip_usd_folder = pm.get_wip_usd_folder(asset_name)
-    usd_file_name = "surfacing_" + asset_name.split("_")[1]
-    usd_surf_path = wip_usd_folder + "/" + usd_file_name + "." + extension_usd
+    usd_file_name = nprf.PROFILE.element_name("surfacing_layer", get_name_parts(asset_name).element_short_name)
+    usd_surf_path = cpth.CanonicalPath(wip_usd_folder, usd_file_name + "." + extension_usd)
     surfacing_usd = Sdf.Layer.CreateNew(usd_surf_path)
 
     return usd_surf_path
@@ -293,11 +313,10 @@ def create_stage_usd(asset_name, usd_mod_path, usd_surf_path):
     """
     extension_usd = ".usda"
     wip_usd_folder = pm.get_wip_usd_folder(asset_name)
-    asset_type = asset_name.split("_")[0]
-    usd_file_name = asset_type + "_" + asset_name.split("_")[1]
-    usd_file_path = wip_usd_folder + "/" + usd_file_name + extension_usd
-    mod_relative_path = os.path.relpath(usd_mod_path, usd_file_path).replace("..\\", "./")
-    surf_relative_path = os.path.relpath(usd_surf_path, usd_file_path).replace("..\\", "./")
+    usd_file_name = get_name_parts(asset_name).element_name
+    usd_file_path = cpth.CanonicalPath(wip_usd_folder, usd_file_name + extension_usd)
+    mod_relative_path = cpth.CanonicalPath(usd_mod_path).asset_path(usd_file_path)
+    surf_relative_path = cpth.CanonicalPath(usd_surf_path).asset_path(usd_file_path)
     stage_usd = Usd.Stage.CreateNew(usd_file_path)
     stage_usd.GetRootLayer().subLayerPaths.append(surf_relative_path)
     stage_usd.GetRootLayer().subLayerPaths.append(mod_relative_path)
@@ -319,9 +338,9 @@ def create_set_usd(set_name, usd_layout_path, usd_assembly_path):
         usd_file_path (str) path of the set usd
     """
     extension_usd = ".usda"
-    usd_file_path = pm.get_wip_usd_set_folder(set_name) + "/" + set_name + extension_usd
-    assembly_relative_path = os.path.relpath(usd_assembly_path, usd_file_path).replace("..\\", "./")
-    layout_relative_path = os.path.relpath(usd_layout_path, usd_file_path).replace("..\\", "./")
+    usd_file_path = pm.get_wip_usd_set_folder(set_name).joinpath(set_name + extension_usd)
+    assembly_relative_path = cpth.CanonicalPath(usd_assembly_path).asset_path(usd_file_path)
+    layout_relative_path = cpth.CanonicalPath(usd_layout_path).asset_path(usd_file_path)
     stage_usd = Usd.Stage.CreateNew(usd_file_path)
     stage_usd.GetRootLayer().subLayerPaths.append(layout_relative_path)
     stage_usd.GetRootLayer().subLayerPaths.append(assembly_relative_path)
@@ -341,8 +360,8 @@ def create_assembly_set_usd(set_name):
         usd_assembly_path (str): Path of the USD assembly file.
     """
     extension_usd = ".usda"
-    assembly_name = set_name.replace("set_", "assembly_")
-    usd_assembly_path = pm.get_wip_usd_set_folder(set_name) + "/" + assembly_name + extension_usd
+    assembly_name = nprf.PROFILE.swap_role(set_name, "assembly")
+    usd_assembly_path = pm.get_wip_usd_set_folder(set_name).joinpath(assembly_name + extension_usd)
     set_usd = Usd.Stage.CreateNew(usd_assembly_path)
 
     return usd_assembly_path
@@ -359,8 +378,8 @@ def create_layout_set_usd(set_name):
         usd_layout_path (str): Path of the USD layout file.
     """
     extension_usd = ".usda"
-    layout_name = set_name.replace("set_", "lay_")
-    usd_layout_path = pm.get_wip_usd_set_folder(set_name) + "/" + layout_name + extension_usd
+    layout_name = nprf.PROFILE.swap_role(set_name, "layout")
+    usd_layout_path = pm.get_wip_usd_set_folder(set_name).joinpath(layout_name + extension_usd)
     set_usd = Usd.Stage.CreateNew(usd_layout_path)
 
     return usd_layout_path
@@ -0,0 +1,151 @@
+import ntpath
+import os
+import posixpath
+import weakref
+
+"""
+Canonical paths of the project files, shared by the Maya and the Substance Painter plugins.
+
+A path is normalized once, when the CanonicalPath is built : forward slashes only, no "." or ".." parts, no doubled
+separator. Identical paths are interned : while a path is in use, building it again gives back the same object. The
+interned paths are weak references, a path nothing uses anymore is freed. A CanonicalPath is a str, so it is given
+as it is to Maya, USD or Substance Painter. Parts are joined with joinpath(), join() is still the one of str.
+
+USD keeps its opened layers in a registry keyed by their path : "D:/prj/a.usda" and "D:\\prj\\a.usda" are two
+different entries for Sdf.Layer.Find. Giving it only canonical paths, and relative paths built by asset_path(), makes
+every lookup of an opened layer a hit.
+"""
+
+_interned = weakref.WeakValueDictionary()
+
+
+class CanonicalPath(str):
+    """
+    Normalized, interned path with forward slashes.
+    """
+
+    __slots__ = ("__weakref__",)
+
+    def __new__(cls, path, *parts):
+        """
+        Builds the canonical path of a path, or of a folder and the parts joined to it.
+
+        Parameters:
+            path (str): Path, or folder the parts are joined to.
+            *parts (str): Parts joined to the path. Example: "wip", "maya", "prp_chair_001.ma"
+
+        Returns:
+            CanonicalPath: Interned path.
+        """
+        if type(path) is cls and not parts:
+            return path
+        joined = posixpath.join(os.fspath(path), *parts) if parts else os.fspath(path)
+        normalized = posixpath.normpath(joined.replace("\\", "/"))
+        interned = _interned.get(normalized)
+        if interned is None:
+            interned = _interned.setdefault(normalized, str.__new__(cls, normalized))
+        return interned
+
+    def __reduce__(self):
+        return CanonicalPath, (str(self),)
+
+    @property
+    def parent(self):
+        """
+        CanonicalPath: Folder of the path.
+        """
+        return CanonicalPath(posixpath.dirname(self) or ".")
+
+    @property
+    def name(self):
+        """
+        str: Last part of the path. Example: prp_chair_001.ma
+        """
+        return posixpath.basename(self)
+
+    @property
+    def stem(self):
+        """
+        str: Last part of the path without its extension. Example: prp_chair_001
+        """
+        return posixpath.splitext(self.name)[0]
+
+    @property
+    def suffix(self):
+        """
+        str: Extension of the path. Example: .ma
+        """
+        return posixpath.splitext(self)[1]
+
+    def joinpath(self, *parts):
+        """
+        Joins parts to the path.
+
+        Parameters:
+            *parts (str): Parts joined to the path.
+
+        Returns:
+            CanonicalPath: Joined path.
+        """
+        return CanonicalPath(self, *parts)
+
+    def with_suffix(self, suffix):
+        """
+        Changes the extension of the path.
+
+        Parameters:
+            suffix (str): New extension, with its dot. Example: .usda
+
+        Returns:
+            CanonicalPath: Path with the new extension.
+        """
+        return CanonicalPath(posixpath.splitext(self)[0] + suffix)
+
+    def relative_to(self, folder):
+        """
+        Gets the path relative to a folder.
+
+        Parameters:
+            folder (str): Folder the path is relative to.
+
+        Returns:
+            str: Relative path with forward slashes, the path itself if it is on another drive.
+        """
+        folder = CanonicalPath(folder)
+        drive, path = ntpath.splitdrive(self)
+        folder_drive, folder_path = ntpath.splitdrive(folder)
+        if drive.lower() != folder_drive.lower():
+            return str(self)
+        # the drive letters may differ in case only : C:/x and c:/x
+        return posixpath.relpath(path or ".", folder_path or ".")
+
+    def asset_path(self, anchor_file):
+        """
+        Gets the path as a USD asset path relative to the layer that references it. Example: ./modeling_chair.usd
+
+        Parameters:
+            anchor_file (str): Path of the layer holding the sublayer or the reference.
+
+        Returns:
+            str: Relative asset path, starting with "./" or "../".
+        """
+        relative_path = self.relative_to(CanonicalPath(anchor_file).parent)
+        if relative_path == str(self) or relative_path.startswith("../"):
+            return relative_path
+        return "./" + relative_path
+
+
+def canonical(path, *parts):
+    """
+    Gets the canonical path of a path, or of a folder and the parts joined to it.
+
+    Parameters:
+        path (str): Path, or folder the parts are joined to.
+        *parts (str): Parts joined to the path.
+
+    Returns:
+        CanonicalPath: Interned path, None if path is None.
+    """
+    if path is None:
+        return None
+    return CanonicalPath(path, *parts)
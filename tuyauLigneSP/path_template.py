@@ -0,0 +1,151 @@
+import json
+import os
+import re
+
+from tuyauLigneSP import canonical_path as cpth
+
+"""
+Layout of a tuyauLigne project, shared by the Maya and the Substance Painter plugins.
+
+The folder names are only written in project_layout.json, next to this file (the same file is shipped with both
+plugins). It is loaded once, when the module is imported, and every template is compiled at that time :
+    main_folders : folders at the root of the project.
+    sub_folders : folders inside each asset, set, ... folder. For each of them, a template named
+                  "<template>.<sub_folder>" is created. Example: asset.publish_folder
+    templates : paths relative to the project root. {name} is replaced by a main folder or by a template compiled
+                before it, the other fields ({asset_name}, ...) are given when the path is asked for.
+
+Paths built from the templates are canonical paths (see canonical_path).
+
+Renaming a folder is a change of project_layout.json only.
+"""
+
+LAYOUT_FILE_NAME = "project_layout.json"
+FIELD_PATTERN = re.compile(r"\{([^{}]+)\}")
+
+
+def get_layout_path():
+    """
+    Get the path of the layout file shipped with the plugin.
+
+    Returns:
+        str: Path of project_layout.json.
+    """
+    return os.path.join(os.path.dirname(os.path.realpath(__file__)), LAYOUT_FILE_NAME)
+
+
+def load_layout(layout_path=None):
+    """
+    Loads a layout file.
+
+    Parameters:
+        layout_path (str): Path of the layout file, the one of the plugin if None.
+
+    Returns:
+        dict: Main folders, sub-folders and templates of the project.
+    """
+    with open(layout_path or get_layout_path(), 'r') as f:
+        return json.load(f)
+
+
+class PathTemplate:
+    """
+    Path relative to the project root, with the folder names already replaced.
+    """
+
+    def __init__(self, name, pattern):
+        self.name = name
+        self.pattern = pattern
+        self.fields = tuple(FIELD_PATTERN.findall(pattern))
+
+    def format(self, root=None, **fields):
+        """
+        Builds the path with the given fields.
+
+        Parameters:
+            root (str): Root folder of the project, None for a path relative to the root.
+            **fields: Value of each field of the template. Example: asset_name="prp_chair"
+
+        Returns:
+            CanonicalPath: Path built from the template.
+        """
+        path = self.pattern.format(**fields)
+        if root is None:
+            return cpth.CanonicalPath(path)
+        return cpth.CanonicalPath(root, path)
+
+
+class ProjectLayout:
+    """
+    Compiled layout of a project.
+    """
+
+    def __init__(self, layout):
+        self.main_folders = dict(layout['main_folders'])
+        self.sub_folders = {name: dict(sub_folders) for name, sub_folders in layout.get('sub_folders', {}).items()}
+        self.templates = {}
+        for name, pattern in layout.get('templates', {}).items():
+            self.add_template(name, pattern)
+
+    def compile_pattern(self, pattern):
+        """
+        Replaces the main folders and the templates already compiled inside a pattern.
+
+        Parameters:
+            pattern (str): Pattern of the path. Example: {asset.publish_folder}/{asset_name}_publish.usdc
+
+        Returns:
+            str: Pattern with only the fields left to give.
+        """
+        def substitute(match):
+            name = match.group(1)
+            if name in self.main_folders:
+                return self.main_folders[name]
+            if name in self.templates:
+                return self.templates[name].pattern
+            return match.group(0)
+
+        return FIELD_PATTERN.sub(substitute, pattern)
+
+    def add_template(self, name, pattern):
+        """
+        Compiles a template, and the templates of its sub-folders.
+
+        Parameters:
+            name (str): Name of the template. Example: asset
+            pattern (str): Pattern of the path. Example: {asset_folder}/{asset_name}
+        """
+        template = PathTemplate(name, self.compile_pattern(pattern))
+        self.templates[name] = template
+        for sub_name, sub_folder in self.sub_folders.get(name, {}).items():
+            self.templates[name + "." + sub_name] = PathTemplate(name + "." + sub_name,
+                                                                 template.pattern + "/" + sub_folder)
+
+    def main_folder_paths(self, root):
+        """
+        Gets the paths of the main folders of a project.
+
+        Parameters:
+            root (str): Root folder of the project.
+
+        Returns:
+            dict: Path of each main folder.
+        """
+        return {key: cpth.CanonicalPath(root, folder) for key, folder in self.main_folders.items()}
+
+    def path(self, name, root=None, **fields):
+        """
+        Builds a path from a template.
+
+        Parameters:
+            name (str): Name of the template. Example: asset.texture_map_folder
+            root (str): Root folder of the project, None for a path relative to the root.
+            **fields: Value of each field of the template. Example: asset_name="prp_chair"
+
+        Returns:
+            CanonicalPath: Path built from the template.
+        """
+        return self.templates[name].format(root, **fields)
+
+
+LAYOUT = ProjectLayout(load_layout())
@@ -0,0 +1,434 @@
+import json
+import os
+import threading
+import time
+
+from tuyauLigneSP import canonical_path as cpth
+from tuyauLigneSP import naming_profile as nprf
+from tuyauLigneSP import path_template as ptl
+
+"""
+In-memory index of the folders of a project, shared by every tool instead of listing the folders again and again.
+
+Each folder is listed once with os.scandir, then kept with its modification time. Adding, removing or renaming a file
+changes the modification time of its folder, so a single stat tells if a listing is still valid :
+    main folders : the asset, proxy and env folders, listed as soon as the index is created.
+    asset folders : the sub-folders of an asset (wip/maya, publish, ...), listed the first time they are asked for.
+
+A watcher thread checks the folders already listed every POLL_INTERVAL seconds, a single stat per folder, and lists
+again only the ones that changed, so the tools find the listings up to date when they ask for them. A file saved in
+place does not change the modification time of its folder : the size and modification time of each file of the
+folders that did not change are only read again every RESTAT_INTERVAL seconds, the first time just after the catalog
+is read, or when refresh(restat_files=True) is called. In between, the size of a file edited in place can be out of
+date.
+
+The listings, with the size and modification time of each file, are saved in project_catalog.json inside the data
+folder. When a tool opens, the catalog is read back and each folder costs a single stat : only the folders changed
+since the catalog was written are listed again. The paths are stored relative to the project root, so the catalog
+stays valid when the project is mounted on another path. Folders are keyed by their canonical path, so a folder
+asked for with backslashes or with a trailing slash is the same entry.
+
+The highest increment of each asset in a folder is kept with the modification time of its folder.
+The next increment is reserved by creating its file with O_CREAT | O_EXCL : two saves, from two Maya sessions or two
+workstations, never get the same number, and a save from an old increment never writes over a newer one.
+"""
+
+POLL_INTERVAL = 2.0
+RESTAT_INTERVAL = 300.0
+CATALOG_FILE_NAME = "project_catalog.json"
+CATALOG_VERSION = 1
+KINDS = {
+    "prp": ("asset_folder", "asset", "asset_name"),
+    "prx": ("proxy_folder", "proxy", "proxy_name"),
+    "set": ("env_folder", "set", "set_name"),
+}
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def folder_mtime(folder_path):
+    """
+    Gets the modification time of a folder.
+
+    Parameters:
+        folder_path (str): Path of the folder.
+
+    Returns:
+        int: Modification time in nanoseconds, None if the folder does not exist.
+    """
+    try:
+        return os.stat(folder_path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def list_folder(folder_path):
+    """
+    Lists a folder once with os.scandir.
+
+    Parameters:
+        folder_path (str): Path of the folder.
+
+    Returns:
+        tuple: Sorted names of the sub-folders and file name -> (size, modification time), None if the folder does
+               not exist.
+    """
+    folders = []
+    files = {}
+    try:
+        with os.scandir(folder_path) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    folders.append(entry.name)
+                else:
+                    stat = entry.stat()
+                    files[entry.name] = (stat.st_size, stat.st_mtime_ns)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    return sorted(folders), dict(sorted(files.items()))
+
+
+class ProjectIndex:
+    """
+    Listings of the folders of a project, refreshed from the modification time of each folder.
+    """
+
+    def __init__(self, root_project_folder, layout=ptl.LAYOUT):
+        self.root_project_folder = cpth.CanonicalPath(root_project_folder)
+        self.layout = layout
+        self.lock = threading.RLock()
+        self.listings = {}
+        self.increments = {}
+        self.catalog_path = self.root_project_folder.joinpath(layout.main_folders["data_folder"], CATALOG_FILE_NAME)
+        self.dirty = False
+        self._watcher = None
+        self._stop = threading.Event()
+        self.load_catalog()
+        for kind in KINDS:
+            self.listing(self.main_folder(kind))
+
+    def main_folder(self, kind):
+        """
+        Gets the main folder of a kind of asset.
+
+        Parameters:
+            kind (str): Kind of asset. Example: prp
+
+        Returns:
+            str: Path of the main folder.
+        """
+        return self.root_project_folder.joinpath(self.layout.main_folders[KINDS[kind][0]])
+
+    def asset_folder(self, kind, asset_name, sub_folder=None):
+        """
+        Gets the folder of an asset, or one of its sub-folders.
+
+        Parameters:
+            kind (str): Kind of asset. Example: prp
+            asset_name (str): Name of the asset.
+            sub_folder (str): Key of the sub-folder in the project layout, None for the asset folder itself.
+
+        Returns:
+            str: Path of the folder.
+        """
+        main_key, template, field = KINDS[kind]
+        if sub_folder:
+            template = template + "." + sub_folder
+        return self.layout.path(template, self.root_project_folder, **{field: asset_name})
+
+    def _read(self, folder_path, mtime):
+        """
+        Lists a folder and stores its listing, or forgets it if the folder does not exist anymore.
+        """
+        listing = list_folder(folder_path) if mtime is not None else None
+        self.dirty = True
+        if listing is None:
+            self.listings.pop(folder_path, None)
+            return None
+        self.listings[folder_path] = (mtime, listing[0], listing[1])
+        return self.listings[folder_path]
+
+    def load_catalog(self):
+        """
+        Reads the listings saved in the catalog of the project. They are checked against the folders when used.
+        """
+        try:
+            with open(self.catalog_path, 'r') as f:
+                catalog = json.load(f)
+        except (OSError, ValueError):
+            return
+        if catalog.get('version') != CATALOG_VERSION:
+            return
+        with self.lock:
+            for relative_path, (mtime, folders, files) in catalog['folders'].items():
+                folder_path = self.root_project_folder.joinpath(relative_path)
+                self.listings[folder_path] = (mtime, folders, {name: tuple(info) for name, info in files.items()})
+
+    def save_catalog(self):
+        """
+        Writes the listings in the catalog of the project, if they changed since it was read or written.
+
+        Returns:
+            bool: True if the catalog is written.
+        """
+        with self.lock:
+            if not self.dirty:
+                return False
+            folders = {}
+            for folder_path, listing in self.listings.items():
+                folders[folder_path.relative_to(self.root_project_folder)] = listing
+            self.dirty = False
+        if not os.path.isdir(os.path.dirname(self.catalog_path)):
+            return False
+        # each session writes its own temporary file, two sessions can save the catalog at the same time
+        tmp_path = f"{self.catalog_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': CATALOG_VERSION, 'folders': folders}, f, separators=(",", ":"))
+        os.replace(tmp_path, self.catalog_path)
+        return True
+
+    def listing(self, folder_path):
+        """
+        Gets the listing of a folder, listed again only if the folder changed.
+
+        Parameters:
+            folder_path (str): Path of the folder.
+
+        Returns:
+            tuple: Modification time, sub-folder names and file name -> (size, modification time), None if the
+                   folder does not exist.
+        """
+        folder_path = cpth.CanonicalPath(folder_path)
+        mtime = folder_mtime(folder_path)
+        with self.lock:
+            cached = self.listings.get(folder_path)
+            if cached is not None and cached[0] == mtime:
+                return cached
+            return self._read(folder_path, mtime)
+
+    def _restat_files(self, folder_path, cached):
+        """
+        Reads again the size and modification time of the files of a folder that did not change.
+
+        Returns:
+            bool: True if a file changed.
+        """
+        files = {}
+        for name, info in cached[2].items():
+            try:
+                stat = os.stat(folder_path.joinpath(name))
+            except OSError:
+                # removed since the folder was checked, the next refresh lists the folder again
+                files[name] = info
+                continue
+            files[name] = (stat.st_size, stat.st_mtime_ns)
+        if files == cached[2]:
+            return False
+        with self.lock:
+            if self.listings.get(folder_path) is not cached:
+                return False
+            self.listings[folder_path] = (cached[0], cached[1], files)
+            self.dirty = True
+        return True
+
+    def refresh(self, restat_files=False):
+        """
+        Lists again every folder that changed since it was listed.
+
+        Parameters:
+            restat_files (bool): Also reads again the size and modification time of the files of the other folders,
+                                 a stat per file.
+
+        Returns:
+            list: Paths of the folders listed again, or with files changed.
+        """
+        with self.lock:
+            folder_paths = list(self.listings)
+        changed = []
+        for folder_path in folder_paths:
+            mtime = folder_mtime(folder_path)
+            with self.lock:
+                cached = self.listings.get(folder_path)
+                if cached is None:
+                    continue
+                if cached[0] != mtime:
+                    self._read(folder_path, mtime)
+                    changed.append(folder_path)
+                    continue
+            if restat_files and self._restat_files(folder_path, cached):
+                changed.append(folder_path)
+        return changed
+
+    def highest_increment(self, folder_path, asset_name, file_type):
+        """
+        Gets the highest increment of an asset in a folder. The folder is read only if it changed since the last call.
+
+        Parameters:
+            folder_path (str): Path of the folder. Example: the wip maya folder of an asset.
+            asset_name (str): Name of the asset. Example: prp_jarA
+            file_type (str): File type of the increments. Example: ma
+
+        Returns:
+            int: Number of the highest increment, 0 if there is none.
+        """
+        folder_path = cpth.CanonicalPath(folder_path)
+        key = (folder_path, asset_name, file_type)
+        with self.lock:
+            cached = self.increments.get(key)
+            if cached is not None and cached[0] == folder_mtime(folder_path):
+                return cached[1]
+            listing = self.listing(folder_path)
+            if listing is None:
+                return 0
+            highest = 0
+            for name in listing[2]:
+                inc_number = nprf.PROFILE.increment_number(name, asset_name, file_type)
+                if inc_number is not None and inc_number > highest:
+                    highest = inc_number
+            self.increments[key] = (listing[0], highest)
+        return highest
+
+    def reserve_increment(self, folder_path, asset_name, file_type="ma", minimum=0):
+        """
+        Reserves the next increment of an asset : its file is created empty, and can't be taken by another save.
+
+        Parameters:
+            folder_path (str): Path of the folder of the increments.
+            asset_name (str): Name of the asset. Example: prp_jarA
+            file_type (str): File type of the increments. Example: ma
+            minimum (int): Highest increment known outside of the folder. Example: the ones kept in the increment
+                           store.
+
+        Returns:
+            CanonicalPath: Path of the file reserved. Example: .../prp_jarA_013.ma
+        """
+        folder_path = cpth.CanonicalPath(folder_path)
+        key = (folder_path, asset_name, file_type)
+        with self.lock:
+            inc_number = max(self.highest_increment(folder_path, asset_name, file_type), minimum)
+            while True:
+                inc_number += 1
+                file_name = f"{nprf.PROFILE.increment_name(asset_name, inc_number)}.{file_type}"
+                try:
+                    os.close(os.open(folder_path.joinpath(file_name), os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                except FileExistsError:
+                    # created since the folder was listed, by another session
+                    continue
+                # the folder changed only by this file : the next reservation does not read it again
+                self.increments[key] = (folder_mtime(folder_path), inc_number)
+                return folder_path.joinpath(file_name)
+
+    def names(self, kind):
+        """
+        Gets the names of the folders inside the main folder of a kind of asset.
+
+        Parameters:
+            kind (str): Kind of asset. Example: prp
+
+        Returns:
+            list: Names of the folders, None if the main folder does not exist.
+        """
+        listing = self.listing(self.main_folder(kind))
+        if listing is None:
+            return None
+        return list(listing[1])
+
+    def exists(self, kind, asset_name):
+        """
+        Checks if an asset has a folder in the project.
+
+        Parameters:
+            kind (str): Kind of asset. Example: prp
+            asset_name (str): Name of the asset.
+
+        Returns:
+            bool: True if the folder of the asset exists.
+        """
+        return asset_name in (self.names(kind) or ())
+
+    def files(self, kind, asset_name, sub_folder=None):
+        """
+        Gets the files of an asset folder, or of one of its sub-folders.
+
+        Parameters:
+            kind (str): Kind of asset. Example: prp
+            asset_name (str): Name of the asset.
+            sub_folder (str): Key of the sub-folder in the project layout. Example: wip_maya_folder
+
+        Returns:
+            list: Names of the files, empty if the folder does not exist.
+        """
+        return list(self.file_infos(kind, asset_name, sub_folder))
+
+    def file_infos(self, kind, asset_name, sub_folder=None):
+        """
+        Gets the files of an asset folder with their size and modification time.
+
+        Parameters:
+            kind (str): Kind of asset. Example: prp
+            asset_name (str): Name of the asset.
+            sub_folder (str): Key of the sub-folder in the project layout. Example: wip_maya_folder
+
+        Returns:
+            dict: File name -> (size in bytes, modification time in nanoseconds), empty if the folder does not exist.
+        """
+        listing = self.listing(self.asset_folder(kind, asset_name, sub_folder))
+        if listing is None:
+            return {}
+        return dict(listing[2])
+
+    def start_watcher(self, interval=POLL_INTERVAL, restat_interval=RESTAT_INTERVAL):
+        """
+        Starts the thread refreshing the index in the background, if it is not running yet.
+
+        Parameters:
+            interval (float): Seconds between two refreshes.
+            restat_interval (float): Seconds between two reads of the size and modification time of the files.
+        """
+        if self._watcher and self._watcher.is_alive():
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(target=self._watch, args=(interval, restat_interval), daemon=True)
+        self._watcher.start()
+
+    def stop_watcher(self):
+        """
+        Stops the thread refreshing the index.
+        """
+        self._stop.set()
+
+    def _watch(self, interval, restat_interval):
+        """
+        Refreshes the index until the watcher is stopped. Runs in the watcher thread.
+        """
+        # the files of the catalog are checked on the first refresh
+        next_restat = time.monotonic()
+        while not self._stop.wait(interval):
+            restat_files = time.monotonic() >= next_restat
+            if restat_files:
+                next_restat = time.monotonic() + restat_interval
+            try:
+                self.refresh(restat_files)
+                self.save_catalog()
+            except OSError as e:
+                print(f"project index not refreshed : {e}")
+
+
+def get_index(root_project_folder):
+    """
+    Gets the shared index of a project, created and watched the first time it is asked for.
+
+    Parameters:
+        root_project_folder (str): Root folder of the project.
+
+    Returns:
+        ProjectIndex: Index of the project folders.
+    """
+    root_project_folder = cpth.CanonicalPath(root_project_folder)
+    with _indexes_lock:
+        index = _indexes.get(root_project_folder)
+        if index is None:
+            index = ProjectIndex(root_project_folder)
+            index.start_watcher()
+            _indexes[root_project_folder] = index
+    return index
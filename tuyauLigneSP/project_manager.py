@@ -3,6 +3,10 @@ import os
 
 import substance_painter.project
 
+from tuyauLigneSP import canonical_path as cpth
+from tuyauLigneSP import path_template as ptl
+from tuyauLigneSP import project_index as pidx
+
 
 def get_json_path():
     """
@@ -55,14 +59,14 @@ def dict_split_folders():
     Returns:
         dict: A dictionary containing paths to specific folders related to the current project.
     """
-    file_path = get_current_project_path()
-    split_path = file_path.replace('\\', '/').split('/')
+    file_path = cpth.CanonicalPath(get_current_project_path())
+    split_path = file_path.split('/')
     dict_folders = {
         "file_name": split_path[-1],
-        "wip_spp_folder": os.path.join(split_path[-3], split_path[-2]),
+        "wip_spp_folder": '/'.join(split_path[-3:-1]),
         "asset_folder": split_path[-4],
         "dpt_folder": split_path[-5],
-        "project_folder": file_path.replace('\\', '/').replace('/'.join(split_path[-5:]), '').rstrip('/')
+        "project_folder": cpth.CanonicalPath('/'.join(split_path[:-5]) or '/')
     }
     return dict_folders
 
@@ -74,25 +78,23 @@ def get_textures_folder():
     Returns:
         str: The path to the textures folder.
     """
-    project_folder = dict_split_folders().get("project_folder")
-    dpt_folder = dict_split_folders().get("dpt_folder")
-    asset_folder = dict_split_folders().get("asset_folder")
-    textures_folder = os.path.join(project_folder, dpt_folder, asset_folder, "publish", "texture_maps").replace(
-        '\\', '/')
+    split_folders = dict_split_folders()
+    textures_folder = ptl.LAYOUT.path("asset.texture_map_folder", split_folders.get("project_folder"),
+                                      asset_name=split_folders.get("asset_folder"))
     return textures_folder
 
 
 def dict_folders_alone():
     """
-    Get a dictionary of standalone folder names for assets and environments.
+    Get a dictionary of standalone folder names for assets and environments, read from the project layout.
 
     Returns:
         dict: A dictionary with keys 'asset_folder' and 'env_folder' pointing to their respective folder names.
     """
     dict_folder_alone = {
-        "asset_folder": "020_mod_surf",
-        "env_folder": "030_sets_envs",
-        "data_folder": "999_datas"
+        "asset_folder": ptl.LAYOUT.main_folders.get("asset_folder"),
+        "env_folder": ptl.LAYOUT.main_folders.get("env_folder"),
+        "data_folder": ptl.LAYOUT.main_folders.get("data_folder")
     }
     return dict_folder_alone
 
@@ -110,12 +112,25 @@ def dict_main_folders(combo_project_list):
     project_name = combo_project_list.currentText()
     project_path = get_project_path(project_name)
     dict_main_folder = {
-        "asset_folder": os.path.join(project_path, dict_folders_alone().get("asset_folder")),
-        "env_folder": os.path.join(project_path, dict_folders_alone().get("env_folder")),
+        "asset_folder": cpth.CanonicalPath(project_path, dict_folders_alone().get("asset_folder")),
+        "env_folder": cpth.CanonicalPath(project_path, dict_folders_alone().get("env_folder")),
     }
     return dict_main_folder
 
 
+def get_project_index(combo_project_list):
+    """
+    Get the index of the folders of the selected project, shared by all the tools.
+
+    Parameters:
+        combo_project_list (QComboBox): The combo box containing the list of projects.
+
+    Returns:
+        ProjectIndex: Index of the project folders.
+    """
+    return pidx.get_index(get_project_path(combo_project_list.currentText()))
+
+
 def check_folder_content(project_path):
     """
     Check if the specified folder contains the expected subdirectory structure for a project.
@@ -158,9 +173,9 @@ def rename_textures():
     textures_folder = get_textures_folder()
     files = os.listdir(textures_folder)
     for file in files:
-        if os.path.isfile(os.path.join(textures_folder, file)):
+        if os.path.isfile(textures_folder.joinpath(file)):
             if "SG_" in file:
                 new_name = file.replace("SG_", "_")
-                old_path = os.path.join(textures_folder, file)
-                new_path = os.path.join(textures_folder, new_name)
+                old_path = textures_folder.joinpath(file)
+                new_path = textures_folder.joinpath(new_name)
                 os.replace(old_path, new_path)
@@ -6,6 +6,8 @@ import substance_painter.resource
 import substance_painter.textureset
 from PySide2 import QtWidgets
 
+from tuyauLigneSP import naming_profile as nprf
+from tuyauLigneSP import path_template as ptl
 from tuyauLigneSP import project_manager as pm
 
 
@@ -20,7 +22,7 @@ def get_mat_sets_list():
     texture_sets_id = substance_painter.textureset.all_texture_sets()
     for texture_set in texture_sets_id:
         set_name = texture_set.name()
-        if "mat_" in set_name:
+        if nprf.PROFILE.prefix("material") in set_name:
             mat_sets.append(set_name)
 
     return mat_sets
@@ -37,7 +39,7 @@ def get_usdprev_sets_list():
     texture_sets_id = substance_painter.textureset.all_texture_sets()
     for texture_set in texture_sets_id:
         set_name = texture_set.name()
-        if "usdPrev_" in set_name:
+        if nprf.PROFILE.prefix("usd_preview") in set_name:
             usdprev_sets.append(set_name)
 
     return usdprev_sets
@@ -94,9 +96,9 @@ def switch_export_type(combo_resolution):
     Parameters:
         combo_resolution (QComboBox): The combo box widget containing resolution options.
     """
-    if "prp_" in pm.dict_split_folders().get("file_name"):
+    if nprf.PROFILE.prefix("prop") in pm.dict_split_folders().get("file_name"):
         export_prp_textures(combo_resolution)
-    elif "set_" in pm.dict_split_folders().get("file_name"):
+    elif nprf.PROFILE.prefix("set") in pm.dict_split_folders().get("file_name"):
         export_set_textures(combo_resolution)
 
 
@@ -468,10 +470,9 @@ def export_set_textures(combo_resolution):
     size_log = set_resolution(combo_resolution)
 
     for mat_set in mat_sets:
-        prp_name = "prp_" + mat_set.split("_")[1].replace("SG", "")
-        export_directory = os.path.join(pm.dict_split_folders().get("project_folder"),
-                                        pm.dict_folders_alone().get("asset_folder"),
-                                        prp_name, "publish", "texture_maps").replace("\\", "/")
+        prp_name = nprf.PROFILE.element_name("prop", nprf.PROFILE.short_name(mat_set).replace("SG", ""))
+        export_directory = ptl.LAYOUT.path("asset.texture_map_folder", pm.dict_split_folders().get("project_folder"),
+                                           asset_name=prp_name)
         export_mat_config = {"exportPath": export_directory,
                              "exportShaderParams": False,
                              "defaultExportPreset": "tuyauligne_preset",
@@ -748,10 +749,10 @@ def export_set_textures(combo_resolution):
                              }
         substance_painter.export.export_project_textures(export_mat_config)
         for usdprev_set in usdprev_sets:
-            prp_name = "prp_" + usdprev_set.split("_")[1].replace("SG", "")
-            export_directory = os.path.join(pm.dict_split_folders().get("project_folder"),
-                                            pm.dict_folders_alone().get("asset_folder"),
-                                            prp_name, "publish", "texture_maps").replace("\\", "/")
+            prp_name = nprf.PROFILE.element_name("prop", nprf.PROFILE.short_name(usdprev_set).replace("SG", ""))
+            export_directory = ptl.LAYOUT.path("asset.texture_map_folder",
+                                               pm.dict_split_folders().get("project_folder"),
+                                               asset_name=prp_name)
             export_usdprev_config = {"exportPath": export_directory,
                                      "exportShaderParams": False,
                                      "defaultExportPreset": "usdprev_preset",
@@ -798,17 +799,16 @@ def export_set_textures(combo_resolution):
             substance_painter.export.export_project_textures(export_usdprev_config)
 
     for mat_set in mat_sets:
-        prp_name = "prp_" + mat_set.split("_")[1].replace("SG", "")
-        export_directory = os.path.join(pm.dict_split_folders().get("project_folder"),
-                                        pm.dict_folders_alone().get("asset_folder"),
-                                        prp_name, "publish", "texture_maps").replace("\\", "/")
+        prp_name = nprf.PROFILE.element_name("prop", nprf.PROFILE.short_name(mat_set).replace("SG", ""))
+        export_directory = ptl.LAYOUT.path("asset.texture_map_folder", pm.dict_split_folders().get("project_folder"),
+                                           asset_name=prp_name)
         files = os.listdir(export_directory)
         for file in files:
-            if os.path.isfile(os.path.join(export_directory, file)):
+            if os.path.isfile(export_directory.joinpath(file)):
                 if "SG_" in file:
                     new_name = file.replace("SG_", "_")
-                    old_path = os.path.join(export_directory, file)
-                    new_path = os.path.join(export_directory, new_name)
+                    old_path = export_directory.joinpath(file)
+                    new_path = export_directory.joinpath(new_name)
                     os.replace(old_path, new_path)
 
 
@@ -1,9 +1,11 @@
 import json
-import os
 
 import substance_painter.project
 from PySide2 import QtWidgets
 
+from tuyauLigneSP import naming_profile as nprf
+from tuyauLigneSP import path_template as ptl
+from tuyauLigneSP import project_index as pidx
 from tuyauLigneSP import project_manager as pm
 
 
@@ -17,11 +19,10 @@ def get_prp_list(combo_project_list):
     Returns:
         list: A list of prop folder names.
     """
-    asset_folder = pm.dict_main_folders(combo_project_list).get("asset_folder")
-    prop_folders = os.listdir(asset_folder)
+    prop_folders = pm.get_project_index(combo_project_list).names("prp") or []
     prop_list = []
     for folder in prop_folders:
-        if "prp_" in folder:
+        if nprf.PROFILE.prefix("prop") in folder:
             prop_list.append(folder)
 
     return prop_list
@@ -37,11 +38,10 @@ def get_set_list(combo_project_list):
     Returns:
         list: A list of set folder names.
     """
-    env_folder = pm.dict_main_folders(combo_project_list).get("env_folder")
-    env_folders = os.listdir(env_folder)
+    env_folders = pm.get_project_index(combo_project_list).names("set") or []
     set_list = []
     for folder in env_folders:
-        if "set_" in folder:
+        if nprf.PROFILE.prefix("set") in folder:
             set_list.append(folder)
 
     return set_list
@@ -129,22 +129,17 @@ def create_project(list_asset, combo_project_list, combo_subdiv, combo_udim):
         substance_painter.project.close()
 
     if project_path:
-        if "prp_" in asset_name:
-            spp_file_path = os.path.join(pm.dict_main_folders(combo_project_list).get("asset_folder"), asset_name,
-                                         "wip",
-                                         "substance")
-        elif "set_" in asset_name:
-            spp_file_path = os.path.join(pm.dict_main_folders(combo_project_list).get("env_folder"), asset_name, "wip",
-                                         "substance")
+        if nprf.PROFILE.prefix("prop") in asset_name:
+            spp_file_path = ptl.LAYOUT.path("asset.wip_substance_folder", project_path, asset_name=asset_name)
+        elif nprf.PROFILE.prefix("set") in asset_name:
+            spp_file_path = ptl.LAYOUT.path("set.wip_substance_folder", project_path, set_name=asset_name)
         if pm.check_existing_spp(spp_file_path):
-            spp_file = os.path.join(spp_file_path, f"{asset_name}_001.spp")
+            spp_file = spp_file_path.joinpath(nprf.PROFILE.increment_name(asset_name, 1) + ".spp")
             substance_painter.project.open(project_file_path=spp_file)
         else:
-            if "prp_" in asset_name:
-                usd_file_path = os.path.join(pm.dict_main_folders(combo_project_list).get("asset_folder"), asset_name,
-                                             "publish",
-                                             f"{asset_name}_publish.usdc")
-                spp_file = os.path.join(spp_file_path, f"{asset_name}_001.spp")
+            if nprf.PROFILE.prefix("prop") in asset_name:
+                usd_file_path = ptl.LAYOUT.path("asset_publish_file", project_path, asset_name=asset_name)
+                spp_file = spp_file_path.joinpath(nprf.PROFILE.increment_name(asset_name, 1) + ".spp")
                 settings = set_settings(combo_subdiv, combo_udim)
                 substance_painter.project.create(mesh_file_path=usd_file_path, settings=settings)
 
@@ -153,11 +148,9 @@ def create_project(list_asset, combo_project_list, combo_subdiv, combo_udim):
 
                 substance_painter.project.execute_when_not_busy(save_callback)
 
-            elif "set_" in asset_name:
-                usd_file_path = os.path.join(pm.dict_main_folders(combo_project_list).get("env_folder"), asset_name,
-                                             "publish",
-                                             f"{asset_name}_publish.usda")
-                spp_file = os.path.join(spp_file_path, f"{asset_name}_001.spp")
+            elif nprf.PROFILE.prefix("set") in asset_name:
+                usd_file_path = ptl.LAYOUT.path("set_publish_file", project_path, set_name=asset_name)
+                spp_file = spp_file_path.joinpath(nprf.PROFILE.increment_name(asset_name, 1) + ".spp")
                 substance_painter.project.create(mesh_file_path=usd_file_path)
 
                 def save_callback():
@@ -282,17 +275,18 @@ def load_asset_list(project_path, list_asset):
         list_asset (QListWidget): The widget where the assets will be listed.
     """
     list_asset.clear()
-    asset_main_folder = os.path.join(project_path, pm.dict_folders_alone().get("asset_folder"))
-    if os.path.isdir(asset_main_folder):
-        asset_folders = os.listdir(asset_main_folder)
+    project_index = pidx.get_index(project_path)
+    asset_main_folder = project_index.main_folder("prp")
+    asset_folders = project_index.names("prp")
+    if asset_folders is not None:
         for asset in asset_folders:
             list_asset.addItem(asset)
     else:
         print(f"The folder {asset_main_folder} does not exist.")
 
-    set_main_folder = os.path.join(project_path, pm.dict_folders_alone().get("env_folder"))
-    if os.path.isdir(set_main_folder):
-        set_folders = os.listdir(set_main_folder)
+    set_main_folder = project_index.main_folder("set")
+    set_folders = project_index.names("set")
+    if set_folders is not None:
         for set in set_folders:
             list_asset.addItem(set)
     else:
@@ -340,10 +334,10 @@ def update_searched_asset(combo_project_list, combo_asset_type, entry_search, li
     if not str_searched:
         if asset_type == "all":
             update_asset_list(combo_project_list, list_asset)
-        elif asset_type == "prp":
+        elif asset_type == nprf.PROFILE.token("prop"):
             for prp in prp_list:
                 list_asset.addItem(prp)
-        elif asset_type == "set":
+        elif asset_type == nprf.PROFILE.token("set"):
             for set in set_list:
                 list_asset.addItem(set)
 
@@ -355,14 +349,14 @@ def update_searched_asset(combo_project_list, combo_asset_type, entry_search, li
             if str_searched in set:
                 list_asset.addItem(set)
 
-    elif asset_type == "prp":
+    elif asset_type == nprf.PROFILE.token("prop"):
         for prp in prp_list:
-            if str_searched in prp and "prp_" in prp:
+            if str_searched in prp and nprf.PROFILE.prefix("prop") in prp:
                 list_asset.addItem(prp)
 
-    elif asset_type == "set":
+    elif asset_type == nprf.PROFILE.token("set"):
         for set in set_list:
-            if str_searched in set and "set_" in set:
+            if str_searched in set and nprf.PROFILE.prefix("set") in set:
                 list_asset.addItem(set)
 
 
@@ -374,7 +368,7 @@ def create_ui():
     Returns:
         QWidget: The main widget containing the plugin's UI.
     """
-    asset_type = ["all", "prp", "set"]
+    asset_type = ["all", nprf.PROFILE.token("prop"), nprf.PROFILE.token("set")]
     subdiv = ["0", "1", "2"]
     with_udim = ["no", "yes"]
     project_list = []
@@ -522,12 +516,11 @@ def toggle_visibility_parameters(combo_project_list, list_asset, combo_subdiv, c
     """
     asset_name = list_asset.currentItem().text()
     widgets = [combo_subdiv, combo_udim, lbl_subdiv, lbl_udim]
-    if "prp_" in asset_name:
-        spp_file_path = os.path.join(pm.dict_main_folders(combo_project_list).get("asset_folder"), asset_name, "wip",
-                                     "substance")
-    elif "set_" in asset_name:
-        spp_file_path = os.path.join(pm.dict_main_folders(combo_project_list).get("env_folder"), asset_name, "wip",
-                                     "substance")
+    project_path = pm.get_project_path(combo_project_list.currentText())
+    if nprf.PROFILE.prefix("prop") in asset_name:
+        spp_file_path = ptl.LAYOUT.path("asset.wip_substance_folder", project_path, asset_name=asset_name)
+    elif nprf.PROFILE.prefix("set") in asset_name:
+        spp_file_path = ptl.LAYOUT.path("set.wip_substance_folder", project_path, set_name=asset_name)
 
     if pm.check_existing_spp(spp_file_path):
         for widget in widgets: